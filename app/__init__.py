@@ -19,7 +19,13 @@ It provides:
 - APScheduler for background job scheduling.
 
 ### Scheduler Jobs:
-- Executes multiple trading bot strategies at different intervals.
+- Executes multiple trading bot strategies at different intervals, either as free-running
+  interval jobs, aligned to the Binance candle close, or as one unified tick job running
+  all due intervals in a single sweep (`SCHEDULER_MODE`).
+- Preloads and periodically refreshes the exchange symbol filters (`EXCHANGE_INFO_TTL`).
+- Governs the Binance request weight budget (`BINANCE_REQUEST_WEIGHT_LIMIT`).
+- Optionally streams klines of running bots into memory (`MARKET_STREAM_ENABLED`).
+- Updates the indicators of live bots incrementally and checkpoints them (`INDICATOR_STATE_ENABLED`).
 - Sends trading reports and logs via email.
 - Clears old trade history periodically.
 
@@ -31,6 +37,15 @@ It provides:
 To start the Flask application:
 ```bash
 python app.py
+```
+To import Binance kline archives into the local kline store for backtesting:
+```bash
+flask import-klines path/to/archives
+```
+To measure how many clones of a bot one process can run per interval against a fake exchange:
+```bash
+flask benchmark-sweep <bot_id> --bots 10,20,40 --latency-ms 50
+```
 """
 
 from flask import Flask, Blueprint
@@ -42,6 +57,7 @@ from flask_login import LoginManager
 from flask_mail import Mail
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
+from apscheduler.events import EVENT_SCHEDULER_SHUTDOWN
 from apscheduler.schedulers.background import BackgroundScheduler
 from flask_limiter import Limiter
 from flask_cors import CORS
@@ -161,52 +177,125 @@ def start_scheduler():
             run_all_swing_1h_trading_bots,
             run_all_swing_4h_trading_bots,
             run_all_swing_1d_trading_bots,
+            run_due_trading_bots,
         )
         from .utils.email_utils import send_trade_report_via_email
         from .utils.logs_utils import send_logs_via_email_and_clear_logs
         from .utils.history_utils import clear_old_trade_history
         from .utils.db_utils import backup_database
-
-        scheduler.add_job(
-            func=partial(run_job_with_context, run_all_scalp_1m_trading_bots),
-            trigger="interval",
-            minutes=1,
-        )
-        scheduler.add_job(
-            func=partial(run_job_with_context, run_all_scalp_3m_trading_bots),
-            trigger="interval",
-            minutes=3,
-        )
-        scheduler.add_job(
-            func=partial(run_job_with_context, run_all_scalp_5m_trading_bots),
-            trigger="interval",
-            minutes=5,
-        )
-        scheduler.add_job(
-            func=partial(run_job_with_context, run_all_scalp_15m_trading_bots),
-            trigger="interval",
-            minutes=15,
-        )
-        scheduler.add_job(
-            func=partial(run_job_with_context, run_all_swing_30m_trading_bots),
-            trigger="interval",
-            minutes=30,
-        )
-        scheduler.add_job(
-            func=partial(run_job_with_context, run_all_swing_1h_trading_bots),
-            trigger="interval",
-            hours=1,
+        from .stefan.scheduling import (
+            TRADING_BOTS_TICK_JOB_ID,
+            interval_to_milliseconds,
+            add_trading_bots_job,
+            add_trading_bots_job_listener,
+            measure_clock_offset,
+            realign_candle_close_jobs,
         )
-        scheduler.add_job(
-            func=partial(run_job_with_context, run_all_swing_4h_trading_bots),
-            trigger="interval",
-            hours=4,
+
+        trading_bots_jobs = [
+            ("1m", run_all_scalp_1m_trading_bots),
+            ("3m", run_all_scalp_3m_trading_bots),
+            ("5m", run_all_scalp_5m_trading_bots),
+            ("15m", run_all_scalp_15m_trading_bots),
+            ("30m", run_all_swing_30m_trading_bots),
+            ("1h", run_all_swing_1h_trading_bots),
+            ("4h", run_all_swing_4h_trading_bots),
+            ("1d", run_all_swing_1d_trading_bots),
+        ]
+        scheduler_mode = app.config.get("SCHEDULER_MODE", "interval")
+        candle_close_delay_ms = app.config.get("SCHEDULER_CANDLE_CLOSE_DELAY_MS", 300)
+        misfire_grace_time = app.config.get("SCHEDULER_MISFIRE_GRACE_TIME", 30)
+        trading_bots_intervals = [interval for interval, _ in trading_bots_jobs]
+        tick_interval = min(trading_bots_intervals, key=interval_to_milliseconds)
+
+        if scheduler_mode in ("candle_close", "unified"):
+            with app.app_context():
+                measure_clock_offset()
+
+        if scheduler_mode == "unified":
+            add_trading_bots_job(
+                scheduler,
+                tick_interval,
+                partial(
+                    run_job_with_context, run_due_trading_bots, trading_bots_intervals
+                ),
+                scheduler_mode,
+                candle_close_delay_ms,
+                misfire_grace_time,
+                job_id=TRADING_BOTS_TICK_JOB_ID,
+            )
+            aligned_jobs = {TRADING_BOTS_TICK_JOB_ID: tick_interval}
+        else:
+            for interval, job_func in trading_bots_jobs:
+                add_trading_bots_job(
+                    scheduler,
+                    interval,
+                    partial(run_job_with_context, job_func),
+                    scheduler_mode,
+                    candle_close_delay_ms,
+                    misfire_grace_time,
+                )
+            aligned_jobs = {
+                f"trading_bots_{interval}": interval
+                for interval in trading_bots_intervals
+            }
+
+        add_trading_bots_job_listener(scheduler)
+
+        from .stefan.api_utils import shutdown_order_executor
+
+        scheduler.add_listener(
+            lambda event: shutdown_order_executor(), EVENT_SCHEDULER_SHUTDOWN
         )
+
+        from .stefan.exchange_info import preload_exchange_info, exchange_info_cache
+        from .stefan.rate_governor import rate_governor
+
+        rate_governor.limit = app.config.get("BINANCE_REQUEST_WEIGHT_LIMIT", 6000)
+
+        with app.app_context():
+            preload_exchange_info()
         scheduler.add_job(
-            func=partial(run_job_with_context, run_all_swing_1d_trading_bots),
+            func=partial(run_job_with_context, exchange_info_cache.refresh),
             trigger="interval",
-            hours=24,
+            seconds=max(app.config.get("EXCHANGE_INFO_TTL", 3600) // 2, 60),
         )
+
+        if app.config.get("INDICATOR_STATE_ENABLED", False):
+            from .stefan.indicator_state import indicator_states
+
+            checkpoint_file = app.config.get("INDICATOR_STATE_CHECKPOINT_FILE")
+            indicator_states.restore(checkpoint_file)
+            scheduler.add_job(
+                func=partial(run_job_with_context, indicator_states.checkpoint, checkpoint_file),
+                trigger="interval",
+                minutes=5,
+            )
+
+        if app.config.get("MARKET_STREAM_ENABLED", False):
+            from .stefan.market_stream import start_market_stream, refresh_market_streams
+
+            with app.app_context():
+                start_market_stream()
+            scheduler.add_job(
+                func=partial(run_job_with_context, refresh_market_streams),
+                trigger="interval",
+                minutes=5,
+            )
+
+        if scheduler_mode in ("candle_close", "unified"):
+            scheduler.add_job(
+                func=partial(
+                    run_job_with_context,
+                    realign_candle_close_jobs,
+                    scheduler,
+                    aligned_jobs,
+                    candle_close_delay_ms,
+                ),
+                trigger="interval",
+                minutes=30,
+            )
+
         scheduler.add_job(
             func=partial(run_job_with_context, send_logs_via_email_and_clear_logs),
             trigger="interval",
@@ -243,8 +332,13 @@ def start_scheduler():
 
 
 from .routes import main
+from .stefan.kline_import import import_klines_command
+from .stefan.benchmark_cli import benchmark_sweep_command, fake_exchange_command
 
 app.register_blueprint(main)
+app.cli.add_command(import_klines_command)
+app.cli.add_command(fake_exchange_command)
+app.cli.add_command(benchmark_sweep_command)
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8000)
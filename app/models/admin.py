@@ -201,6 +201,8 @@ class BotSettingsAdmin(AdminModelView):
         'ema_slow_timeperiod',
         'psar_acceleration',
         'psar_maximum',
+        'vwap_anchor',
+        'vwap_timeperiod',
         'avg_close_period',
         'avg_volume_period',
         'avg_adx_period',
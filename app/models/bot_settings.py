@@ -93,6 +93,8 @@ class BotSettings(db.Model):
         ema_slow_timeperiod (int): The slow EMA time period.
         psar_acceleration (float): The PSAR acceleration value.
         psar_maximum (float): The PSAR maximum value.
+        vwap_anchor (str): The VWAP anchor: 'frame', 'rolling', 'session' (UTC day) or 'weekly'.
+        vwap_timeperiod (int): The number of candles of the rolling VWAP.
         cci_buy (int): The CCI value for buy signals.
         cci_sell (int): The CCI value for sell signals.
         rsi_buy (int): The RSI value for buy signals.
@@ -254,6 +256,8 @@ class BotSettings(db.Model):
     ema_slow_timeperiod = db.Column(db.Integer, default=21, nullable=True)
     psar_acceleration = db.Column(db.Float, default=0.02, nullable=True)
     psar_maximum = db.Column(db.Float, default=0.2, nullable=True)
+    vwap_anchor = db.Column(db.String(16), default="frame", nullable=True)
+    vwap_timeperiod = db.Column(db.Integer, default=20, nullable=True)
 
     cci_buy = db.Column(db.Integer, default=-100, nullable=True)
     cci_sell = db.Column(db.Integer, default=100, nullable=True)
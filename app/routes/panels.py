@@ -17,6 +17,7 @@ from ..stefan.api_utils import (
     fetch_account_status,
     fetch_server_time,
 )
+from ..stefan.rate_governor import PRIORITY_LOW, request_priority
 from ..utils.trades_utils import show_account_balance
 from ..stefan.logic_utils import is_df_valid
 
@@ -24,6 +25,7 @@ from ..stefan.logic_utils import is_df_valid
 @main.route("/")
 @exception_handler(default_return=lambda: redirect(url_for("main.login")))
 @requires_authentication("User")
+@request_priority(PRIORITY_LOW)
 def user_panel_view():
     """
     View for the user panel. This view is accessible only to authenticated users.
@@ -52,6 +54,7 @@ def user_panel_view():
 @exception_handler(default_return=lambda: redirect(url_for("main.user_panel_view")))
 @requires_authentication("Control")
 @requires_control_access("Control")
+@request_priority(PRIORITY_LOW)
 def control_panel_view():
     """
     View for the control panel. This view is accessible only to authenticated users with control panel access.
@@ -18,6 +18,12 @@ from ..utils.bots_utils import (
     stop_single_bot,
     handle_emergency_sell_order,
 )
+from ..stefan.rate_governor import get_rate_usage
+from ..stefan.scheduling import (
+    get_decision_latency_stats,
+    get_order_latency_stats,
+    get_sweep_stats,
+)
 
 
 @main.route("/start/<int:bot_id>")
@@ -158,7 +164,7 @@ def fetch_and_save_data_for_backtest():
     if bot_settings:
         fetch_and_save_data(backtest_settings, bot_settings)
         flash(
-            f"Data for backtest {bot_settings.symbol} fetched and saved in {backtest_settings.csv_file_path}.",
+            f"Data for backtest {bot_settings.symbol} {bot_settings.interval} fetched and saved in kline store.",
             "success",
         )
     else:
@@ -174,7 +180,7 @@ def run_backtest():
     Runs a backtest using stored trading data and settings.
     Redirects to the backtest panel view after execution.
     """
-    from ..stefan.backtesting import backtest_strategy
+    from ..stefan.backtesting import backtest_strategy, load_backtest_data
     from ..stefan.logic_utils import is_df_valid
 
     check_if_user_have_control_access(current_user, "Control")
@@ -184,9 +190,9 @@ def run_backtest():
         BotSettings.id == backtest_settings.bot_id
     ).first()
     if bot_settings:
-        df = pd.read_csv(f"/backtesting/{backtest_settings.csv_file_path}")
+        df = load_backtest_data(backtest_settings, bot_settings)
         if is_df_valid(df, bot_settings.id):
-            df["time"] = pd.to_datetime(df["close_time"])
+            df["time"] = pd.to_datetime(df["close_time"], unit="ms")
             backtest_strategy(df, bot_settings, backtest_settings)
             flash("Backtest completed. Read log file", "success")
         else:
@@ -215,6 +221,25 @@ def get_df():
     return jsonify({"all_bots_df": all_bots_df}), 200
 
 
+@main.route("/get_stats/", methods=["GET"])
+@exception_handler(
+    default_return=(lambda: (jsonify({"error": "Internal Server Error"}), 500))
+)
+@login_required
+def get_stats():
+    """
+    Retrieves and returns the Binance request weight usage, the sweep statistics and
+    the decision and order latencies of the bots as a JSON response.
+    """
+    stats = {
+        "rate_usage": get_rate_usage(),
+        "sweep_stats": get_sweep_stats(),
+        "decision_latency": get_decision_latency_stats(),
+        "order_latency": get_order_latency_stats(),
+    }
+    return jsonify(stats), 200
+
+
 @main.route("/emergencystop", methods=["POST"])
 @limiter.limit("2/hour")
 @exception_handler()
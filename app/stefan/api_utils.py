@@ -1,16 +1,57 @@
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
-from typing import Tuple, Union, Optional
+from typing import Callable, Dict, Tuple, Union, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import numpy as np
 import pandas as pd
+from requests.adapters import HTTPAdapter
 from binance.client import Client
+from flask import current_app, has_app_context
 from app.models import BotSettings
 import os
 from ..utils.logging import logger
 from ..utils.exception_handlers import exception_handler
 from ..utils.retry_connection import retry_connection
+from ..utils.app_utils import get_config_value
+from .rate_governor import (
+    PRIORITY_LOW,
+    PRIORITY_TRADING,
+    get_request_priority,
+    rate_governor,
+    request_priority,
+    request_priority_scope,
+)
 
 load_dotenv()
 
+KLINE_FIELDS = [
+    "open_time",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "close_time",
+    "quote_asset_volume",
+    "number_of_trades",
+    "taker_buy_base_asset_volume",
+    "taker_buy_quote_asset_volume",
+]
+KLINE_INT_FIELDS = ["open_time", "close_time", "number_of_trades"]
+KLINE_DTYPE = np.dtype("<f8")
+KLINES_REQUEST_LIMIT = 1000
+DEFAULT_BINANCE_POOL_SIZE = 10
+DEFAULT_ORDER_PREPARATION_WORKERS = 4
+
+_binance_clients: Dict[Tuple[Optional[str], bool], Client] = {}
+_binance_clients_lock = threading.Lock()
+_binance_client_locks: Dict[Tuple[Optional[str], bool], threading.Lock] = {}
+_binance_client_factory: Optional[Callable[..., Client]] = None
+_order_executor: Optional[ThreadPoolExecutor] = None
+_order_executor_lock = threading.Lock()
+
 
 def get_binance_api_credentials(
     bot_id: str = None, testnet: bool = False
@@ -39,13 +80,47 @@ def get_binance_api_credentials(
     return api_key, api_secret
 
 
+def get_binance_client_class(api_url: Optional[str] = None) -> type:
+    """
+    Returns the Binance client class, pointed at `api_url` or `BINANCE_API_URL`.
+
+    Setting the environment variable `BINANCE_API_URL` (e.g. to the URL of a local
+    FakeExchangeServer, 'http://127.0.0.1:8899/api') sends all REST requests of the
+    clients to that server instead of the exchange.
+
+    Args:
+        api_url (str, optional): The REST API URL. Defaults to `BINANCE_API_URL`.
+
+    Returns:
+        type: The Binance client class.
+    """
+    api_url = api_url or os.environ.get("BINANCE_API_URL")
+    if not api_url:
+        return Client
+    base_url = api_url.rstrip("/").rsplit("/", 1)[0]
+    return type(
+        "StefanBinanceClient",
+        (Client,),
+        {"API_URL": api_url, "MARGIN_API_URL": f"{base_url}/sapi"},
+    )
+
+
 @exception_handler()
 @retry_connection()
 def create_binance_client(
     bot_id: str = None, testnet: bool = False
 ) -> Union[Optional[int], Client]:
     """
-    Creates a Binance client instance using the provided API credentials.
+    Returns a Binance client instance using the provided API credentials.
+
+    Clients are cached per bot and environment, so their HTTP session and its
+    keep-alive connections are reused by all requests of the bot. A client is built
+    under the lock of its bot and environment, so concurrent callers share one
+    client. A cached client is replaced when the credentials of the bot change. The
+    replaced client is not closed, as other threads may still be using it, its
+    connections are released once it is no longer referenced. The connection pool size of the
+    session is taken from `BINANCE_POOL_SIZE`. All requests of the client go through
+    the process-wide rate governor.
 
     Args:
         bot_id (str, optional): The bot identifier to retrieve specific API credentials.
@@ -58,10 +133,101 @@ def create_binance_client(
         Exception: If there is an issue creating the client, an exception is logged and an email is sent to the admin.
     """
     api_key, api_secret = get_binance_api_credentials(bot_id, testnet)
-    return Client(api_key, api_secret, testnet=testnet)
+    cache_key = (str(bot_id) if bot_id else None, testnet)
+
+    with _binance_clients_lock:
+        client = _binance_clients.get(cache_key)
+        if client and (client.API_KEY, client.API_SECRET) == (api_key, api_secret):
+            return client
+        client_lock = _binance_client_locks.setdefault(cache_key, threading.Lock())
+
+    with client_lock:
+        client = _binance_clients.get(cache_key)
+        if client and (client.API_KEY, client.API_SECRET) == (api_key, api_secret):
+            return client
 
+        client_factory = _binance_client_factory or get_binance_client_class()
+        new_client = client_factory(api_key, api_secret, testnet=testnet)
+        pool_size = get_config_value("BINANCE_POOL_SIZE", DEFAULT_BINANCE_POOL_SIZE)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        new_client.session.mount("https://", adapter)
+        new_client.session.mount("http://", adapter)
+        rate_governor.install(new_client)
 
-general_client = create_binance_client(None)
+        with _binance_clients_lock:
+            _binance_clients[cache_key] = new_client
+
+    if client:
+        logger.info(f"Binance client of bot {bot_id} recreated after credentials change.")
+    return new_client
+
+
+def invalidate_binance_clients(bot_id: str = None) -> None:
+    """
+    Closes and removes cached Binance clients.
+
+    Args:
+        bot_id (str, optional): The bot whose clients are removed. All clients are removed if None.
+    """
+    with _binance_clients_lock:
+        cache_keys = [
+            cache_key
+            for cache_key in _binance_clients
+            if bot_id is None or cache_key[0] == str(bot_id)
+        ]
+        clients = [_binance_clients.pop(cache_key) for cache_key in cache_keys]
+
+    for client in clients:
+        client.close_connection()
+
+
+def set_binance_client_factory(factory: Optional[Callable[..., Client]]) -> None:
+    """
+    Sets the factory building all new Binance clients and drops the cached clients.
+
+    Args:
+        factory (callable, optional): Called with the API key, the API secret and
+            `testnet`, e.g. `get_binance_client_class(server.api_url)`. None restores
+            the default client class.
+    """
+    global _binance_client_factory
+    _binance_client_factory = factory
+    invalidate_binance_clients()
+
+
+def get_general_client() -> Client:
+    """Returns the cached Binance client of the general API credentials."""
+    return create_binance_client(None)
+
+
+def get_order_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool preparing the orders of all bots.
+
+    The pool is created on first use with `ORDER_PREPARATION_WORKERS` threads.
+
+    Returns:
+        ThreadPoolExecutor: The pool.
+    """
+    global _order_executor
+    with _order_executor_lock:
+        if _order_executor is None:
+            workers = int(
+                get_config_value("ORDER_PREPARATION_WORKERS", DEFAULT_ORDER_PREPARATION_WORKERS)
+            )
+            _order_executor = ThreadPoolExecutor(
+                max_workers=max(workers, 1), thread_name_prefix="stefan-order"
+            )
+        return _order_executor
+
+
+def shutdown_order_executor() -> None:
+    """Shuts down the order preparation pool, a later order creates a new one."""
+    global _order_executor
+    with _order_executor_lock:
+        executor, _order_executor = _order_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
 
 
 @exception_handler()
@@ -84,7 +250,8 @@ def fetch_data(
         end_str (str, optional): The end time for the historical data. If None, it uses the current time.
 
     Returns:
-        pd.DataFrame: A DataFrame containing the historical kline data.
+        pd.DataFrame: A DataFrame containing the historical kline data, decoded into
+            numeric columns by `klines_to_df`.
 
     Raises:
         BinanceAPIException: If there is an error from the Binance API.
@@ -109,41 +276,144 @@ def fetch_data(
 
         start_str = start_time.strftime("%Y-%m-%d %H:%M:%S")
 
-        klines = general_client.get_historical_klines(
+        klines = get_general_client().get_historical_klines(
             symbol=symbol, interval=interval, start_str=start_str
         )
     else:
-        klines = general_client.get_historical_klines(
+        klines = get_general_client().get_historical_klines(
             symbol=symbol,
             interval=interval,
             start_str=str(start_str),
             end_str=str(end_str),
         )
 
-    df = pd.DataFrame(
-        klines,
-        columns=[
-            "open_time",
-            "open",
-            "high",
-            "low",
-            "close",
-            "volume",
-            "close_time",
-            "quote_asset_volume",
-            "number_of_trades",
-            "taker_buy_base_asset_volume",
-            "taker_buy_quote_asset_volume",
-            "ignore",
-        ],
+    return klines_to_df(klines)
+
+
+@exception_handler()
+@retry_connection(max_retries=5, delay=3)
+def fetch_klines(
+    symbol: str,
+    interval: str,
+    start_time: Optional[int] = None,
+    limit: int = KLINES_REQUEST_LIMIT,
+) -> List[list]:
+    """
+    Fetch raw klines with a single API request.
+
+    Unlike `fetch_data`, which pages through `get_historical_klines`, this makes one
+    `get_klines` request and is meant for fetching at most `limit` candles.
+
+    Args:
+        symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): The interval between each candlestick (e.g., '1m').
+        start_time (int, optional): The open time of the first kline in milliseconds.
+            If None, the most recent `limit` klines are returned.
+        limit (int, optional): The maximum number of klines returned. Default is 1000.
+
+    Returns:
+        list: The raw klines as returned by the Binance API.
+
+    Raises:
+        BinanceAPIException: If there is an error from the Binance API.
+        ConnectionError: If there is a connection error.
+        TimeoutError: If there is a timeout error.
+    """
+    if start_time is None:
+        return get_general_client().get_klines(symbol=symbol, interval=interval, limit=limit)
+    return get_general_client().get_klines(
+        symbol=symbol, interval=interval, startTime=int(start_time), limit=limit
     )
-    df["close"] = df["close"].astype(float)
-    df["high"] = df["high"].astype(float)
-    df["low"] = df["low"].astype(float)
 
+
+@exception_handler()
+@retry_connection(max_retries=5, delay=3)
+def fetch_historical_klines(
+    symbol: str, interval: str, start_time: int, end_time: int
+) -> List[list]:
+    """
+    Fetch raw klines with open times between two timestamps.
+
+    Args:
+        symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): The interval between each candlestick (e.g., '1m').
+        start_time (int): The earliest open time in milliseconds.
+        end_time (int): The latest open time in milliseconds (inclusive).
+
+    Returns:
+        list: The raw klines as returned by the Binance API.
+
+    Raises:
+        BinanceAPIException: If there is an error from the Binance API.
+        ConnectionError: If there is a connection error.
+        TimeoutError: If there is a timeout error.
+    """
+    return get_general_client().get_historical_klines(
+        symbol=symbol,
+        interval=interval,
+        start_str=int(start_time),
+        end_str=int(end_time),
+    )
+
+
+def klines_to_array(klines: List[list]) -> np.ndarray:
+    """
+    Decode raw Binance klines into a 2-D float64 array in one pass.
+
+    Args:
+        klines (list): The raw klines as returned by the Binance API.
+
+    Returns:
+        np.ndarray: Array of shape (len(klines), len(KLINE_FIELDS)), one row per kline.
+    """
+    if not klines:
+        return np.empty((0, len(KLINE_FIELDS)), dtype=KLINE_DTYPE)
+    fields_count = len(KLINE_FIELDS)
+    return np.array([kline[:fields_count] for kline in klines], dtype=KLINE_DTYPE)
+
+
+def array_to_df(rows: np.ndarray) -> pd.DataFrame:
+    """
+    Convert a klines array into a typed DataFrame.
+
+    Every field becomes one contiguous column: int64 for open and close times and
+    the number of trades, float64 for prices and volumes. The frame is marked with
+    `df.attrs["typed"] = True`, so `handle_ta_df_initial_praparation` can skip the
+    numeric conversion.
+
+    Args:
+        rows (np.ndarray): Klines array of shape (n, len(KLINE_FIELDS)).
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the kline data.
+    """
+    columns = np.ascontiguousarray(np.asarray(rows, dtype=KLINE_DTYPE).T)
+    df = pd.DataFrame(
+        {
+            field: columns[index].astype(np.int64)
+            if field in KLINE_INT_FIELDS
+            else columns[index]
+            for index, field in enumerate(KLINE_FIELDS)
+        },
+        copy=False,
+    )
+    df.attrs["typed"] = True
     return df
 
 
+def klines_to_df(klines: List[list]) -> pd.DataFrame:
+    """
+    Convert raw Binance klines into a typed DataFrame.
+
+    Args:
+        klines (list): The raw klines as returned by the Binance API.
+
+    Returns:
+        pd.DataFrame: A DataFrame with one row per kline and numeric columns.
+    """
+    return array_to_df(klines_to_array(klines))
+
+
 @exception_handler(default_return=0)
 @retry_connection()
 def get_account_balance(bot_id: str, assets: list) -> Union[dict, int]:
@@ -190,15 +460,17 @@ def fetch_current_price(symbol: str) -> Union[float, Optional[int]]:
         TimeoutError: If there is a timeout error.
         Exception: For any other exception, an email is sent to the admin.
     """
-    ticker = general_client.get_symbol_ticker(symbol=symbol)
+    ticker = get_general_client().get_symbol_ticker(symbol=symbol)
     return float(ticker["price"])
 
 
 @exception_handler(default_return=(0, 0))
-@retry_connection()
 def get_minimum_order_quantity(bot_id: str, symbol: str) -> Tuple[float, float]:
     """
-    Fetches the minimum order quantity and step size for a given symbol on Binance.
+    Returns the minimum order quantity and step size for a given symbol on Binance.
+
+    The LOT_SIZE filter is read from the process-wide exchange info cache, so no
+    request is made unless the cache is expired or the symbol is unknown.
 
     Args:
         bot_id (int): The ID of the bot.
@@ -208,24 +480,23 @@ def get_minimum_order_quantity(bot_id: str, symbol: str) -> Tuple[float, float]:
         tuple: A tuple containing the minimum order quantity and step size.
                Returns (0, 0) if not found.
     """
-    bot_client = create_binance_client(bot_id)
-    exchange_info = bot_client.get_symbol_info(symbol)
-    filters = exchange_info["filters"]
-    for f in filters:
-        if f["filterType"] == "LOT_SIZE":
-            min_qty = float(f["minQty"])
-            step_size = float(f["stepSize"])
-            return min_qty, step_size
-    return 0, 0
+    from .exchange_info import exchange_info_cache
+
+    min_qty, step_size = exchange_info_cache.get_lot_size(symbol)
+    if min_qty is None:
+        return 0, 0
+    return min_qty, step_size
 
 
 @exception_handler()
-@retry_connection()
 def get_minimum_order_value(
     bot_id: str, symbol: str
 ) -> Union[Tuple[float, float], Optional[int]]:
     """
-    Fetches the minimum order value (notional) for a given symbol on Binance.
+    Returns the minimum order value (notional) for a given symbol on Binance.
+
+    The NOTIONAL filter is read from the process-wide exchange info cache, so no
+    request is made unless the cache is expired or the symbol is unknown.
 
     Args:
         bot_id (int): The ID of the bot.
@@ -234,19 +505,60 @@ def get_minimum_order_value(
     Returns:
         float or None: The minimum notional value for the symbol, or None if not found.
     """
-    bot_client = create_binance_client(bot_id)
-    exchange_info = bot_client.get_symbol_info(symbol)
-    filters = exchange_info["filters"]
+    from .exchange_info import exchange_info_cache
+
+    return exchange_info_cache.get_min_notional(symbol)
+
+
+def fetch_order_inputs(
+    bot_id: str, symbol: str, assets: List[str]
+) -> Tuple[dict, float, Tuple[float, float], Optional[float]]:
+    """
+    Fetches everything needed to prepare an order of the bot concurrently.
+
+    The account balance and the current price are requested in parallel on the order
+    preparation pool, while the symbol filters are read from the exchange info cache.
+    The requests run with the request priority of the caller and in its application
+    context, if there is one.
+
+    Args:
+        bot_id (int): The ID of the bot placing the order.
+        symbol (str): The trading symbol (e.g., 'BTCUSDT').
+        assets (list): The assets whose balances are fetched.
+
+    Returns:
+        tuple: The balances, the current price, the minimum order quantity and step size,
+               and the minimum notional value.
+    """
+    app = current_app._get_current_object() if has_app_context() else None
+    priority = get_request_priority()
+
+    def run_in_app_context(func, *args):
+        with request_priority_scope(priority):
+            if app is None:
+                return func(*args)
+            with app.app_context():
+                return func(*args)
+
+    order_executor = get_order_executor()
+    balance_future = order_executor.submit(
+        run_in_app_context, get_account_balance, bot_id, assets
+    )
+    price_future = order_executor.submit(
+        run_in_app_context, fetch_current_price, symbol
+    )
+    lot_size = get_minimum_order_quantity(bot_id, symbol)
+    min_notional = get_minimum_order_value(bot_id, symbol)
 
-    for f in filters:
-        if f["filterType"] == "NOTIONAL":
-            return float(f["minNotional"])
-    return None
+    return balance_future.result(), price_future.result(), lot_size, min_notional
 
 
 @exception_handler(default_return=(False, False))
 @retry_connection(max_retries=3, delay=3)
-def place_buy_order(bot_id: str) -> Union[Tuple[bool, float], Tuple[bool, bool]]:
+@request_priority(PRIORITY_TRADING)
+def place_buy_order(
+    bot_id: str, signal_time: Optional[float] = None
+) -> Union[Tuple[bool, float], Tuple[bool, bool]]:
     """
     Places a market buy order for a specified symbol on Binance using available stablecoin balance.
 
@@ -256,12 +568,15 @@ def place_buy_order(bot_id: str) -> Union[Tuple[bool, float], Tuple[bool, bool]]
 
     Args:
         bot_id (int): The ID of the bot placing the order.
+        signal_time (float, optional): The `time.perf_counter()` of the buy signal. If given,
+            the time from the signal to the order submission is recorded.
 
     Returns:
         tuple: A tuple containing a boolean indicating success or failure and the amount purchased,
                or False if the order couldn't be placed.
     """
     from .calc_utils import round_down_to_step_size
+    from .scheduling import record_order_latency
     from ..utils.email_utils import send_admin_email
 
     binance_min_order_amount = 0.0001
@@ -275,9 +590,11 @@ def place_buy_order(bot_id: str) -> Union[Tuple[bool, float], Tuple[bool, bool]]
     cryptocoin_symbol = symbol[:3]
     stablecoin_symbol = symbol[-4:]
 
-    balance = get_account_balance(bot_id, [stablecoin_symbol, cryptocoin_symbol])
+    balance, price, (min_qty, step_size), min_notional = fetch_order_inputs(
+        bot_id, symbol, [stablecoin_symbol, cryptocoin_symbol]
+    )
     stablecoin_balance = float(balance.get(stablecoin_symbol, "0.0"))
-    price = float(fetch_current_price(symbol))
+    price = float(price)
 
     logger.trade(
         f"place_buy_order() Bot {bot_id} Fetched stablecoin balance: {stablecoin_balance}"
@@ -285,7 +602,6 @@ def place_buy_order(bot_id: str) -> Union[Tuple[bool, float], Tuple[bool, bool]]
     logger.trade(f"place_buy_order() Bot {bot_id} Fetched price for {symbol}: {price}")
 
     affordable_amount = (stablecoin_balance * capital_utilization_pct) / price
-    min_qty, step_size = get_minimum_order_quantity(bot_id, symbol)
     amount_to_buy = float(round_down_to_step_size(affordable_amount, step_size))
 
     if min_qty is None or step_size is None:
@@ -294,7 +610,6 @@ def place_buy_order(bot_id: str) -> Union[Tuple[bool, float], Tuple[bool, bool]]
         )
         return False, False
 
-    min_notional = get_minimum_order_value(bot_id, symbol)
     min_notional = min_notional if min_notional is not None else 0.0
 
     logger.trade(f"place_buy_order() Bot {bot_id} Amount_to_buy: {amount_to_buy}")
@@ -316,6 +631,10 @@ def place_buy_order(bot_id: str) -> Union[Tuple[bool, float], Tuple[bool, bool]]
 
     if amount_to_buy > 0 and amount_to_buy >= min_qty:
         if required_stablecoin >= min_notional:
+            if signal_time is not None:
+                record_order_latency(
+                    bot_id, "buy", (time.perf_counter() - signal_time) * 1000
+                )
             order_response = bot_client.order_market_buy(
                 symbol=symbol, quantity=amount_to_buy
             )
@@ -350,19 +669,25 @@ def place_buy_order(bot_id: str) -> Union[Tuple[bool, float], Tuple[bool, bool]]
 
 @exception_handler(default_return=(False, False))
 @retry_connection(max_retries=5, delay=3)
-def place_sell_order(bot_id: str) -> Union[Tuple[bool, float], Tuple[bool, bool]]:
+@request_priority(PRIORITY_TRADING)
+def place_sell_order(
+    bot_id: str, signal_time: Optional[float] = None
+) -> Union[Tuple[bool, float], Tuple[bool, bool]]:
     """
     Places a sell order for a specified bot. The function fetches the account balance for the specified cryptocurrency
     symbol, calculates the amount to sell based on the available balance and step size, and places a market sell order.
 
     Args:
         bot_id (int): The ID of the bot for which the sell order is placed.
+        signal_time (float, optional): The `time.perf_counter()` of the sell signal. If given,
+            the time from the signal to the order submission is recorded.
 
     Returns:
         tuple: A tuple containing a boolean indicating the success of the order and the amount of cryptocurrency sold.
                Returns (False, False) if the order couldn't be placed or there isn't enough balance to sell.
     """
     from .calc_utils import round_down_to_step_size
+    from .scheduling import record_order_latency
 
     bot_settings = BotSettings.query.get(bot_id)
     symbol = bot_settings.symbol
@@ -372,16 +697,17 @@ def place_sell_order(bot_id: str) -> Union[Tuple[bool, float], Tuple[bool, bool]
     cryptocoin_symbol = symbol[:3]
     stablecoin_symbol = symbol[-4:]
 
-    balance = get_account_balance(bot_id, [stablecoin_symbol, cryptocoin_symbol])
+    balance, price, (min_qty, step_size), _ = fetch_order_inputs(
+        bot_id, symbol, [stablecoin_symbol, cryptocoin_symbol]
+    )
     crypto_balance = float(balance.get(cryptocoin_symbol, 0))
-    price = float(fetch_current_price(symbol))
+    price = float(price)
 
     logger.trade(
         f"place_sell_order() Bot {bot_id} Fetched balance for {cryptocoin_symbol}: {crypto_balance}"
     )
     logger.trade(f"place_sell_order() Bot {bot_id} Fetched price for {symbol}: {price}")
 
-    min_qty, step_size = get_minimum_order_quantity(bot_id, symbol)
     min_qty = min_qty if min_qty is not None else 0
 
     if crypto_balance >= min_qty:
@@ -392,6 +718,8 @@ def place_sell_order(bot_id: str) -> Union[Tuple[bool, float], Tuple[bool, bool]
         logger.trade(f"step_size {step_size}")
         logger.trade(f"amount_to_sell {amount_to_sell}")
 
+        if signal_time is not None:
+            record_order_latency(bot_id, "sell", (time.perf_counter() - signal_time) * 1000)
         order_response = bot_client.order_market_sell(
             symbol=symbol, quantity=amount_to_sell
         )  # quantity=crypto_balance
@@ -421,6 +749,21 @@ def place_sell_order(bot_id: str) -> Union[Tuple[bool, float], Tuple[bool, bool]
 
 @exception_handler()
 @retry_connection()
+@request_priority(PRIORITY_TRADING)
+def fetch_exchange_info() -> Optional[dict]:
+    """
+    Fetches the exchange info of all symbols from the Binance API.
+
+    Returns:
+        dict: The exchange info including the filters of every symbol, otherwise returns None.
+    """
+    exchange_info = get_general_client().get_exchange_info()
+    return exchange_info
+
+
+@exception_handler()
+@retry_connection()
+@request_priority(PRIORITY_LOW)
 def fetch_system_status():
     """
     Fetches the current system status from the Binance API.
@@ -428,12 +771,13 @@ def fetch_system_status():
     Returns:
         dict: A dictionary containing the system status if the request is successful, otherwise returns None.
     """
-    status = general_client.get_system_status()
+    status = get_general_client().get_system_status()
     return status
 
 
 @exception_handler()
 @retry_connection()
+@request_priority(PRIORITY_LOW)
 def fetch_account_status(bot_id: str = None) -> Union[dict, Optional[int]]:
     """
     Fetches the account status of the bot's associated Binance account.
@@ -445,7 +789,7 @@ def fetch_account_status(bot_id: str = None) -> Union[dict, Optional[int]]:
         dict: A dictionary containing the account status if the request is successful, otherwise returns None.
     """
     if not bot_id:
-        status = general_client.get_account()
+        status = get_general_client().get_account()
         return status
     else:
         bot_client = create_binance_client(bot_id)
@@ -462,5 +806,5 @@ def fetch_server_time():
     Returns:
         dict: A dictionary containing the server time if the request is successful, otherwise returns None.
     """
-    server_time = general_client.get_server_time()
+    server_time = get_general_client().get_server_time()
     return server_time
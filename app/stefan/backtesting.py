@@ -2,8 +2,10 @@ import pandas as pd
 from .. import db
 from ..utils.logging import logger
 from ..models import BacktestSettings, BotSettings
-from typing import Optional
-from .api_utils import fetch_data
+from typing import Optional, Tuple
+from binance.helpers import date_to_milliseconds
+from ..utils.app_utils import get_config_value
+from .kline_store import DEFAULT_DOWNLOAD_WORKERS, get_kline_store
 from .calc_utils import (
     calculate_stop_loss,
     calculate_atr_trailing_stop_loss,
@@ -22,29 +24,37 @@ def fetch_and_save_data(
 ) -> Optional[int]:
     """
     Fetches historical market data for the given symbol and interval from an API,
-    and saves it as a CSV file for backtesting.
+    and saves it in the local kline store for backtesting.
+
+    Only the klines missing from the store are fetched, in concurrent chunks of
+    `KLINE_DOWNLOAD_WORKERS` requests that are written to the store as they arrive.
+    Loading a period that is already stored makes no API calls, and an interrupted
+    download resumes where it stopped.
 
     Parameters:
-    - backtest_settings: Settings related to the backtest, including start and end dates, and CSV file path.
+    - backtest_settings: Settings related to the backtest, including start and end dates.
     - bot_settings: Settings related to the bot, including symbol and interval for data fetching.
 
     Returns:
-    - A DataFrame containing the fetched market data, or None if data could not be fetched.
+    - A DataFrame containing the stored market data, or None if data could not be fetched.
     """
     symbol = str(bot_settings.symbol)
     interval = str(bot_settings.interval)
-    start_str = str(backtest_settings.start_date)
-    end_str = str(backtest_settings.end_date)
-
-    df = fetch_data(
-        symbol=symbol, interval=interval, start_str=start_str, end_str=end_str
+    start_ms, end_ms = get_backtest_period_ms(backtest_settings)
+
+    kline_store = get_kline_store()
+    stored_count = kline_store.download(
+        symbol,
+        interval,
+        start_ms,
+        end_ms,
+        workers=get_config_value("KLINE_DOWNLOAD_WORKERS", DEFAULT_DOWNLOAD_WORKERS),
     )
+    df = kline_store.read_df(symbol, interval, start_ms, end_ms)
 
     if df is not None and not df.empty:
-        csv_file_path = backtest_settings.csv_file_path
-        df.to_csv(csv_file_path, index=False)
         logger.trade(
-            f"Data for backtest {bot_settings.symbol} saved in {csv_file_path}"
+            f"Data for backtest {symbol} {interval} saved in kline store. {stored_count} klines fetched, {len(df)} klines stored."
         )
     else:
         logger.trade(f"Failed to fetch data for {symbol}. Dataframe is None or empty.")
@@ -52,6 +62,40 @@ def fetch_and_save_data(
     return df
 
 
+def load_backtest_data(
+    backtest_settings: BacktestSettings, bot_settings: BotSettings
+) -> pd.DataFrame:
+    """
+    Loads the market data of the backtest period from the local kline store.
+
+    Parameters:
+    - backtest_settings: Settings related to the backtest, including start and end dates.
+    - bot_settings: Settings related to the bot, including symbol and interval.
+
+    Returns:
+    - A DataFrame containing the stored market data. Empty if nothing is stored.
+    """
+    start_ms, end_ms = get_backtest_period_ms(backtest_settings)
+    return get_kline_store().read_df(
+        str(bot_settings.symbol), str(bot_settings.interval), start_ms, end_ms
+    )
+
+
+def get_backtest_period_ms(backtest_settings: BacktestSettings) -> Tuple[int, int]:
+    """
+    Returns the backtest period as open times in milliseconds.
+
+    Parameters:
+    - backtest_settings: Settings related to the backtest, including start and end dates.
+
+    Returns:
+    - The first open time and the open time after the last kline of the period.
+    """
+    start_ms = date_to_milliseconds(str(backtest_settings.start_date))
+    end_ms = date_to_milliseconds(str(backtest_settings.end_date)) + 1
+    return start_ms, end_ms
+
+
 def backtest_strategy(
     df: pd.DataFrame, bot_settings: BotSettings, backtest_settings: BacktestSettings
 ) -> Optional[int]:
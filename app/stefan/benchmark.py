@@ -0,0 +1,173 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Union
+from binance.client import Client
+from flask import current_app
+from .. import db
+from ..models import BotSettings, BotCurrentTrade, BotTechnicalAnalysis
+from ..utils.logging import logger
+from .api_utils import set_binance_client_factory
+from .exchange_info import exchange_info_cache
+from .fake_exchange import FakeExchange
+from .kline_store import get_kline_store
+from .market_data import kline_buffer
+from .rate_governor import get_rate_usage
+from .scheduling import interval_to_milliseconds
+from .trading_bot import run_trading_bots_sweep
+
+
+def create_fake_exchange(
+    symbols: List[str],
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    from_store: bool = False,
+) -> FakeExchange:
+    """
+    Creates a fake exchange trading the given symbols.
+
+    Args:
+        symbols (list): The symbols, e.g. ['BTCUSDC'].
+        latency_ms (float, optional): Delay added to every request in milliseconds.
+        jitter_ms (float, optional): Maximum random delay added on top of the latency.
+        error_rate (float, optional): Fraction of requests answered with an internal error.
+        from_store (bool, optional): Replay the 1m klines of the kline store instead of a random walk.
+
+    Returns:
+        FakeExchange: The exchange.
+    """
+    exchange = FakeExchange(latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate)
+    for symbol in symbols:
+        rows = get_kline_store().read(symbol, "1m") if from_store else None
+        exchange.add_symbol(symbol, rows)
+    return exchange
+
+
+@contextmanager
+def exchange_client_factory(factory: Callable[..., Client]) -> Iterator[None]:
+    """
+    Builds all Binance clients of the process with the given factory while active.
+
+    Args:
+        factory (callable): The client factory, e.g. `get_binance_client_class(server.api_url)`.
+    """
+    set_binance_client_factory(factory)
+    exchange_info_cache.refresh()
+    kline_buffer.clear()
+    try:
+        yield
+    finally:
+        set_binance_client_factory(None)
+        exchange_info_cache.refresh()
+        kline_buffer.clear()
+
+
+@contextmanager
+def muted_trade_notifications() -> Iterator[None]:
+    """Switches off the trade emails and telegrams of benchmark trades."""
+    notifications_enabled = current_app.config.get("TRADE_NOTIFICATIONS_ENABLED", True)
+    current_app.config["TRADE_NOTIFICATIONS_ENABLED"] = False
+    try:
+        yield
+    finally:
+        current_app.config["TRADE_NOTIFICATIONS_ENABLED"] = notifications_enabled
+
+
+def clone_bot(template: BotSettings) -> BotSettings:
+    """
+    Creates a stopped copy of a bot with empty trade and technical analysis records.
+
+    The copy is not running, so the scheduler never picks it up. The benchmark runs
+    it directly with `require_running=False`.
+
+    Args:
+        template (BotSettings): The bot to copy.
+
+    Returns:
+        BotSettings: The committed copy.
+    """
+    columns = {
+        column.name: getattr(template, column.name)
+        for column in BotSettings.__table__.columns
+        if column.name != "id"
+    }
+    clone = BotSettings(**columns)
+    clone.bot_running = False
+    clone.comment = f"benchmark clone of bot {template.id}"
+    db.session.add(clone)
+    db.session.flush()
+    db.session.add(BotCurrentTrade(bot_settings_id=clone.id))
+    db.session.add(BotTechnicalAnalysis(bot_settings_id=clone.id))
+    db.session.commit()
+    return clone
+
+
+def delete_bots(bots: List[BotSettings]) -> None:
+    """Deletes the given bots together with their trade and technical analysis records."""
+    bot_ids = [bot_settings.id for bot_settings in bots]
+    BotCurrentTrade.query.filter(BotCurrentTrade.bot_settings_id.in_(bot_ids)).delete()
+    BotTechnicalAnalysis.query.filter(BotTechnicalAnalysis.bot_settings_id.in_(bot_ids)).delete()
+    for bot_settings in BotSettings.query.filter(BotSettings.id.in_(bot_ids)).all():
+        db.session.delete(bot_settings)
+    db.session.commit()
+
+
+def benchmark_sweeps(
+    template: BotSettings,
+    bot_counts: List[int],
+    rounds: int = 3,
+    client_factory: Optional[Callable[..., Client]] = None,
+) -> List[Dict[str, Union[int, float, bool]]]:
+    """
+    Measures the sweep duration of growing numbers of bots.
+
+    For every bot count the template bot is cloned that many times and the clones are
+    run `rounds` times back to back with `run_trading_bots_sweep`, exactly like one
+    interval of the scheduler. A bot count overruns if a sweep takes longer than the
+    bot interval. Trade notifications are switched off and the clones are deleted
+    afterwards.
+
+    Args:
+        template (BotSettings): The bot whose settings are cloned.
+        bot_counts (list): The numbers of bots to measure, e.g. [10, 20, 40].
+        rounds (int, optional): Number of sweeps per bot count. Default is 3.
+        client_factory (callable, optional): Factory of the Binance clients of the
+            benchmark, e.g. pointed at a fake exchange. None uses the configured clients.
+
+    Returns:
+        list: One result per bot count with the average and maximum sweep duration in
+              milliseconds, the interval in milliseconds and whether the sweep overran.
+    """
+    if client_factory:
+        with exchange_client_factory(client_factory):
+            return benchmark_sweeps(template, bot_counts, rounds)
+
+    interval_ms = interval_to_milliseconds(template.interval)
+    results = []
+
+    for bot_count in bot_counts:
+        clones = [clone_bot(template) for _ in range(bot_count)]
+        durations_ms = []
+        try:
+            with muted_trade_notifications():
+                for _ in range(rounds):
+                    sweep_start = time.monotonic()
+                    run_trading_bots_sweep(
+                        clones, f"benchmark {bot_count} bots", require_running=False
+                    )
+                    durations_ms.append((time.monotonic() - sweep_start) * 1000)
+                    db.session.expire_all()
+        finally:
+            delete_bots(clones)
+
+        result = {
+            "bots": bot_count,
+            "avg_ms": sum(durations_ms) / len(durations_ms),
+            "max_ms": max(durations_ms),
+            "interval_ms": interval_ms,
+            "overrun": max(durations_ms) > interval_ms,
+        }
+        results.append(result)
+        logger.info(f"Sweep benchmark {result}. Rate usage {get_rate_usage()}.")
+
+    return results
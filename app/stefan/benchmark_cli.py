@@ -0,0 +1,85 @@
+import os
+import click
+from flask import current_app
+
+
+@click.command("fake-exchange")
+@click.option("--symbols", default="BTCUSDC", show_default=True, help="Comma separated symbols.")
+@click.option("--port", default=8899, show_default=True)
+@click.option("--latency-ms", default=0.0, show_default=True, help="Delay of every request.")
+@click.option("--jitter-ms", default=0.0, show_default=True, help="Maximum random extra delay.")
+@click.option("--error-rate", default=0.0, show_default=True, help="Fraction of failed requests.")
+@click.option("--from-store", is_flag=True, help="Replay the 1m klines of the kline store.")
+def fake_exchange_command(
+    symbols: str, port: int, latency_ms: float, jitter_ms: float, error_rate: float, from_store: bool
+) -> None:
+    """Serves a local fake exchange. Start the bot with BINANCE_API_URL set to its URL."""
+    from .benchmark import create_fake_exchange
+    from .fake_exchange import FakeExchangeServer
+
+    exchange = create_fake_exchange(
+        symbols.split(","), latency_ms, jitter_ms, error_rate, from_store
+    )
+    server = FakeExchangeServer(exchange, port=port)
+    click.echo(f"Fake exchange serving at {server.api_url}. Set BINANCE_API_URL={server.api_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+@click.command("benchmark-sweep")
+@click.argument("template_bot_id", type=int)
+@click.option("--bots", default="1,5,10,20", show_default=True, help="Comma separated bot counts.")
+@click.option("--rounds", default=3, show_default=True, help="Sweeps per bot count.")
+@click.option("--latency-ms", default=50.0, show_default=True, help="Delay of every fake exchange request.")
+@click.option("--jitter-ms", default=20.0, show_default=True, help="Maximum random extra delay.")
+@click.option("--error-rate", default=0.0, show_default=True, help="Fraction of failed requests.")
+@click.option(
+    "--external", is_flag=True, help="Use the exchange at BINANCE_API_URL instead of an in-process fake exchange."
+)
+def benchmark_sweep_command(
+    template_bot_id: int,
+    bots: str,
+    rounds: int,
+    latency_ms: float,
+    jitter_ms: float,
+    error_rate: float,
+    external: bool,
+) -> None:
+    """Measures how many clones of TEMPLATE_BOT_ID one process can run per interval."""
+    from .. import db
+    from ..models import BotSettings
+    from .api_utils import get_binance_client_class
+    from .benchmark import benchmark_sweeps, create_fake_exchange
+    from .fake_exchange import FakeExchangeServer
+
+    template = db.session.get(BotSettings, template_bot_id)
+    if template is None:
+        raise click.ClickException(f"Bot {template_bot_id} not found.")
+
+    server = None
+    if external:
+        if not os.environ.get("BINANCE_API_URL"):
+            raise click.ClickException("BINANCE_API_URL must point at a fake exchange.")
+        client_factory = get_binance_client_class(os.environ["BINANCE_API_URL"])
+    else:
+        exchange = create_fake_exchange([template.symbol], latency_ms, jitter_ms, error_rate)
+        server = FakeExchangeServer(exchange).start()
+        client_factory = get_binance_client_class(server.api_url)
+
+    try:
+        results = benchmark_sweeps(
+            template, [int(count) for count in bots.split(",")], rounds, client_factory
+        )
+    finally:
+        if server:
+            server.stop()
+
+    max_workers = current_app.config.get("BOTS_MAX_WORKERS", 1)
+    click.echo(f"{template.interval} sweeps with BOTS_MAX_WORKERS={max_workers}:")
+    for result in results:
+        click.echo(
+            f"{result['bots']:>5} bots  avg {result['avg_ms']:>9.1f} ms  max {result['max_ms']:>9.1f} ms"
+            f"{'  OVERRUN' if result['overrun'] else ''}"
+        )
@@ -1,10 +1,27 @@
+import functools
 import talib
+import numpy as np
 import pandas as pd
-from typing import Union, Optional, Tuple
+from typing import Union, Optional, Tuple, List, Sequence
 from ..models import BotSettings
 from ..utils.logging import logger
 from ..utils.email_utils import send_admin_email
 from ..utils.exception_handlers import exception_handler
+from .indicator_state import apply_indicator_state, get_indicator_state_averages
+from .indicator_plan import (
+    INDICATOR_GROUP_COLUMNS,
+    get_indicator_plan,
+    get_plan_columns,
+    get_plan_waves,
+)
+from .indicator_executor import run_indicator_tasks
+from .indicator_cache import (
+    get_indicator_cache_key,
+    get_indicator_group_params,
+    indicator_cache,
+)
+from .market_frame import MarketFrame
+from .vwap import calculate_vwap, get_vwap_anchor
 
 
 @exception_handler(default_return=(None, None))
@@ -35,7 +52,8 @@ def handle_ta_df_initial_praparation(
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Prepares the DataFrame for technical analysis by converting relevant columns to numeric
-    types and handling missing values.
+    types and handling missing values. Frames decoded by `klines_to_df` are marked with
+    `df.attrs["typed"]` and already hold numeric columns, so only the time columns are converted.
 
     Args:
         df (pandas.DataFrame): The raw DataFrame containing market data.
@@ -45,6 +63,11 @@ def handle_ta_df_initial_praparation(
         pandas.DataFrame: The cleaned DataFrame with numeric conversion and missing values handled.
         bool: False if an error occurs.
     """
+    if df.attrs.get("typed"):
+        df["open_time"] = pd.to_datetime(df["open_time"], unit="ms")
+        df["close_time"] = pd.to_datetime(df["close_time"], unit="ms")
+        return df
+
     df["close"] = pd.to_numeric(df["close"], errors="coerce")
     df["high"] = pd.to_numeric(df["high"], errors="coerce")
     df["low"] = pd.to_numeric(df["low"], errors="coerce")
@@ -60,7 +83,7 @@ def handle_ta_df_initial_praparation(
 
 @exception_handler(default_return=False)
 def calculate_ta_rsi(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculates the Relative Strength Index (RSI) using the 'close' price.
@@ -80,7 +103,7 @@ def calculate_ta_rsi(
 
 @exception_handler(default_return=False)
 def calculate_ta_cci(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculates the Commodity Channel Index (CCI) using 'high', 'low', and 'close' prices.
@@ -102,7 +125,7 @@ def calculate_ta_cci(
 
 @exception_handler(default_return=False)
 def calculate_ta_mfi(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculates the Money Flow Index (MFI) using 'high', 'low', 'close', and 'volume' data.
@@ -128,7 +151,7 @@ def calculate_ta_mfi(
 
 @exception_handler(default_return=False)
 def calculate_ta_adx(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculates the Average Directional Index (ADX) using 'high', 'low', and 'close' prices.
@@ -151,7 +174,7 @@ def calculate_ta_adx(
 
 @exception_handler(default_return=False)
 def calculate_ta_atr(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculates the Average True Range (ATR) using 'high', 'low', and 'close' prices.
@@ -173,7 +196,7 @@ def calculate_ta_atr(
 
 @exception_handler(default_return=False)
 def calculate_ta_di(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculates the Directional Indicators (DI) including the Plus DI and Minus DI
@@ -200,7 +223,7 @@ def calculate_ta_di(
 
 @exception_handler(default_return=False)
 def calculate_ta_stochastic(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculates the Stochastic Oscillator using 'high', 'low', and 'close' prices.
@@ -229,7 +252,7 @@ def calculate_ta_stochastic(
 
 @exception_handler(default_return=False)
 def calculate_ta_bollinger_bands(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculates the Bollinger Bands using 'close' price.
@@ -255,11 +278,15 @@ def calculate_ta_bollinger_bands(
 
 @exception_handler(default_return=False)
 def calculate_ta_vwap(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculate the Volume Weighted Average Price (VWAP) for the given DataFrame.
 
+    The VWAP is anchored as set by the bot's `vwap_anchor`: cumulative over the
+    DataFrame, over the last `vwap_timeperiod` candles, since the start of the UTC
+    session or since the start of the week (see `calculate_vwap`).
+
     Args:
         df (DataFrame): The DataFrame containing the price and volume data.
         bot_settings (object): The bot settings object containing relevant configuration for the calculation.
@@ -269,14 +296,20 @@ def calculate_ta_vwap(
         bool: False if an error occurs during calculation.
     """
     df["typical_price"] = (df["high"] + df["low"] + df["close"]) / 3
-    df["vwap"] = (df["typical_price"] * df["volume"]).cumsum() / df["volume"].cumsum()
+    df["vwap"] = calculate_vwap(
+        np.asarray(df["open_time"]),
+        np.asarray(df["typical_price"]),
+        np.asarray(df["volume"]),
+        get_vwap_anchor(bot_settings),
+        bot_settings.vwap_timeperiod or 0,
+    )
 
     return df
 
 
 @exception_handler(default_return=False)
 def calculate_ta_psar(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculate the Parabolic SAR (PSAR) for the given DataFrame using bot settings.
@@ -301,7 +334,7 @@ def calculate_ta_psar(
 
 @exception_handler(default_return=False)
 def calculate_ta_macd(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculate the Moving Average Convergence Divergence (MACD) for the given DataFrame.
@@ -332,7 +365,7 @@ def calculate_ta_macd(
 
 @exception_handler(default_return=False)
 def calculate_ta_ma(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculate the 200-period and 50-period Moving Averages (MA) for the given DataFrame.
@@ -345,15 +378,15 @@ def calculate_ta_ma(
         DataFrame: The original DataFrame with the calculated 200-period and 50-period MAs.
         bool: False if an error occurs during calculation.
     """
-    df["ma_200"] = df["close"].rolling(window=200).mean()
-    df["ma_50"] = df["close"].rolling(window=50).mean()
+    df["ma_200"] = talib.SMA(df["close"], timeperiod=200)
+    df["ma_50"] = talib.SMA(df["close"], timeperiod=50)
 
     return df
 
 
 @exception_handler(default_return=False)
 def calculate_ta_ema(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculate the Fast and Slow Exponential Moving Averages (EMA) for the given DataFrame.
@@ -375,7 +408,7 @@ def calculate_ta_ema(
 
 @exception_handler(default_return=False)
 def calculate_ta_stochastic_rsi(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculate the Stochastic RSI (Relative Strength Index) for the given DataFrame.
@@ -404,6 +437,66 @@ def calculate_ta_stochastic_rsi(
     return df
 
 
+TA_INDICATOR_CALCULATIONS = {
+    "rsi": calculate_ta_rsi,
+    "cci": calculate_ta_cci,
+    "mfi": calculate_ta_mfi,
+    "stoch": calculate_ta_stochastic,
+    "stoch_rsi": calculate_ta_stochastic_rsi,
+    "bollinger": calculate_ta_bollinger_bands,
+    "ema": calculate_ta_ema,
+    "macd": calculate_ta_macd,
+    "ma": calculate_ta_ma,
+    "atr": calculate_ta_atr,
+    "psar": calculate_ta_psar,
+    "vwap": calculate_ta_vwap,
+    "adx": calculate_ta_adx,
+    "di": calculate_ta_di,
+}
+
+
+@exception_handler(default_return=False)
+def calculate_ta_group_cached(
+    df: Union[pd.DataFrame, MarketFrame], bot_settings: BotSettings, group: str
+) -> Union[Optional[int], pd.DataFrame]:
+    """
+    Calculates one indicator group or copies its columns from the indicator cache.
+
+    Args:
+        df (pandas.DataFrame): The prepared market data.
+        bot_settings (object): The settings for the bot, including parameters for the indicators.
+        group (str): The indicator group, a key of `TA_INDICATOR_CALCULATIONS`.
+
+    Returns:
+        pandas.DataFrame: The DataFrame with the columns of the group, or False if an error occurs.
+    """
+    calculated = False
+
+    def calculate_columns():
+        nonlocal calculated
+        calculated = True
+        TA_INDICATOR_CALCULATIONS[group](df, bot_settings)
+        return {
+            column: np.array(df[column], dtype=np.float64)
+            for column in INDICATOR_GROUP_COLUMNS[group]
+            if column in df
+        }
+
+    cache_key = get_indicator_cache_key(
+        df,
+        bot_settings.symbol,
+        bot_settings.interval,
+        group,
+        get_indicator_group_params(bot_settings, group),
+    )
+    columns = indicator_cache.get_or_compute(cache_key, calculate_columns)
+    if not calculated:
+        for column, values in columns.items():
+            df[column] = values.copy()
+
+    return df
+
+
 @exception_handler(default_return=False)
 def handle_ta_df_final_cleaning(
     df: pd.DataFrame, columns_to_check: list, bot_settings: BotSettings
@@ -427,7 +520,10 @@ def handle_ta_df_final_cleaning(
 
 @exception_handler(default_return=False)
 def calculate_ta_indicators(
-    df: pd.DataFrame, bot_settings: BotSettings
+    df: pd.DataFrame,
+    bot_settings: BotSettings,
+    use_indicator_state: bool = False,
+    use_indicator_cache: bool = False,
 ) -> Union[Optional[int], pd.DataFrame]:
     """
     Calculates various technical analysis indicators on the given DataFrame.
@@ -436,12 +532,26 @@ def calculate_ta_indicators(
     and returns the updated DataFrame with the calculated values. It ensures the DataFrame is properly
     prepared and cleaned before returning the results.
 
+    Only the indicators in the bot's indicator plan are calculated, i.e. the ones its
+    enabled signals, trend detection, ATR stops and plots need (see `get_indicator_plan`).
+    They are written into the preallocated columns of a `MarketFrame` and joined to the
+    DataFrame once at the end. The groups without dependencies between them are calculated
+    in parallel on long frames (see `run_indicator_tasks`).
+
+    With `use_indicator_state` the indicators of live frames are taken from the incremental
+    indicator state of the bot's symbol, interval and parameters, which is only advanced by
+    the newly closed candles instead of recalculating the whole frame. Otherwise, with
+    `use_indicator_cache` the columns are shared with other bots calculating the same
+    indicators with the same parameters on the same candles (see `IndicatorCache`).
+
     Args:
         df (pandas.DataFrame): The DataFrame containing the market data.
         bot_settings (object): The settings for the bot, including parameters for the indicators.
+        use_indicator_state (bool, optional): Whether to use the incremental indicator state. Default is False.
+        use_indicator_cache (bool, optional): Whether to use the cross-bot indicator cache. Default is False.
 
     Returns:
-        pandas.DataFrame: The updated DataFrame with calculated technical indicators, or False if an error occurs.
+        pandas.DataFrame: A new DataFrame with the calculated technical indicators, or False if an error occurs.
     """
     from .logic_utils import is_df_valid
 
@@ -451,36 +561,236 @@ def calculate_ta_indicators(
 
     handle_ta_df_initial_praparation(df, bot_settings)
 
-    calculate_ta_rsi(df, bot_settings)
-    calculate_ta_cci(df, bot_settings)
-    calculate_ta_mfi(df, bot_settings)
-    calculate_ta_stochastic(df, bot_settings)
-    calculate_ta_stochastic_rsi(df, bot_settings)
-    calculate_ta_bollinger_bands(df, bot_settings)
-    calculate_ta_ema(df, bot_settings)
-    calculate_ta_macd(df, bot_settings)
-    calculate_ta_ma(df, bot_settings)
-    calculate_ta_atr(df, bot_settings)
-    calculate_ta_psar(df, bot_settings)
-    calculate_ta_vwap(df, bot_settings)
-    calculate_ta_adx(df, bot_settings)
-    calculate_ta_di(df, bot_settings)
-
+    plan = get_indicator_plan(bot_settings)
+    plan_columns = get_plan_columns(plan)
     columns_to_check = [
-        "macd",
-        "macd_signal",
-        "cci",
-        "upper_band",
-        "lower_band",
-        "mfi",
-        "atr",
-        "stoch_k",
-        "stoch_d",
-        "psar",
+        column
+        for column in (
+            "macd",
+            "macd_signal",
+            "cci",
+            "upper_band",
+            "lower_band",
+            "mfi",
+            "atr",
+            "stoch_k",
+            "stoch_d",
+            "psar",
+        )
+        if column in plan_columns
     ]
-    handle_ta_df_final_cleaning(df, columns_to_check, bot_settings)
 
-    return df
+    indicator_df = apply_indicator_state(df, bot_settings) if use_indicator_state else None
+    if indicator_df is not None:
+        df = indicator_df
+        handle_ta_df_final_cleaning(df, columns_to_check, bot_settings)
+        return df
+
+    frame = MarketFrame(df, plan_columns)
+
+    def calculate_group(group: str):
+        if use_indicator_cache:
+            return calculate_ta_group_cached(frame, bot_settings, group)
+        return TA_INDICATOR_CALCULATIONS[group](frame, bot_settings)
+
+    for groups in get_plan_waves(plan):
+        run_indicator_tasks(
+            [functools.partial(calculate_group, group) for group in groups], len(frame)
+        )
+
+    return frame.to_df(columns_to_check)
+
+
+def get_unique_variants(variants: Sequence) -> Tuple[list, np.ndarray]:
+    """
+    Deduplicates indicator parameter variants.
+
+    Args:
+        variants (sequence): The periods or parameter tuples, one per requested column.
+
+    Returns:
+        tuple: The unique variants in order of first appearance and, for every requested
+               variant, the position of its unique variant.
+    """
+    unique = {}
+    positions = np.array(
+        [unique.setdefault(variant, len(unique)) for variant in variants], dtype=np.intp
+    )
+    return list(unique), positions
+
+
+@exception_handler()
+def calculate_rsi_by_period(
+    close: np.ndarray, periods: Sequence[int]
+) -> Union[Optional[int], np.ndarray]:
+    """
+    Calculates the RSI of one close series for several periods, once per distinct period.
+
+    The periods are deduplicated and TA-Lib runs once for each distinct period in a
+    loop, requests of equal periods share its column.
+
+    Args:
+        close (numpy.ndarray): The close prices.
+        periods (sequence): The RSI periods, one per requested column.
+
+    Returns:
+        numpy.ndarray: Array of shape (len(close), len(periods)).
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    unique_periods, positions = get_unique_variants(periods)
+    values = np.empty((len(close), len(unique_periods)), order="F")
+    for position, period in enumerate(unique_periods):
+        values[:, position] = talib.RSI(close, timeperiod=period)
+    return values[:, positions]
+
+
+@exception_handler()
+def calculate_ema_by_period(
+    close: np.ndarray, periods: Sequence[int]
+) -> Union[Optional[int], np.ndarray]:
+    """
+    Calculates the EMA of one close series for several periods, once per distinct period.
+
+    The periods are deduplicated and TA-Lib runs once for each distinct period in a
+    loop, so the fast and slow EMAs of all bots share the columns of equal periods.
+
+    Args:
+        close (numpy.ndarray): The close prices.
+        periods (sequence): The EMA periods, one per requested column.
+
+    Returns:
+        numpy.ndarray: Array of shape (len(close), len(periods)).
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    unique_periods, positions = get_unique_variants(periods)
+    values = np.empty((len(close), len(unique_periods)), order="F")
+    for position, period in enumerate(unique_periods):
+        values[:, position] = talib.EMA(close, timeperiod=period)
+    return values[:, positions]
+
+
+@exception_handler()
+def calculate_macd_by_params(
+    close: np.ndarray, params: Sequence[Tuple[int, int, int]]
+) -> Union[Optional[int], Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Calculates the MACD of one close series for several parameter sets, once per distinct set.
+
+    The parameter sets are deduplicated and TA-Lib runs once for each distinct set in
+    a loop, requests of equal parameters share its columns.
+
+    Args:
+        close (numpy.ndarray): The close prices.
+        params (sequence): (fast period, slow period, signal period) tuples, one per requested column.
+
+    Returns:
+        tuple: The MACD, signal line and histogram arrays, each of shape (len(close), len(params)).
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    unique_params, positions = get_unique_variants([tuple(param) for param in params])
+    values = np.empty((3, len(close), len(unique_params)))
+    for position, (fast_period, slow_period, signal_period) in enumerate(unique_params):
+        values[0, :, position], values[1, :, position], _ = talib.MACD(
+            close,
+            fastperiod=fast_period,
+            slowperiod=slow_period,
+            signalperiod=signal_period,
+        )
+    values[2] = values[0] - values[1]
+    values = values[:, :, positions]
+    return values[0], values[1], values[2]
+
+
+BATCH_INDICATOR_GROUPS = ("rsi", "ema", "macd")
+
+
+def get_batch_variants(bot_settings: BotSettings) -> dict:
+    """
+    Returns the parameters of the planned indicator groups `prime_ta_indicator_cache` calculates.
+
+    Args:
+        bot_settings (BotSettings): The settings of the bot.
+
+    Returns:
+        dict: Indicator group ('rsi', 'ema' or 'macd') mapped to its parameters,
+              see `get_indicator_group_params`.
+    """
+    plan = get_indicator_plan(bot_settings)
+    return {
+        group: get_indicator_group_params(bot_settings, group)
+        for group in BATCH_INDICATOR_GROUPS
+        if group in plan
+    }
+
+
+@exception_handler()
+def prime_ta_indicator_cache(
+    df: pd.DataFrame, symbol: str, interval: str, variants: List[dict]
+) -> Union[Optional[int], int]:
+    """
+    Calculates the RSI, EMA and MACD columns of bots sharing one frame.
+
+    Every distinct parameter set is calculated once and put into the indicator
+    cache under the key the bots' `calculate_ta_indicators` looks up, so bots with
+    equal parameters copy the columns instead of calculating them.
+
+    Args:
+        df (pandas.DataFrame): The klines fetched for the bots' symbol and interval.
+        symbol (str): The symbol of the klines.
+        interval (str): The interval of the klines.
+        variants (list): The `get_batch_variants` of every bot receiving a copy of the frame.
+
+    Returns:
+        int: The number of cache entries added.
+    """
+    df = handle_ta_df_initial_praparation(df.copy(), None)
+    close = df["close"].to_numpy(dtype=np.float64)
+    rsi_params = list({bot_variants["rsi"] for bot_variants in variants if "rsi" in bot_variants})
+    ema_params = list({bot_variants["ema"] for bot_variants in variants if "ema" in bot_variants})
+    macd_params = list(
+        {
+            bot_variants["macd"]
+            for bot_variants in variants
+            if "macd" in bot_variants and len(df) >= bot_variants["macd"][0] * 2
+        }
+    )
+    entries = {}
+
+    if rsi_params:
+        rsi = calculate_rsi_by_period(close, [period for (period,) in rsi_params])
+        for position, params in enumerate(rsi_params):
+            entries[("rsi", params)] = {"rsi": rsi[:, position]}
+
+    if ema_params:
+        ema = calculate_ema_by_period(
+            close, [period for fast_slow_periods in ema_params for period in fast_slow_periods]
+        )
+        for position, params in enumerate(ema_params):
+            entries[("ema", params)] = {
+                "ema_fast": ema[:, 2 * position],
+                "ema_slow": ema[:, 2 * position + 1],
+            }
+
+    if macd_params:
+        macd, macd_signal, macd_histogram = calculate_macd_by_params(
+            close,
+            [
+                (macd_period, macd_period * 2, signal_period)
+                for macd_period, signal_period in macd_params
+            ],
+        )
+        for position, params in enumerate(macd_params):
+            entries[("macd", params)] = {
+                "macd": macd[:, position],
+                "macd_signal": macd_signal[:, position],
+                "macd_histogram": macd_histogram[:, position],
+            }
+
+    for (group, params), columns in entries.items():
+        indicator_cache.put(
+            get_indicator_cache_key(df, symbol, interval, group, params), columns
+        )
+    return len(entries)
 
 
 @exception_handler()
@@ -492,6 +802,9 @@ def calculate_ta_averages(
 
     This function computes the average of specific columns in the DataFrame over a defined period,
     based on the bot settings. The calculated averages are returned as a dictionary.
+    Indicators left out of the bot's indicator plan have no column and no average.
+    Frames filled by the incremental indicator state take the averages from its
+    running sums in constant time (see `get_indicator_state_averages`).
 
     Args:
         df (pandas.DataFrame): The DataFrame containing the market data.
@@ -522,6 +835,15 @@ def calculate_ta_averages(
         "avg_close": ("close", bot_settings.avg_close_period),
     }
 
+    average_mappings = {
+        avg_name: (column, period)
+        for avg_name, (column, period) in average_mappings.items()
+        if column in df
+    }
+    state_averages = get_indicator_state_averages(df, average_mappings)
+    if state_averages is not None:
+        return state_averages
+
     for avg_name, (column, period) in average_mappings.items():
         averages[avg_name] = df[column].iloc[-period:].mean()
 
@@ -547,16 +869,28 @@ def check_ta_trend(df: pd.DataFrame, bot_settings: BotSettings) -> str:
     latest_data = df.iloc[-1]
 
     avg_adx_period = bot_settings.avg_adx_period
-    avg_adx = df["adx"].iloc[-avg_adx_period:].mean()
+    avg_di_period = bot_settings.avg_di_period
+    trend_averages = get_indicator_state_averages(
+        df,
+        {
+            "avg_adx": ("adx", avg_adx_period),
+            "avg_plus_di": ("plus_di", avg_di_period),
+            "avg_minus_di": ("minus_di", avg_di_period),
+        },
+    )
+    if trend_averages is not None:
+        avg_adx = trend_averages["avg_adx"]
+        avg_plus_di = trend_averages["avg_plus_di"]
+        avg_minus_di = trend_averages["avg_minus_di"]
+    else:
+        avg_adx = df["adx"].iloc[-avg_adx_period:].mean()
+        avg_plus_di = df["plus_di"].iloc[-avg_di_period:].mean()
+        avg_minus_di = df["minus_di"].iloc[-avg_di_period:].mean()
 
     adx_trend = float(latest_data["adx"]) > float(
         bot_settings.adx_strong_trend
     ) or float(latest_data["adx"]) > float(avg_adx)
 
-    avg_di_period = bot_settings.avg_di_period
-    avg_plus_di = df["plus_di"].iloc[-avg_di_period:].mean()
-    avg_minus_di = df["minus_di"].iloc[-avg_di_period:].mean()
-
     di_difference_increasing = abs(
         float(latest_data["plus_di"]) - float(latest_data["minus_di"])
     ) > abs(float(avg_plus_di) - float(avg_minus_di))
@@ -619,17 +953,20 @@ def check_ta_trend(df: pd.DataFrame, bot_settings: BotSettings) -> str:
 
 @exception_handler(default_return=False)
 def round_down_to_step_size(
-    amount: float, step_size: float
+    amount: float, step_size: Optional[float] = None, symbol: Optional[str] = None
 ) -> Union[float, Optional[int]]:
     """
     Rounds down a given amount to the nearest multiple of the specified step size.
 
     This function ensures that the amount is a multiple of the step size by rounding it down
     to the nearest valid value. If the step size is 0 or less, the original amount is returned.
+    If no step size is given, the LOT_SIZE step size of the symbol is taken from the
+    exchange info cache.
 
     Args:
         amount (float): The amount to be rounded.
-        step_size (float): The step size to which the amount will be rounded down.
+        step_size (float, optional): The step size to which the amount will be rounded down.
+        symbol (str, optional): The trading symbol whose step size is used if `step_size` is None.
 
     Returns:
         float: The rounded amount, or the original amount if the step size is 0 or less.
@@ -638,9 +975,12 @@ def round_down_to_step_size(
         Exception: If an error occurs during the rounding process, it logs the exception and returns the original amount.
     """
     from decimal import Decimal
+    from .exchange_info import exchange_info_cache
 
     try:
-        if step_size > 0:
+        if step_size is None and symbol:
+            step_size = exchange_info_cache.get_lot_size(symbol)[1] or 0
+        if step_size and step_size > 0:
             amount_decimal = Decimal(str(amount))
             step_size_decimal = Decimal(str(step_size))
             rounded_amount = (amount_decimal // step_size_decimal) * step_size_decimal
@@ -0,0 +1,183 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from ..models import BotSettings
+from ..utils.logging import logger
+from ..utils.exception_handlers import exception_handler
+from ..utils.app_utils import get_config_value
+
+DEFAULT_EXCHANGE_INFO_TTL = 3600
+# The exchange info request weighs 20, so lookups refresh at most once a minute.
+DEFAULT_MIN_REFRESH_INTERVAL = 60
+
+
+class ExchangeInfoCache:
+    """
+    Process-wide cache of Binance symbol filters.
+
+    The exchange info of all symbols is fetched with a single request and kept for
+    `ttl` seconds. Lookups of a symbol that is missing or older than the TTL refresh
+    the cache, so filter changes on the exchange are picked up without a restart.
+    Lookups start a refresh at most once every `min_refresh_interval` seconds, so
+    unknown symbols and a failing exchange do not trigger a refresh per lookup.
+    While a refresh fails the previously cached filters are served.
+
+    Attributes:
+        ttl (float): Seconds after which the cached exchange info is refreshed.
+        min_refresh_interval (float): Minimum seconds between refreshes started by lookups.
+        loaded_at (float): Monotonic time of the last refresh, 0 if never loaded.
+        attempted_at (float): Monotonic time of the last refresh attempt, 0 if never attempted.
+        refresh_count (int): Number of refreshes made.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_EXCHANGE_INFO_TTL,
+        min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL,
+    ):
+        """
+        Creates an empty cache.
+
+        Args:
+            ttl (float, optional): Seconds after which the cached exchange info is refreshed.
+            min_refresh_interval (float, optional): Minimum seconds between refreshes started by lookups.
+        """
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.loaded_at = 0.0
+        self.attempted_at = 0.0
+        self.refresh_count = 0
+        self._filters: Dict[str, Dict[str, dict]] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """
+        Fetches the exchange info of all symbols and replaces the cached filters.
+
+        Returns:
+            bool: True if the exchange info was fetched, False otherwise.
+        """
+        from .api_utils import fetch_exchange_info
+
+        with self._lock:
+            self.attempted_at = time.monotonic()
+
+        exchange_info = fetch_exchange_info()
+        if not exchange_info or "symbols" not in exchange_info:
+            logger.warning("ExchangeInfoCache exchange info not available. Cache unchanged.")
+            return False
+
+        filters = {
+            symbol_info["symbol"]: {
+                symbol_filter["filterType"]: symbol_filter
+                for symbol_filter in symbol_info.get("filters", [])
+            }
+            for symbol_info in exchange_info["symbols"]
+        }
+        with self._lock:
+            self._filters = filters
+            self.loaded_at = time.monotonic()
+            self.refresh_count += 1
+
+        logger.info(f"ExchangeInfoCache refreshed with {len(filters)} symbols.")
+        return True
+
+    def is_expired(self) -> bool:
+        """Checks whether the cached exchange info is older than the TTL."""
+        return not self.loaded_at or time.monotonic() - self.loaded_at > self.ttl
+
+    def claim_refresh(self, symbol: str) -> bool:
+        """
+        Checks whether a lookup of the given symbol should refresh the cache.
+
+        A refresh is due when the cache is expired or the symbol is unknown, and no
+        refresh was attempted within `min_refresh_interval` seconds. A due refresh is
+        claimed by the caller, so concurrent lookups start only one refresh.
+
+        Args:
+            symbol (str): The trading symbol (e.g., 'BTCUSDT').
+
+        Returns:
+            bool: True if the caller should refresh the cache, False otherwise.
+        """
+        with self._lock:
+            if not self.is_expired() and symbol in self._filters:
+                return False
+            now = time.monotonic()
+            if self.attempted_at and now - self.attempted_at < self.min_refresh_interval:
+                return False
+            self.attempted_at = now
+            return True
+
+    def get_filter(self, symbol: str, filter_type: str) -> Optional[dict]:
+        """
+        Returns a filter of the given symbol, refreshing the cache if needed.
+
+        The cached filter is returned while the refresh is throttled or fails.
+
+        Args:
+            symbol (str): The trading symbol (e.g., 'BTCUSDT').
+            filter_type (str): The filter type, e.g. 'LOT_SIZE' or 'NOTIONAL'.
+
+        Returns:
+            dict or None: The filter as returned by the Binance API, or None if not found.
+        """
+        if self.claim_refresh(symbol):
+            self.refresh()
+        return self._filters.get(symbol, {}).get(filter_type)
+
+    def get_lot_size(self, symbol: str) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Returns the minimum order quantity and step size of the given symbol.
+
+        Args:
+            symbol (str): The trading symbol (e.g., 'BTCUSDT').
+
+        Returns:
+            tuple: The minimum quantity and the step size, or (None, None) if not found.
+        """
+        lot_size = self.get_filter(symbol, "LOT_SIZE")
+        if lot_size is None:
+            return None, None
+        return float(lot_size["minQty"]), float(lot_size["stepSize"])
+
+    def get_min_notional(self, symbol: str) -> Optional[float]:
+        """
+        Returns the minimum order value (notional) of the given symbol.
+
+        Args:
+            symbol (str): The trading symbol (e.g., 'BTCUSDT').
+
+        Returns:
+            float or None: The minimum notional value, or None if not found.
+        """
+        notional = self.get_filter(symbol, "NOTIONAL")
+        return float(notional["minNotional"]) if notional is not None else None
+
+
+exchange_info_cache = ExchangeInfoCache()
+
+
+@exception_handler()
+def preload_exchange_info() -> Optional[List[str]]:
+    """
+    Loads the exchange info cache and checks that every bot symbol is known.
+
+    The cache TTL is taken from `EXCHANGE_INFO_TTL`. Symbols of BotSettings missing
+    from the exchange info are logged.
+
+    Returns:
+        list: The symbols of all bots.
+    """
+    exchange_info_cache.ttl = get_config_value("EXCHANGE_INFO_TTL", DEFAULT_EXCHANGE_INFO_TTL)
+    exchange_info_cache.refresh()
+
+    symbols = sorted({bot_settings.symbol for bot_settings in BotSettings.query.all()})
+    missing_symbols = [
+        symbol for symbol in symbols if exchange_info_cache.get_filter(symbol, "LOT_SIZE") is None
+    ]
+    if missing_symbols:
+        logger.warning(f"Exchange info not found for bot symbols: {', '.join(missing_symbols)}")
+
+    logger.info(f"Exchange info preloaded for bot symbols: {', '.join(symbols)}")
+    return symbols
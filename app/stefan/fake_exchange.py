@@ -0,0 +1,494 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+from binance.helpers import interval_to_milliseconds
+from ..utils.logging import logger
+from .api_utils import KLINE_DTYPE, KLINE_FIELDS
+from .rate_governor import REQUEST_WEIGHT_WINDOW_MS, get_endpoint, get_endpoint_weight
+from .resampling import resample_klines
+
+BASE_INTERVAL = "1m"
+MINUTE_MS = 60_000
+DAY_MS = 86_400_000
+DEFAULT_HISTORY_DAYS = 30
+DEFAULT_FILTERS = {
+    "min_qty": "0.00001000",
+    "step_size": "0.00001000",
+    "min_notional": "5.00000000",
+    "tick_size": "0.01000000",
+}
+DEFAULT_QUOTE_BALANCE = 1000.0
+
+
+class FakeExchangeError(Exception):
+    """An error response of the fake exchange in the format of the Binance API."""
+
+    def __init__(self, status: int, code: int, msg: str):
+        super().__init__(msg)
+        self.status = status
+        self.code = code
+        self.msg = msg
+
+
+def generate_klines(
+    start_ms: int, count: int, start_price: float = 50000.0, seed: int = 0
+) -> np.ndarray:
+    """
+    Generates a random walk of 1m klines.
+
+    Args:
+        start_ms (int): The open time of the first kline in milliseconds.
+        count (int): The number of klines.
+        start_price (float, optional): The open price of the first kline.
+        seed (int, optional): The seed of the random walk.
+
+    Returns:
+        numpy.ndarray: Klines array of shape (count, len(KLINE_FIELDS)).
+    """
+    rng = np.random.default_rng(seed)
+    closes = start_price * np.exp(np.cumsum(rng.normal(0, 0.0008, count)))
+    opens = np.concatenate(([start_price], closes[:-1]))
+    spread = np.abs(rng.normal(0, 0.0005, count)) * closes
+    volumes = rng.uniform(1, 20, count)
+
+    rows = np.empty((count, len(KLINE_FIELDS)), dtype=KLINE_DTYPE)
+    rows[:, 0] = start_ms + np.arange(count) * MINUTE_MS
+    rows[:, 1] = opens
+    rows[:, 2] = np.maximum(opens, closes) + spread
+    rows[:, 3] = np.minimum(opens, closes) - spread
+    rows[:, 4] = closes
+    rows[:, 5] = volumes
+    rows[:, 6] = rows[:, 0] + MINUTE_MS - 1
+    rows[:, 7] = volumes * closes
+    rows[:, 8] = rng.integers(10, 500, count)
+    rows[:, 9] = volumes / 2
+    rows[:, 10] = volumes * closes / 2
+    return rows
+
+
+def row_to_kline(row: np.ndarray) -> list:
+    """Converts a klines array row into a kline in the format of the Binance klines API."""
+    return [
+        int(row[0]),
+        f"{row[1]:.8f}",
+        f"{row[2]:.8f}",
+        f"{row[3]:.8f}",
+        f"{row[4]:.8f}",
+        f"{row[5]:.8f}",
+        int(row[6]),
+        f"{row[7]:.8f}",
+        int(row[8]),
+        f"{row[9]:.8f}",
+        f"{row[10]:.8f}",
+        "0",
+    ]
+
+
+class FakeExchange:
+    """
+    In-memory stand-in for the Binance spot REST API.
+
+    Klines of every symbol are replayed from recorded 1m klines (e.g. read from the
+    kline store) or generated as a random walk. Recorded klines are shifted by whole
+    days so that they end after the current time; klines of higher intervals are
+    resampled from them. Balances are kept per API key, market orders are filled at
+    the last close and checked against the symbol filters. Every request can be
+    delayed and fail at random to simulate a slow or unreliable exchange.
+
+    Attributes:
+        latency_ms (float): Delay added to every request in milliseconds.
+        jitter_ms (float): Maximum random delay added on top of `latency_ms`.
+        error_rate (float): Fraction of requests answered with an internal error.
+        request_counts (dict): Number of requests per endpoint.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        quote_balance: float = DEFAULT_QUOTE_BALANCE,
+        seed: int = 0,
+    ):
+        """
+        Creates an exchange without symbols.
+
+        Args:
+            latency_ms (float, optional): Delay added to every request in milliseconds.
+            jitter_ms (float, optional): Maximum random delay added on top of the latency.
+            error_rate (float, optional): Fraction of requests answered with an internal error.
+            quote_balance (float, optional): Initial quote asset balance of every account.
+            seed (int, optional): Seed of the latency, error and kline generators.
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.quote_balance = quote_balance
+        self.request_counts: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._seed = seed
+        self._klines: Dict[str, np.ndarray] = {}
+        self._filters: Dict[str, Dict[str, str]] = {}
+        self._balances: Dict[str, Dict[str, float]] = {}
+        self._order_id = 0
+        self._window_start_ms = 0
+        self._used_weight = 0
+        self._lock = threading.Lock()
+
+    def add_symbol(
+        self,
+        symbol: str,
+        rows: Optional[np.ndarray] = None,
+        filters: Optional[Dict[str, str]] = None,
+        history_days: int = DEFAULT_HISTORY_DAYS,
+    ) -> None:
+        """
+        Adds a tradable symbol.
+
+        Args:
+            symbol (str): The trading pair symbol, e.g. 'BTCUSDC'.
+            rows (numpy.ndarray, optional): Recorded 1m klines to replay. A random walk of
+                `history_days` days up to one day ahead is generated if None.
+            filters (dict, optional): Overrides of `DEFAULT_FILTERS`.
+            history_days (int, optional): Days of generated history. Default is 30.
+        """
+        now_ms = int(time.time() * 1000)
+        if rows is None or not len(rows):
+            start_ms = (now_ms // DAY_MS - history_days) * DAY_MS
+            rows = generate_klines(
+                start_ms, (history_days + 1) * DAY_MS // MINUTE_MS, seed=self._seed + len(self._klines)
+            )
+        else:
+            rows = np.array(rows, dtype=KLINE_DTYPE)
+            shift_days = max(0, -(-(now_ms - int(rows[-1, 0])) // DAY_MS))
+            rows[:, [0, 6]] += shift_days * DAY_MS
+
+        self._klines[symbol] = rows
+        self._filters[symbol] = {**DEFAULT_FILTERS, **(filters or {})}
+
+    def handle(
+        self, method: str, path: str, params: Dict[str, str], api_key: Optional[str]
+    ) -> Tuple[int, object, Dict[str, str]]:
+        """
+        Answers one REST request.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The request path, e.g. '/api/v3/klines'.
+            params (dict): The query and form parameters.
+            api_key (str, optional): The value of the X-MBX-APIKEY header.
+
+        Returns:
+            tuple: The HTTP status, the JSON body and the response headers.
+        """
+        endpoint = get_endpoint(path)
+        delay_ms = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+
+        with self._lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+            now_ms = time.time() * 1000
+            window_start_ms = int(now_ms // REQUEST_WEIGHT_WINDOW_MS * REQUEST_WEIGHT_WINDOW_MS)
+            if window_start_ms != self._window_start_ms:
+                self._window_start_ms = window_start_ms
+                self._used_weight = 0
+            self._used_weight += get_endpoint_weight(endpoint, params)
+            headers = {"x-mbx-used-weight-1m": str(self._used_weight)}
+            failed = self._random.random() < self.error_rate
+
+        try:
+            if failed:
+                raise FakeExchangeError(500, -1001, "Internal error; unable to process your request.")
+            return 200, self._dispatch(method, endpoint, params, api_key or ""), headers
+        except FakeExchangeError as e:
+            return e.status, {"code": e.code, "msg": e.msg}, headers
+
+    def _dispatch(
+        self, method: str, endpoint: str, params: Dict[str, str], api_key: str
+    ) -> object:
+        """Routes a request to the handler of its endpoint."""
+        if endpoint == "ping":
+            return {}
+        if endpoint == "time":
+            return {"serverTime": int(time.time() * 1000)}
+        if endpoint == "system/status":
+            return {"status": 0, "msg": "normal"}
+        if endpoint == "exchangeInfo":
+            return self.get_exchange_info()
+        if endpoint == "klines":
+            return self.get_klines(
+                self._get_symbol(params),
+                params.get("interval", BASE_INTERVAL),
+                int(params["startTime"]) if "startTime" in params else None,
+                int(params["endTime"]) if "endTime" in params else None,
+                int(params.get("limit", 500)),
+            )
+        if endpoint == "ticker/price":
+            symbol = self._get_symbol(params)
+            return {"symbol": symbol, "price": f"{self.get_price(symbol):.8f}"}
+        if endpoint == "account":
+            return self.get_account(api_key)
+        if endpoint == "order" and method == "POST":
+            return self.place_order(api_key, params)
+        raise FakeExchangeError(404, -1100, f"Endpoint {endpoint} not supported.")
+
+    def _get_symbol(self, params: Dict[str, str]) -> str:
+        """Returns the known symbol of the request parameters."""
+        symbol = params.get("symbol", "")
+        if symbol not in self._klines:
+            raise FakeExchangeError(400, -1121, "Invalid symbol.")
+        return symbol
+
+    def _get_visible_rows(self, symbol: str) -> np.ndarray:
+        """Returns the 1m klines opened until now."""
+        rows = self._klines[symbol]
+        return rows[: np.searchsorted(rows[:, 0], time.time() * 1000, side="right")]
+
+    def get_exchange_info(self) -> dict:
+        """Returns the exchange info with the filters of all symbols."""
+        return {
+            "timezone": "UTC",
+            "serverTime": int(time.time() * 1000),
+            "symbols": [
+                {
+                    "symbol": symbol,
+                    "status": "TRADING",
+                    "baseAsset": symbol[:3],
+                    "quoteAsset": symbol[-4:],
+                    "filters": [
+                        {"filterType": "PRICE_FILTER", "tickSize": filters["tick_size"]},
+                        {
+                            "filterType": "LOT_SIZE",
+                            "minQty": filters["min_qty"],
+                            "maxQty": "9000.00000000",
+                            "stepSize": filters["step_size"],
+                        },
+                        {"filterType": "NOTIONAL", "minNotional": filters["min_notional"]},
+                    ],
+                }
+                for symbol, filters in self._filters.items()
+            ],
+        }
+
+    def get_klines(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        limit: int = 500,
+    ) -> List[list]:
+        """
+        Returns klines like the Binance klines endpoint, the last one may still be open.
+
+        Args:
+            symbol (str): The trading pair symbol.
+            interval (str): The klines interval.
+            start_ms (int, optional): The earliest open time.
+            end_ms (int, optional): The latest open time.
+            limit (int, optional): The maximum number of klines. Default is 500.
+
+        Returns:
+            list: The klines in the format of the Binance klines API.
+        """
+        interval_ms = interval_to_milliseconds(interval)
+        rows = self._get_visible_rows(symbol)
+        if end_ms is not None:
+            rows = rows[rows[:, 0] < (end_ms // interval_ms + 1) * interval_ms]
+        if start_ms is not None:
+            rows = rows[rows[:, 0] >= start_ms // interval_ms * interval_ms]
+        else:
+            rows = rows[-(limit + 1) * (interval_ms // MINUTE_MS):]
+
+        if interval != BASE_INTERVAL:
+            rows = resample_klines(rows, BASE_INTERVAL, interval)
+            if rows is None:
+                raise FakeExchangeError(500, -1001, "Recorded klines have a gap.")
+        if start_ms is not None:
+            rows = rows[rows[:, 0] >= start_ms][:limit]
+        else:
+            rows = rows[-limit:]
+        return [row_to_kline(row) for row in rows]
+
+    def get_price(self, symbol: str) -> float:
+        """Returns the last price of the symbol."""
+        rows = self._get_visible_rows(symbol)
+        return float(rows[-1, 4]) if len(rows) else 0.0
+
+    def get_balances(self, api_key: str) -> Dict[str, float]:
+        """Returns the balances of the account of the API key. Must hold the lock."""
+        if api_key not in self._balances:
+            balances = {}
+            for symbol in self._klines:
+                balances.setdefault(symbol[:3], 0.0)
+                balances.setdefault(symbol[-4:], self.quote_balance)
+            self._balances[api_key] = balances
+        return self._balances[api_key]
+
+    def get_account(self, api_key: str) -> dict:
+        """Returns the account of the API key like the Binance account endpoint."""
+        with self._lock:
+            balances = self.get_balances(api_key)
+            return {
+                "canTrade": True,
+                "accountType": "SPOT",
+                "balances": [
+                    {"asset": asset, "free": f"{free:.8f}", "locked": "0.00000000"}
+                    for asset, free in balances.items()
+                ],
+            }
+
+    def place_order(self, api_key: str, params: Dict[str, str]) -> dict:
+        """
+        Fills a market order at the last price and updates the account balances.
+
+        Args:
+            api_key (str): The API key of the account.
+            params (dict): The order parameters (symbol, side, type, quantity).
+
+        Returns:
+            dict: The order response like the Binance order endpoint.
+
+        Raises:
+            FakeExchangeError: If a filter is violated or the balance is insufficient.
+        """
+        symbol = self._get_symbol(params)
+        if params.get("type") != "MARKET":
+            raise FakeExchangeError(400, -1116, "Invalid orderType.")
+
+        filters = self._filters[symbol]
+        quantity = float(params.get("quantity", 0))
+        step_size = float(filters["step_size"])
+        steps = quantity / step_size
+        if quantity < float(filters["min_qty"]) or abs(steps - round(steps)) > 1e-6:
+            raise FakeExchangeError(400, -1013, "Filter failure: LOT_SIZE")
+
+        price = self.get_price(symbol)
+        quote_quantity = quantity * price
+        if quote_quantity < float(filters["min_notional"]):
+            raise FakeExchangeError(400, -1013, "Filter failure: NOTIONAL")
+
+        base_asset, quote_asset = symbol[:3], symbol[-4:]
+        side = params.get("side")
+        with self._lock:
+            balances = self.get_balances(api_key)
+            if side == "BUY" and balances[quote_asset] + 1e-9 < quote_quantity:
+                raise FakeExchangeError(400, -2010, "Account has insufficient balance for requested action.")
+            if side == "SELL" and balances[base_asset] + 1e-9 < quantity:
+                raise FakeExchangeError(400, -2010, "Account has insufficient balance for requested action.")
+
+            sign = 1 if side == "BUY" else -1
+            balances[base_asset] += sign * quantity
+            balances[quote_asset] -= sign * quote_quantity
+            self._order_id += 1
+            order_id = self._order_id
+
+        return {
+            "symbol": symbol,
+            "orderId": order_id,
+            "transactTime": int(time.time() * 1000),
+            "price": "0.00000000",
+            "origQty": f"{quantity:.8f}",
+            "executedQty": f"{quantity:.8f}",
+            "cummulativeQuoteQty": f"{quote_quantity:.8f}",
+            "status": "FILLED",
+            "type": "MARKET",
+            "side": side,
+            "fills": [
+                {"price": f"{price:.8f}", "qty": f"{quantity:.8f}", "commission": "0", "commissionAsset": base_asset}
+            ],
+        }
+
+
+class FakeExchangeRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler passing requests to the FakeExchange of the server."""
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        content_length = int(self.headers.get("Content-Length") or 0)
+        if content_length:
+            body = self.rfile.read(content_length).decode()
+            params.update({key: values[-1] for key, values in parse_qs(body).items()})
+
+        status, payload, headers = self.server.exchange.handle(
+            method, url.path, params, self.headers.get("X-MBX-APIKEY")
+        )
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeExchangeServer:
+    """
+    Local HTTP server exposing a FakeExchange under the Binance REST API paths.
+
+    Point the Binance clients at it by setting the environment variable
+    `BINANCE_API_URL` to `api_url` before the app is started.
+
+    Attributes:
+        exchange (FakeExchange): The served exchange.
+    """
+
+    def __init__(self, exchange: FakeExchange, host: str = "127.0.0.1", port: int = 0):
+        """
+        Creates the server. Port 0 picks a free port.
+
+        Args:
+            exchange (FakeExchange): The served exchange.
+            host (str, optional): The host to bind. Default is '127.0.0.1'.
+            port (int, optional): The port to bind. Default is a free port.
+        """
+        self.exchange = exchange
+        self._server = ThreadingHTTPServer((host, port), FakeExchangeRequestHandler)
+        self._server.daemon_threads = True
+        self._server.exchange = exchange
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_url(self) -> str:
+        """Returns the base URL of the REST API, e.g. 'http://127.0.0.1:8899/api'."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> "FakeExchangeServer":
+        """Serves requests in a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="stefan-fake-exchange", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Fake exchange serving at {self.api_url}.")
+        return self
+
+    def serve_forever(self) -> None:
+        """Serves requests in the current thread until interrupted."""
+        logger.info(f"Fake exchange serving at {self.api_url}.")
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stops serving and closes the socket."""
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,187 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from ..models import BotSettings
+from ..utils.app_utils import get_config_value
+from .market_frame import MarketFrame
+
+DEFAULT_MAX_ENTRIES = 2048
+COMPUTE_LOCK_STRIPES = 64
+
+INDICATOR_GROUP_PARAMS: Dict[str, Tuple[str, ...]] = {
+    "rsi": ("rsi_timeperiod",),
+    "cci": ("cci_timeperiod",),
+    "mfi": ("mfi_timeperiod",),
+    "stoch": ("stoch_k_timeperiod", "stoch_d_timeperiod"),
+    "stoch_rsi": (
+        "rsi_timeperiod",
+        "stoch_rsi_timeperiod",
+        "stoch_rsi_k_timeperiod",
+        "stoch_rsi_d_timeperiod",
+    ),
+    "bollinger": ("bollinger_timeperiod", "bollinger_nbdev"),
+    "ema": ("ema_fast_timeperiod", "ema_slow_timeperiod"),
+    "macd": ("macd_timeperiod", "macd_signalperiod"),
+    "ma": (),
+    "atr": ("atr_timeperiod",),
+    "psar": ("psar_acceleration", "psar_maximum"),
+    "vwap": ("vwap_anchor", "vwap_timeperiod"),
+    "adx": ("adx_timeperiod",),
+    "di": ("di_timeperiod",),
+}
+
+IndicatorColumns = Dict[str, np.ndarray]
+
+
+def get_indicator_group_params(bot_settings: BotSettings, group: str) -> tuple:
+    """
+    Returns the parameters of an indicator group of a bot.
+
+    Args:
+        bot_settings (BotSettings): The settings of the bot.
+        group (str): The indicator group, e.g. 'macd'.
+
+    Returns:
+        tuple: The values of the group's settings in `INDICATOR_GROUP_PARAMS`.
+    """
+    return tuple(getattr(bot_settings, param) for param in INDICATOR_GROUP_PARAMS[group])
+
+
+def get_indicator_cache_key(
+    df: Union[pd.DataFrame, MarketFrame],
+    symbol: str,
+    interval: str,
+    group: str,
+    params: tuple,
+) -> tuple:
+    """
+    Returns the cache key of an indicator group calculated on the given frame.
+
+    Closed candles never change, so a frame is identified by its symbol, interval,
+    length, first open time and last close time. The values of the last row are part
+    of the key as well, since the still open candle changes until it closes.
+
+    Args:
+        df (pandas.DataFrame or MarketFrame): The prepared market data.
+        symbol (str): The symbol of the market data.
+        interval (str): The interval of the market data.
+        group (str): The indicator group, e.g. 'macd'.
+        params (tuple): The parameters of the group, see `get_indicator_group_params`.
+
+    Returns:
+        tuple: The hashable cache key.
+    """
+    return (
+        symbol,
+        interval,
+        len(df),
+        np.asarray(df["open_time"])[0],
+        np.asarray(df["close_time"])[-1],
+        float(np.asarray(df["high"])[-1]),
+        float(np.asarray(df["low"])[-1]),
+        float(np.asarray(df["close"])[-1]),
+        float(np.asarray(df["volume"])[-1]),
+        group,
+        params,
+    )
+
+
+class IndicatorCache:
+    """
+    LRU cache of calculated indicator columns shared by all bots of the process.
+
+    Bots trading the same symbol and interval with the same indicator parameters
+    calculate identical columns. The first bot of a sweep calculates them, the
+    others copy the cached arrays. Concurrent bots asking for the same key wait
+    for the first calculation instead of repeating it.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Args:
+            max_entries (int, optional): Maximum number of cached entries. Defaults to
+                the `INDICATOR_CACHE_MAX_ENTRIES` config value.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, IndicatorColumns]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._compute_locks = [threading.Lock() for _ in range(COMPUTE_LOCK_STRIPES)]
+
+    def get(self, key: Hashable) -> Optional[IndicatorColumns]:
+        """Returns the cached columns of the key and marks them as recently used."""
+        with self._lock:
+            columns = self._entries.get(key)
+            if columns is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return columns
+
+    def put(self, key: Hashable, columns: IndicatorColumns) -> None:
+        """Caches the columns of the key and evicts the least recently used entries."""
+        max_entries = self.max_entries or int(
+            get_config_value("INDICATOR_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+        )
+        with self._lock:
+            self._entries[key] = columns
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Optional[IndicatorColumns]]
+    ) -> Optional[IndicatorColumns]:
+        """
+        Returns the cached columns of the key or computes and caches them.
+
+        Args:
+            key (Hashable): The key, see `get_indicator_cache_key`.
+            compute (callable): Calculates the columns, returns None if they can't be cached.
+
+        Returns:
+            dict: Column name mapped to its values, or None if the computation returned None.
+        """
+        columns = self.get(key)
+        if columns is not None:
+            return columns
+
+        with self._compute_locks[hash(key) % COMPUTE_LOCK_STRIPES]:
+            with self._lock:
+                columns = self._entries.get(key)
+            if columns is not None:
+                return columns
+            columns = compute()
+            if columns is not None:
+                self.put(key, columns)
+            return columns
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Returns the hit and miss statistics of the cache.
+
+        Returns:
+            dict: Number of hits, misses, cached entries and the hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Drops all cached columns and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+indicator_cache = IndicatorCache()
@@ -0,0 +1,200 @@
+from typing import Dict, FrozenSet, List, Tuple
+from ..models import BotSettings
+
+INDICATOR_GROUP_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "rsi": ("rsi",),
+    "cci": ("cci",),
+    "mfi": ("mfi",),
+    "stoch": ("stoch_k", "stoch_d"),
+    "stoch_rsi": ("stoch_rsi", "stoch_rsi_k", "stoch_rsi_d"),
+    "bollinger": ("upper_band", "middle_band", "lower_band"),
+    "ema": ("ema_fast", "ema_slow"),
+    "macd": ("macd", "macd_signal", "macd_histogram"),
+    "ma": ("ma_200", "ma_50"),
+    "atr": ("atr",),
+    "psar": ("psar",),
+    "vwap": ("typical_price", "vwap"),
+    "adx": ("adx",),
+    "di": ("plus_di", "minus_di"),
+}
+
+INDICATOR_GROUP_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "stoch_rsi": ("rsi",),
+}
+
+# check_ta_trend runs for every bot and the ATR stops of every bot read atr.
+ALWAYS_REQUIRED_GROUPS: Tuple[str, ...] = ("rsi", "atr", "adx", "di")
+
+SIGNAL_FLAG_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "rsi_signals": ("rsi",),
+    "rsi_divergence_signals": ("rsi",),
+    "vol_signals": (),
+    "macd_cross_signals": ("macd",),
+    "macd_histogram_signals": ("macd",),
+    "bollinger_signals": ("bollinger",),
+    "stoch_signals": ("stoch",),
+    "stoch_divergence_signals": ("stoch",),
+    "stoch_rsi_signals": ("stoch_rsi",),
+    "ema_cross_signals": ("ema",),
+    "ema_fast_signals": ("ema",),
+    "ema_slow_signals": ("ema",),
+    "di_signals": ("di",),
+    "cci_signals": ("cci",),
+    "cci_divergence_signals": ("cci",),
+    "mfi_signals": ("mfi",),
+    "mfi_divergence_signals": ("mfi",),
+    "atr_signals": ("atr",),
+    "vwap_signals": ("vwap",),
+    "psar_signals": ("psar",),
+    "ma50_signals": ("ma",),
+    "ma200_signals": ("ma",),
+    "ma_cross_signals": ("ma",),
+}
+
+PLOT_INDICATOR_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "close": (),
+    "ema": ("ema",),
+    "ma50": ("ma",),
+    "ma200": ("ma",),
+    "macd": ("macd",),
+    "boll": ("bollinger",),
+    "rsi": ("rsi",),
+    "atr": ("atr",),
+    "cci": ("cci",),
+    "mfi": ("mfi",),
+    "stoch": ("stoch",),
+    "stoch_rsi": ("stoch_rsi",),
+    "psar": ("psar",),
+    "vwap": ("vwap",),
+    "adx": ("adx",),
+    "di": ("di",),
+}
+
+indicator_plans: Dict[int, Tuple[tuple, FrozenSet[str]]] = {}
+
+
+def get_indicator_plan_fingerprint(bot_settings: BotSettings) -> tuple:
+    """
+    Returns the settings of a bot that decide which indicators it needs.
+
+    Args:
+        bot_settings (BotSettings): The settings of the bot.
+
+    Returns:
+        tuple: The signal flags, the GPT analysis flag and the plotted indicators.
+    """
+    return (
+        tuple(bool(getattr(bot_settings, flag)) for flag in SIGNAL_FLAG_GROUPS),
+        bool(bot_settings.use_gpt_analysis),
+        tuple(bot_settings.selected_plot_indicators or ()),
+    )
+
+
+def resolve_indicator_groups(bot_settings: BotSettings) -> FrozenSet[str]:
+    """
+    Resolves the indicator groups a bot needs, including their dependencies.
+
+    The trend detection and the ATR stops are always planned, optional groups only if
+    one of their signals is enabled or they are plotted. Bots sending the calculated
+    DataFrame to the GPT analysis get every indicator. `update_technical_analysis_data`
+    stores None for the columns of groups left out of the plan.
+
+    Args:
+        bot_settings (BotSettings): The settings of the bot.
+
+    Returns:
+        frozenset: The names of the indicator groups in `INDICATOR_GROUP_COLUMNS`.
+    """
+    if bot_settings.use_gpt_analysis:
+        return frozenset(INDICATOR_GROUP_COLUMNS)
+
+    groups = set(ALWAYS_REQUIRED_GROUPS)
+    for flag, flag_groups in SIGNAL_FLAG_GROUPS.items():
+        if getattr(bot_settings, flag):
+            groups.update(flag_groups)
+    for indicator in bot_settings.selected_plot_indicators or ():
+        groups.update(PLOT_INDICATOR_GROUPS.get(indicator, ()))
+
+    pending = list(groups)
+    while pending:
+        for dependency in INDICATOR_GROUP_DEPENDENCIES.get(pending.pop(), ()):
+            if dependency not in groups:
+                groups.add(dependency)
+                pending.append(dependency)
+
+    return frozenset(groups)
+
+
+def get_indicator_plan(bot_settings: BotSettings) -> FrozenSet[str]:
+    """
+    Returns the indicator groups of a bot, cached until its relevant settings change.
+
+    Args:
+        bot_settings (BotSettings): The settings of the bot.
+
+    Returns:
+        frozenset: The names of the indicator groups in `INDICATOR_GROUP_COLUMNS`.
+    """
+    fingerprint = get_indicator_plan_fingerprint(bot_settings)
+    cached = indicator_plans.get(bot_settings.id)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    plan = resolve_indicator_groups(bot_settings)
+    if bot_settings.id is not None:
+        indicator_plans[bot_settings.id] = (fingerprint, plan)
+    return plan
+
+
+def get_plan_columns(plan: FrozenSet[str]) -> List[str]:
+    """
+    Returns the DataFrame columns calculated by the given indicator groups.
+
+    Args:
+        plan (frozenset): The names of the indicator groups.
+
+    Returns:
+        list: The column names.
+    """
+    return [
+        column
+        for group, columns in INDICATOR_GROUP_COLUMNS.items()
+        if group in plan
+        for column in columns
+    ]
+
+
+def get_plan_waves(plan: FrozenSet[str]) -> List[List[str]]:
+    """
+    Splits the indicator groups of a plan into waves that can be calculated in parallel.
+
+    Every group comes in the wave after the last of its dependencies, so the groups
+    of one wave only read columns of earlier waves.
+
+    Args:
+        plan (frozenset): The names of the indicator groups.
+
+    Returns:
+        list: Lists of group names in the order of `INDICATOR_GROUP_COLUMNS`.
+    """
+    levels: Dict[str, int] = {}
+
+    def get_level(group: str) -> int:
+        if group not in levels:
+            levels[group] = 1 + max(
+                (
+                    get_level(dependency)
+                    for dependency in INDICATOR_GROUP_DEPENDENCIES.get(group, ())
+                    if dependency in plan
+                ),
+                default=-1,
+            )
+        return levels[group]
+
+    waves: List[List[str]] = []
+    for group in INDICATOR_GROUP_COLUMNS:
+        if group in plan:
+            level = get_level(group)
+            waves.extend([] for _ in range(level + 1 - len(waves)))
+            waves[level].append(group)
+    return waves
@@ -0,0 +1,1406 @@
+import json
+import math
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+import numpy as np
+import pandas as pd
+from ..models import BotSettings
+from ..utils.logging import logger
+from .scheduling import get_server_now_ms, interval_to_milliseconds
+from .vwap import (
+    VWAP_ANCHOR_FRAME,
+    VWAP_ANCHOR_PERIODS,
+    VWAP_ANCHOR_ROLLING,
+    calculate_vwap,
+    get_vwap_anchor,
+)
+
+NAN = float("nan")
+ZERO_EPSILON = 1e-8
+DEFAULT_HISTORY_SIZE = 500
+INDICATOR_COLUMNS = (
+    "rsi",
+    "cci",
+    "mfi",
+    "stoch_k",
+    "stoch_d",
+    "stoch_rsi",
+    "stoch_rsi_k",
+    "stoch_rsi_d",
+    "upper_band",
+    "middle_band",
+    "lower_band",
+    "ema_fast",
+    "ema_slow",
+    "macd",
+    "macd_signal",
+    "macd_histogram",
+    "ma_200",
+    "ma_50",
+    "atr",
+    "psar",
+    "typical_price",
+    "vwap",
+    "adx",
+    "plus_di",
+    "minus_di",
+)
+TYPICAL_PRICE_INDEX = INDICATOR_COLUMNS.index("typical_price")
+VWAP_INDEX = INDICATOR_COLUMNS.index("vwap")
+# States not used for this many intervals of their key are evicted.
+STALE_STATE_INTERVALS = 3
+
+AVERAGE_COLUMNS = (
+    "close",
+    "volume",
+    "rsi",
+    "cci",
+    "mfi",
+    "atr",
+    "stoch_rsi_k",
+    "macd",
+    "macd_signal",
+    "stoch_k",
+    "stoch_d",
+    "ema_fast",
+    "ema_slow",
+    "plus_di",
+    "minus_di",
+    "psar",
+    "vwap",
+    "adx",
+)
+AVERAGE_SOURCE_INDEXES = np.array(
+    [
+        ("close", "volume").index(column)
+        if column in ("close", "volume")
+        else 2 + INDICATOR_COLUMNS.index(column)
+        for column in AVERAGE_COLUMNS
+    ]
+)
+
+
+def is_zero(value: float) -> bool:
+    """Checks whether a value is zero within the tolerance TA-Lib uses."""
+    return -ZERO_EPSILON < value < ZERO_EPSILON
+
+
+def true_range(high: float, low: float, previous_close: float) -> float:
+    """Returns the true range of a candle like TA-Lib TRANGE."""
+    greatest = high - low
+    high_range = abs(previous_close - high)
+    if high_range > greatest:
+        greatest = high_range
+    low_range = abs(low - previous_close)
+    if low_range > greatest:
+        greatest = low_range
+    return greatest
+
+
+class IncrementalIndicator:
+    """
+    Base class of the incremental indicators.
+
+    Every indicator is updated with one candle at a time by `update`. With
+    `closed=False` the value of a still open candle is returned without changing
+    the state, so the open candle can be evaluated on every cycle and is only
+    committed once it closes. The instance attributes are the whole state, so an
+    indicator can be checkpointed with `get_state` and restored with `set_state`.
+    """
+
+    def get_window_sum(self, column: str, count: int) -> Optional[Tuple[float, int]]:
+        """
+        Returns the sum and the number of non-missing values of the last closed candles.
+
+        Args:
+            column (str): A column of `AVERAGE_COLUMNS`.
+            count (int): The number of candles.
+
+        Returns:
+            tuple: The sum and the count, None if the sums of that many candles are not kept.
+        """
+        if count > self._average_count:
+            return None
+        column_index = AVERAGE_COLUMNS.index(column)
+        last = self._average_position
+        first = (last - count) % len(self._average_sums)
+        return (
+            self._average_sums[last, column_index] - self._average_sums[first, column_index],
+            int(self._average_counts[last, column_index] - self._average_counts[first, column_index]),
+        )
+
+    def get_average_history(self, column: str, period: int) -> np.ndarray:
+        """
+        Returns the rolling averages of a column over the kept closed candles.
+
+        Each value is the average of the non-missing values of the last `period`
+        candles up to that candle, or of all kept candles before it if there are fewer,
+        like the averages of `calculate_ta_averages`.
+
+        Args:
+            column (str): A column of `AVERAGE_COLUMNS`.
+            period (int): The averaging period.
+
+        Returns:
+            numpy.ndarray: One average per kept candle, oldest first.
+        """
+        column_index = AVERAGE_COLUMNS.index(column)
+        positions = (
+            self._average_position - self._average_count + np.arange(self._average_count + 1)
+        ) % len(self._average_sums)
+        sums = self._average_sums[positions, column_index]
+        counts = self._average_counts[positions, column_index]
+        ends = np.arange(1, self._average_count + 1)
+        starts = np.maximum(ends - period, 0)
+        window_counts = counts[ends] - counts[starts]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(
+                window_counts > 0, (sums[ends] - sums[starts]) / window_counts, np.nan
+            )
+
+    def get_state(self) -> dict:
+        """Returns the state as a JSON serializable dict."""
+        state = {}
+        for name, value in vars(self).items():
+            if isinstance(value, IncrementalIndicator):
+                state[name] = value.get_state()
+            elif isinstance(value, deque):
+                state[name] = list(value)
+            else:
+                state[name] = value
+        return state
+
+    def set_state(self, state: dict) -> None:
+        """Restores a state returned by `get_state` of an indicator with the same parameters."""
+        for name, value in state.items():
+            current = getattr(self, name)
+            if isinstance(current, IncrementalIndicator):
+                current.set_state(value)
+            elif isinstance(current, deque):
+                setattr(self, name, deque(value, maxlen=current.maxlen))
+            else:
+                setattr(self, name, value)
+
+
+class IncrementalSMA(IncrementalIndicator):
+    """Simple moving average kept as a running sum like TA-Lib SMA."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values = deque(maxlen=max(period - 1, 0))
+        self.total = 0.0
+
+    def update(self, value: float, closed: bool = True) -> float:
+        if math.isnan(value):
+            return NAN
+        total = self.total + value
+        ready = len(self.values) == self.period - 1
+        result = total / self.period if ready else NAN
+        if closed:
+            if ready:
+                total -= self.values[0] if self.values else value
+            self.values.append(value)
+            self.total = total
+        return result
+
+
+class IncrementalEMA(IncrementalIndicator):
+    """Exponential moving average seeded with the SMA of the first values like TA-Lib EMA."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+
+    def update(self, value: float, closed: bool = True) -> float:
+        if math.isnan(value):
+            return NAN
+        if self.count < self.period:
+            count = self.count + 1
+            total = self.total + value
+            result = total / self.period if count == self.period else NAN
+            if closed:
+                self.count, self.total, self.value = count, total, result
+            return result
+        result = (value - self.value) * self.k + self.value
+        if closed:
+            self.value = result
+        return result
+
+
+class RollingExtreme(IncrementalIndicator):
+    """Rolling maximum or minimum over a window kept in a monotonic queue."""
+
+    def __init__(self, period: int, maximum: bool = True):
+        self.period = period
+        self.maximum = maximum
+        self.index = 0
+        self.items = deque()
+
+    def update(self, value: float, closed: bool = True) -> float:
+        start = self.index - self.period + 1
+        items = self.items
+        candidate = None
+        if items and items[0][0] >= start:
+            candidate = items[0][1]
+        elif len(items) > 1:
+            candidate = items[1][1]
+
+        result = value
+        if candidate is not None and (candidate > value if self.maximum else candidate < value):
+            result = candidate
+
+        if closed:
+            while items and (items[-1][1] <= value if self.maximum else items[-1][1] >= value):
+                items.pop()
+            items.append([self.index, value])
+            while items[0][0] < start:
+                items.popleft()
+            self.index += 1
+        return result if start >= 0 else NAN
+
+
+class IncrementalRSI(IncrementalIndicator):
+    """Relative Strength Index with Wilder smoothing like TA-Lib RSI."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.changes = 0
+        self.previous = NAN
+        self.gain = 0.0
+        self.loss = 0.0
+
+    def update(self, value: float, closed: bool = True) -> float:
+        if math.isnan(value):
+            return NAN
+        if math.isnan(self.previous):
+            if closed:
+                self.previous = value
+            return NAN
+
+        change = value - self.previous
+        gain, loss = self.gain, self.loss
+        changes = self.changes + 1
+        if changes <= self.period:
+            if change < 0:
+                loss -= change
+            else:
+                gain += change
+            if changes == self.period:
+                gain /= self.period
+                loss /= self.period
+        else:
+            gain *= self.period - 1
+            loss *= self.period - 1
+            if change < 0:
+                loss -= change
+            else:
+                gain += change
+            gain /= self.period
+            loss /= self.period
+
+        result = NAN
+        if changes >= self.period:
+            total = gain + loss
+            result = 100.0 * (gain / total) if not is_zero(total) else 0.0
+        if closed:
+            self.previous, self.changes, self.gain, self.loss = value, changes, gain, loss
+        return result
+
+
+class IncrementalStoch(IncrementalIndicator):
+    """Slow stochastic oscillator with SMA smoothing like TA-Lib STOCH."""
+
+    def __init__(self, fastk_period: int, slowk_period: int, slowd_period: int):
+        self.highest = RollingExtreme(fastk_period, maximum=True)
+        self.lowest = RollingExtreme(fastk_period, maximum=False)
+        self.slow_k = IncrementalSMA(slowk_period)
+        self.slow_d = IncrementalSMA(slowd_period)
+
+    def update(
+        self, high: float, low: float, close: float, closed: bool = True
+    ) -> Tuple[float, float]:
+        if math.isnan(high) or math.isnan(low) or math.isnan(close):
+            return NAN, NAN
+        highest = self.highest.update(high, closed)
+        lowest = self.lowest.update(low, closed)
+        if math.isnan(highest):
+            return NAN, NAN
+
+        difference = (highest - lowest) / 100.0
+        fast_k = (close - lowest) / difference if difference != 0.0 else 0.0
+        slow_k = self.slow_k.update(fast_k, closed)
+        slow_d = self.slow_d.update(slow_k, closed)
+        if math.isnan(slow_d):
+            return NAN, NAN
+        return slow_k, slow_d
+
+
+class IncrementalCCI(IncrementalIndicator):
+    """
+    Commodity Channel Index like TA-Lib CCI.
+
+    The mean deviation has no running form, so one update costs O(period).
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.prices = deque(maxlen=max(period - 1, 0))
+
+    def update(self, high: float, low: float, close: float, closed: bool = True) -> float:
+        typical_price = (high + low + close) / 3
+        result = NAN
+        if len(self.prices) == self.period - 1:
+            window = list(self.prices)
+            window.append(typical_price)
+            average = sum(window) / self.period
+            deviation = sum(abs(price - average) for price in window)
+            difference = typical_price - average
+            if difference != 0.0 and deviation != 0.0:
+                result = difference / (0.015 * (deviation / self.period))
+            else:
+                result = 0.0
+        if closed:
+            self.prices.append(typical_price)
+        return result
+
+
+class IncrementalMFI(IncrementalIndicator):
+    """Money Flow Index kept as running sums of positive and negative flows like TA-Lib MFI."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.previous = NAN
+        self.flows = deque(maxlen=period)
+        self.positive = 0.0
+        self.negative = 0.0
+
+    def update(
+        self, high: float, low: float, close: float, volume: float, closed: bool = True
+    ) -> float:
+        typical_price = (high + low + close) / 3
+        if math.isnan(self.previous):
+            if closed:
+                self.previous = typical_price
+            return NAN
+
+        positive, negative = self.positive, self.negative
+        if len(self.flows) == self.period:
+            positive -= self.flows[0][0]
+            negative -= self.flows[0][1]
+        change = typical_price - self.previous
+        money_flow = typical_price * volume
+        flow = [0.0, 0.0]
+        if change < 0:
+            flow[1] = money_flow
+            negative += money_flow
+        elif change > 0:
+            flow[0] = money_flow
+            positive += money_flow
+
+        result = NAN
+        if len(self.flows) >= self.period - 1:
+            total = positive + negative
+            result = 0.0 if total < 1.0 else 100.0 * (positive / total)
+        if closed:
+            self.previous, self.positive, self.negative = typical_price, positive, negative
+            self.flows.append(flow)
+        return result
+
+
+class IncrementalBBands(IncrementalIndicator):
+    """
+    Bollinger Bands around an SMA with the population standard deviation like TA-Lib BBANDS.
+
+    The window is kept as running sums of the deviations from a reference price
+    instead of sums of the raw prices and their squares, which cancel out at BTC
+    prices. The reference moves to the window mean and the sums are recalculated
+    every `period` closed candles, so rounding errors don't add up over time.
+    """
+
+    def __init__(self, period: int, nbdev: float):
+        self.period = period
+        self.nbdev = nbdev
+        self.values = deque(maxlen=max(period - 1, 0))
+        self.reference = NAN
+        self.total = 0.0
+        self.total_square = 0.0
+        self.updates = 0
+
+    def update(self, value: float, closed: bool = True) -> Tuple[float, float, float]:
+        if math.isnan(value):
+            return NAN, NAN, NAN
+        reference = value if math.isnan(self.reference) else self.reference
+        deviation = value - reference
+        total = self.total + deviation
+        total_square = self.total_square + deviation * deviation
+        ready = len(self.values) == self.period - 1
+
+        result = NAN, NAN, NAN
+        if ready:
+            mean_deviation = total / self.period
+            middle = reference + mean_deviation
+            variance = max(total_square / self.period - mean_deviation * mean_deviation, 0.0)
+            band = (math.sqrt(variance) if variance >= ZERO_EPSILON else 0.0) * self.nbdev
+            result = middle + band, middle, middle - band
+
+        if closed:
+            if ready:
+                oldest = (self.values[0] if self.values else value) - reference
+                total -= oldest
+                total_square -= oldest * oldest
+            self.values.append(value)
+            self.reference, self.total, self.total_square = reference, total, total_square
+            self.updates += 1
+            if self.updates % max(self.period, 1) == 0:
+                self.rebase()
+        return result
+
+    def rebase(self) -> None:
+        """Moves the reference to the mean of the kept values and recalculates the sums."""
+        if not self.values:
+            self.reference, self.total, self.total_square = NAN, 0.0, 0.0
+            return
+        self.reference = sum(self.values) / len(self.values)
+        deviations = [value - self.reference for value in self.values]
+        self.total = sum(deviations)
+        self.total_square = sum(deviation * deviation for deviation in deviations)
+
+    def set_state(self, state: dict) -> None:
+        """Restores a state, including the states checkpointed before the deviation sums."""
+        if "mean" in state:
+            state = {"values": state["mean"]["values"]}
+        super().set_state(state)
+        self.rebase()
+
+
+class IncrementalATR(IncrementalIndicator):
+    """Average True Range with Wilder smoothing like TA-Lib ATR."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.previous_close = NAN
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float, closed: bool = True) -> float:
+        if math.isnan(self.previous_close):
+            if closed:
+                self.previous_close = close
+            return NAN
+
+        tr = true_range(high, low, self.previous_close)
+        count, total = self.count, self.total
+        if count < self.period:
+            count += 1
+            total += tr
+            result = total / self.period if count == self.period else NAN
+        else:
+            result = (self.value * (self.period - 1) + tr) / self.period
+        if closed:
+            self.previous_close, self.count, self.total, self.value = close, count, total, result
+        return result
+
+
+class IncrementalDirectional(IncrementalIndicator):
+    """Directional indicators and the ADX with Wilder smoothing like TA-Lib PLUS_DI, MINUS_DI and ADX."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.previous = [NAN, NAN, NAN]
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.tr = 0.0
+        self.dx_count = 0
+        self.dx_total = 0.0
+        self.adx = NAN
+
+    def update(
+        self, high: float, low: float, close: float, closed: bool = True
+    ) -> Tuple[float, float, float]:
+        """Returns the Plus DI, the Minus DI and the ADX."""
+        if self.count == 0:
+            if closed:
+                self.count, self.previous = 1, [high, low, close]
+            return NAN, NAN, NAN
+
+        previous_high, previous_low, previous_close = self.previous
+        period = self.period
+        plus_change = high - previous_high
+        minus_change = previous_low - low
+        plus_dm = plus_change if plus_change > 0 and plus_change > minus_change else 0.0
+        minus_dm = minus_change if minus_change > 0 and minus_change > plus_change else 0.0
+        tr = true_range(high, low, previous_close)
+
+        plus_di = minus_di = adx = NAN
+        dx_count, dx_total, smoothed_adx = self.dx_count, self.dx_total, self.adx
+        if self.count < period:
+            smoothed_plus_dm = self.plus_dm + plus_dm
+            smoothed_minus_dm = self.minus_dm + minus_dm
+            smoothed_tr = self.tr + tr
+        else:
+            smoothed_plus_dm = self.plus_dm - self.plus_dm / period + plus_dm
+            smoothed_minus_dm = self.minus_dm - self.minus_dm / period + minus_dm
+            smoothed_tr = self.tr - self.tr / period + tr
+
+            dx = None
+            if is_zero(smoothed_tr):
+                plus_di = minus_di = 0.0
+            else:
+                plus_di = 100.0 * (smoothed_plus_dm / smoothed_tr)
+                minus_di = 100.0 * (smoothed_minus_dm / smoothed_tr)
+                di_total = minus_di + plus_di
+                if not is_zero(di_total):
+                    dx = 100.0 * (abs(minus_di - plus_di) / di_total)
+
+            dx_count += 1
+            if dx_count <= period:
+                if dx is not None:
+                    dx_total += dx
+                if dx_count == period:
+                    smoothed_adx = dx_total / period
+            elif dx is not None:
+                smoothed_adx = (smoothed_adx * (period - 1) + dx) / period
+            if dx_count >= period:
+                adx = smoothed_adx
+
+        if closed:
+            self.count = min(self.count + 1, period)
+            self.previous = [high, low, close]
+            self.plus_dm, self.minus_dm, self.tr = smoothed_plus_dm, smoothed_minus_dm, smoothed_tr
+            self.dx_count, self.dx_total, self.adx = min(dx_count, period + 1), dx_total, smoothed_adx
+        return plus_di, minus_di, adx
+
+
+class IncrementalSAR(IncrementalIndicator):
+    """Parabolic SAR like TA-Lib SAR, the direction is taken from the first two candles."""
+
+    def __init__(self, acceleration: float, maximum: float):
+        self.acceleration = min(acceleration, maximum)
+        self.maximum = maximum
+        self.first = None
+        self.is_long = True
+        self.sar = NAN
+        self.ep = NAN
+        self.af = self.acceleration
+        self.last = None
+
+    def update(self, high: float, low: float, closed: bool = True) -> float:
+        if self.first is None:
+            if closed:
+                self.first = [high, low]
+            return NAN
+
+        if self.last is None:
+            first_high, first_low = self.first
+            plus_change = high - first_high
+            minus_change = first_low - low
+            is_long = not (minus_change > 0 and plus_change < minus_change)
+            ep = high if is_long else low
+            sar = first_low if is_long else first_high
+            af = self.acceleration
+            previous_high, previous_low = high, low
+        else:
+            is_long, sar, ep, af = self.is_long, self.sar, self.ep, self.af
+            previous_high, previous_low = self.last
+
+        if is_long:
+            if low <= sar:
+                is_long = False
+                sar = max(ep, previous_high, high)
+                result = sar
+                af = self.acceleration
+                ep = low
+                sar = max(sar + af * (ep - sar), previous_high, high)
+            else:
+                result = sar
+                if high > ep:
+                    ep = high
+                    af = min(af + self.acceleration, self.maximum)
+                sar = min(sar + af * (ep - sar), previous_low, low)
+        else:
+            if high >= sar:
+                is_long = True
+                sar = min(ep, previous_low, low)
+                result = sar
+                af = self.acceleration
+                ep = high
+                sar = min(sar + af * (ep - sar), previous_low, low)
+            else:
+                result = sar
+                if low < ep:
+                    ep = low
+                    af = min(af + self.acceleration, self.maximum)
+                sar = max(sar + af * (ep - sar), previous_high, high)
+
+        if closed:
+            self.is_long, self.sar, self.ep, self.af = is_long, sar, ep, af
+            self.last = [high, low]
+        return result
+
+
+class IncrementalMACD(IncrementalIndicator):
+    """
+    MACD like TA-Lib MACD.
+
+    Both EMAs start at the first slow EMA value, the fast EMA is seeded with the
+    SMA of the fast period closes before it, and MACD values are only returned once
+    the signal line is available.
+    """
+
+    def __init__(self, fast_period: int, slow_period: int, signal_period: int):
+        if slow_period < fast_period:
+            fast_period, slow_period = slow_period, fast_period
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.fast_k = 2.0 / (fast_period + 1)
+        self.slow_k = 2.0 / (slow_period + 1)
+        self.count = 0
+        self.slow_total = 0.0
+        self.recent = deque(maxlen=max(fast_period - 1, 0))
+        self.fast_ema = NAN
+        self.slow_ema = NAN
+        self.signal = IncrementalEMA(signal_period)
+
+    def update(self, value: float, closed: bool = True) -> Tuple[float, float, float]:
+        """Returns the MACD, the signal line and the histogram."""
+        count = self.count
+        slow_total = self.slow_total
+        if count < self.slow_period:
+            count += 1
+            slow_total += value
+            if count < self.slow_period:
+                if closed:
+                    self.count, self.slow_total = count, slow_total
+                    self.recent.append(value)
+                return NAN, NAN, NAN
+            fast_total = 0.0
+            for recent_value in self.recent:
+                fast_total += recent_value
+            fast_total += value
+            fast_ema = fast_total / self.fast_period
+            slow_ema = slow_total / self.slow_period
+        else:
+            fast_ema = (value - self.fast_ema) * self.fast_k + self.fast_ema
+            slow_ema = (value - self.slow_ema) * self.slow_k + self.slow_ema
+
+        macd = fast_ema - slow_ema
+        signal = self.signal.update(macd, closed)
+        if closed:
+            self.count, self.slow_total = count, slow_total
+            self.fast_ema, self.slow_ema = fast_ema, slow_ema
+        if math.isnan(signal):
+            return NAN, NAN, NAN
+        return macd, signal, macd - signal
+
+
+class IncrementalVWAP(IncrementalIndicator):
+    """
+    Volume weighted average price over the last `window` candles, or since the
+    start of the UTC session or week of the candle with a 'session' or 'weekly' anchor.
+
+    The window is the bot's `vwap_timeperiod` with the 'rolling' anchor. The VWAP
+    with the 'frame' anchor depends on the evaluated frame and is calculated from
+    it by `apply_indicator_state` instead.
+    """
+
+    def __init__(self, window: int, anchor: str = VWAP_ANCHOR_ROLLING):
+        self.window = window
+        self.anchor = anchor
+        self.flows = deque(maxlen=max(window - 1, 0))
+        self.anchor_id = None
+        self.price_volume = 0.0
+        self.volume = 0.0
+
+    def update(
+        self, open_time: int, typical_price: float, volume: float, closed: bool = True
+    ) -> float:
+        if self.anchor in VWAP_ANCHOR_PERIODS:
+            return self.update_anchored(open_time, typical_price, volume, closed)
+
+        price_volume = self.price_volume + typical_price * volume
+        total_volume = self.volume + volume
+        result = price_volume / total_volume if total_volume else NAN
+        if closed:
+            if len(self.flows) == self.flows.maxlen:
+                if self.flows:
+                    price_volume -= self.flows[0][0]
+                    total_volume -= self.flows[0][1]
+                else:
+                    price_volume, total_volume = 0.0, 0.0
+            self.flows.append([typical_price * volume, volume])
+            self.price_volume, self.volume = price_volume, total_volume
+        return result
+
+    def update_anchored(
+        self, open_time: int, typical_price: float, volume: float, closed: bool = True
+    ) -> float:
+        """Updates the VWAP since the anchor, the sums restart with every session or week."""
+        period_ms, offset_ms = VWAP_ANCHOR_PERIODS[self.anchor]
+        anchor_id = (int(open_time) - offset_ms) // period_ms
+        price_volume, total_volume = self.price_volume, self.volume
+        if anchor_id != self.anchor_id:
+            price_volume, total_volume = 0.0, 0.0
+        price_volume += typical_price * volume
+        total_volume += volume
+        if closed:
+            self.anchor_id = anchor_id
+            self.price_volume, self.volume = price_volume, total_volume
+        return price_volume / total_volume if total_volume else NAN
+
+
+def get_indicator_params(bot_settings: BotSettings) -> Dict[str, float]:
+    """
+    Returns the indicator parameters of a bot.
+
+    The parameters don't depend on the evaluated frames, so a state keeps being
+    advanced when the length of the frames changes.
+
+    Args:
+        bot_settings (BotSettings): The settings of the bot.
+
+    Returns:
+        dict: Parameter name mapped to its value.
+    """
+    vwap_anchor = get_vwap_anchor(bot_settings)
+    window = bot_settings.vwap_timeperiod if vwap_anchor == VWAP_ANCHOR_ROLLING else 0
+
+    return {
+        "rsi_timeperiod": bot_settings.rsi_timeperiod,
+        "cci_timeperiod": bot_settings.cci_timeperiod,
+        "mfi_timeperiod": bot_settings.mfi_timeperiod,
+        "stoch_k_timeperiod": bot_settings.stoch_k_timeperiod,
+        "stoch_d_timeperiod": bot_settings.stoch_d_timeperiod,
+        "stoch_rsi_timeperiod": bot_settings.stoch_rsi_timeperiod,
+        "stoch_rsi_k_timeperiod": bot_settings.stoch_rsi_k_timeperiod,
+        "stoch_rsi_d_timeperiod": bot_settings.stoch_rsi_d_timeperiod,
+        "bollinger_timeperiod": bot_settings.bollinger_timeperiod,
+        "bollinger_nbdev": float(bot_settings.bollinger_nbdev),
+        "ema_fast_timeperiod": bot_settings.ema_fast_timeperiod,
+        "ema_slow_timeperiod": bot_settings.ema_slow_timeperiod,
+        "macd_timeperiod": bot_settings.macd_timeperiod,
+        "macd_signalperiod": bot_settings.macd_signalperiod,
+        "atr_timeperiod": bot_settings.atr_timeperiod,
+        "psar_acceleration": float(bot_settings.psar_acceleration),
+        "psar_maximum": float(bot_settings.psar_maximum),
+        "adx_timeperiod": bot_settings.adx_timeperiod,
+        "di_timeperiod": bot_settings.di_timeperiod,
+        "vwap_anchor": vwap_anchor,
+        "vwap_window": window,
+    }
+
+
+class IndicatorState:
+    """
+    Incremental state of all indicators of `calculate_ta_indicators` for one
+    (symbol, interval, parameter set).
+
+    Every closed candle updates each indicator in constant time (CCI in O(period)),
+    and the values are the ones TA-Lib returns for the whole series the state was
+    fed since it was created. The values of the last `history_size` closed candles
+    are kept in a ring buffer, so a frame can be filled without any recalculation.
+
+    For the columns in `AVERAGE_COLUMNS` the running sums and counts of non-missing
+    values after every closed candle are kept in a second ring buffer, so the average
+    of any window of recent candles is the difference of two entries.
+
+    Attributes:
+        params (dict): The indicator parameters from `get_indicator_params`.
+        last_open_time (int): Open time of the last closed candle in milliseconds, None if empty.
+    """
+
+    def __init__(self, params: Dict[str, float], history_size: int = DEFAULT_HISTORY_SIZE):
+        """
+        Creates an empty state.
+
+        Args:
+            params (dict): The indicator parameters from `get_indicator_params`.
+            history_size (int, optional): Number of closed candles whose values are kept.
+        """
+        self.params = params
+        self.last_open_time: Optional[int] = None
+        self.indicators: Dict[str, IncrementalIndicator] = {
+            "rsi": IncrementalRSI(params["rsi_timeperiod"]),
+            "cci": IncrementalCCI(params["cci_timeperiod"]),
+            "mfi": IncrementalMFI(params["mfi_timeperiod"]),
+            "stoch": IncrementalStoch(
+                params["stoch_k_timeperiod"],
+                params["stoch_d_timeperiod"],
+                params["stoch_d_timeperiod"],
+            ),
+            "stoch_rsi": IncrementalRSI(params["stoch_rsi_timeperiod"]),
+            "stoch_rsi_stoch": IncrementalStoch(
+                params["stoch_rsi_k_timeperiod"],
+                params["stoch_rsi_d_timeperiod"],
+                params["stoch_rsi_d_timeperiod"],
+            ),
+            "bollinger": IncrementalBBands(
+                params["bollinger_timeperiod"], params["bollinger_nbdev"]
+            ),
+            "ema_fast": IncrementalEMA(params["ema_fast_timeperiod"]),
+            "ema_slow": IncrementalEMA(params["ema_slow_timeperiod"]),
+            "macd": IncrementalMACD(
+                params["macd_timeperiod"],
+                params["macd_timeperiod"] * 2,
+                params["macd_signalperiod"],
+            ),
+            "ma_200": IncrementalSMA(200),
+            "ma_50": IncrementalSMA(50),
+            "atr": IncrementalATR(params["atr_timeperiod"]),
+            "psar": IncrementalSAR(params["psar_acceleration"], params["psar_maximum"]),
+            "adx": IncrementalDirectional(params["adx_timeperiod"]),
+            "di": IncrementalDirectional(params["di_timeperiod"]),
+        }
+        vwap_anchor = params.get("vwap_anchor", VWAP_ANCHOR_FRAME)
+        if vwap_anchor != VWAP_ANCHOR_FRAME:
+            self.indicators["vwap"] = IncrementalVWAP(params["vwap_window"], vwap_anchor)
+        self._history = np.full((history_size, len(INDICATOR_COLUMNS)), np.nan)
+        self._history_count = 0
+        self._history_position = 0
+        self._average_sums = np.zeros((history_size + 1, len(AVERAGE_COLUMNS)))
+        self._average_counts = np.zeros((history_size + 1, len(AVERAGE_COLUMNS)), dtype=np.int64)
+        self._average_count = 0
+        self._average_position = 0
+
+    @property
+    def history_size(self) -> int:
+        """Returns the number of closed candles whose values are kept."""
+        return len(self._history)
+
+    @property
+    def history_count(self) -> int:
+        """Returns the number of closed candles whose values are available."""
+        return self._history_count
+
+    def update(
+        self,
+        open_time: int,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        closed: bool = True,
+    ) -> np.ndarray:
+        """
+        Updates all indicators with one candle.
+
+        Args:
+            open_time (int): The open time of the candle in milliseconds.
+            high (float): The high price.
+            low (float): The low price.
+            close (float): The close price.
+            volume (float): The volume.
+            closed (bool, optional): False for a still open candle, whose values are
+                returned without changing the state.
+
+        Returns:
+            numpy.ndarray: The values of the candle in the order of `INDICATOR_COLUMNS`.
+        """
+        indicators = self.indicators
+        rsi = indicators["rsi"].update(close, closed)
+        stoch_k, stoch_d = indicators["stoch"].update(high, low, close, closed)
+        stoch_rsi = indicators["stoch_rsi"].update(rsi, closed)
+        stoch_rsi_k, stoch_rsi_d = indicators["stoch_rsi_stoch"].update(
+            stoch_rsi, stoch_rsi, stoch_rsi, closed
+        )
+        upper_band, middle_band, lower_band = indicators["bollinger"].update(close, closed)
+        macd, macd_signal, macd_histogram = indicators["macd"].update(close, closed)
+        typical_price = (high + low + close) / 3
+        _, _, adx = indicators["adx"].update(high, low, close, closed)
+        plus_di, minus_di, _ = indicators["di"].update(high, low, close, closed)
+
+        values = np.array(
+            (
+                rsi,
+                indicators["cci"].update(high, low, close, closed),
+                indicators["mfi"].update(high, low, close, volume, closed),
+                stoch_k,
+                stoch_d,
+                stoch_rsi,
+                stoch_rsi_k,
+                stoch_rsi_d,
+                upper_band,
+                middle_band,
+                lower_band,
+                indicators["ema_fast"].update(close, closed),
+                indicators["ema_slow"].update(close, closed),
+                macd,
+                macd_signal,
+                macd_histogram,
+                indicators["ma_200"].update(close, closed),
+                indicators["ma_50"].update(close, closed),
+                indicators["atr"].update(high, low, close, closed),
+                indicators["psar"].update(high, low, closed),
+                typical_price,
+                (
+                    indicators["vwap"].update(open_time, typical_price, volume, closed)
+                    if "vwap" in indicators
+                    else NAN
+                ),
+                adx,
+                plus_di,
+                minus_di,
+            )
+        )
+
+        if closed:
+            self._history[self._history_position] = values
+            self._history_position = (self._history_position + 1) % len(self._history)
+            self._history_count = min(self._history_count + 1, len(self._history))
+            self.last_open_time = int(open_time)
+
+            average_values = np.concatenate(((close, volume), values))[AVERAGE_SOURCE_INDEXES]
+            valid = ~np.isnan(average_values)
+            position = self._average_position
+            self._average_position = (position + 1) % len(self._average_sums)
+            self._average_sums[self._average_position] = self._average_sums[position] + np.where(
+                valid, average_values, 0.0
+            )
+            self._average_counts[self._average_position] = self._average_counts[position] + valid
+            self._average_count = min(self._average_count + 1, self.history_size)
+        return values
+
+    def get_history(self, count: int) -> np.ndarray:
+        """
+        Returns the values of the last closed candles.
+
+        Args:
+            count (int): The number of candles, at most `history_count`.
+
+        Returns:
+            numpy.ndarray: Array of shape (count, len(INDICATOR_COLUMNS)), oldest first.
+        """
+        positions = (self._history_position - count + np.arange(count)) % len(self._history)
+        return self._history[positions]
+
+    def get_window_sum(self, column: str, count: int) -> Optional[Tuple[float, int]]:
+        """
+        Returns the sum and the number of non-missing values of the last closed candles.
+
+        Args:
+            column (str): A column of `AVERAGE_COLUMNS`.
+            count (int): The number of candles.
+
+        Returns:
+            tuple: The sum and the count, None if the sums of that many candles are not kept.
+        """
+        if count > self._average_count:
+            return None
+        column_index = AVERAGE_COLUMNS.index(column)
+        last = self._average_position
+        first = (last - count) % len(self._average_sums)
+        return (
+            self._average_sums[last, column_index] - self._average_sums[first, column_index],
+            int(self._average_counts[last, column_index] - self._average_counts[first, column_index]),
+        )
+
+    def get_average_history(self, column: str, period: int) -> np.ndarray:
+        """
+        Returns the rolling averages of a column over the kept closed candles.
+
+        Each value is the average of the non-missing values of the last `period`
+        candles up to that candle, or of all kept candles before it if there are fewer,
+        like the averages of `calculate_ta_averages`.
+
+        Args:
+            column (str): A column of `AVERAGE_COLUMNS`.
+            period (int): The averaging period.
+
+        Returns:
+            numpy.ndarray: One average per kept candle, oldest first.
+        """
+        column_index = AVERAGE_COLUMNS.index(column)
+        positions = (
+            self._average_position - self._average_count + np.arange(self._average_count + 1)
+        ) % len(self._average_sums)
+        sums = self._average_sums[positions, column_index]
+        counts = self._average_counts[positions, column_index]
+        ends = np.arange(1, self._average_count + 1)
+        starts = np.maximum(ends - period, 0)
+        window_counts = counts[ends] - counts[starts]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(
+                window_counts > 0, (sums[ends] - sums[starts]) / window_counts, np.nan
+            )
+
+    def get_state(self) -> dict:
+        """Returns the state as a JSON serializable dict."""
+        return {
+            "params": self.params,
+            "history_size": self.history_size,
+            "last_open_time": self.last_open_time,
+            "indicators": {
+                name: indicator.get_state() for name, indicator in self.indicators.items()
+            },
+            "history": self.get_history(self._history_count).tolist(),
+            "average_sums": self._get_average_slots(self._average_sums).tolist(),
+            "average_counts": self._get_average_slots(self._average_counts).tolist(),
+        }
+
+    def _get_average_slots(self, slots: np.ndarray) -> np.ndarray:
+        """Returns the kept running sums or counts, oldest first."""
+        positions = (
+            self._average_position - self._average_count + np.arange(self._average_count + 1)
+        ) % len(slots)
+        return slots[positions]
+
+    @classmethod
+    def from_state(cls, state: dict) -> "IndicatorState":
+        """
+        Restores a state returned by `get_state`.
+
+        Args:
+            state (dict): The checkpointed state.
+
+        Returns:
+            IndicatorState: The restored state.
+        """
+        indicator_state = cls(state["params"], state["history_size"])
+        indicator_state.last_open_time = state["last_open_time"]
+        for name, indicator in indicator_state.indicators.items():
+            indicator.set_state(state["indicators"][name])
+        history = np.array(state["history"], dtype=float).reshape(-1, len(INDICATOR_COLUMNS))
+        indicator_state._history[: len(history)] = history
+        indicator_state._history_count = len(history)
+        indicator_state._history_position = len(history) % indicator_state.history_size
+        if "average_sums" in state:
+            average_sums = np.array(state["average_sums"], dtype=float)
+            average_sums = average_sums.reshape(-1, len(AVERAGE_COLUMNS))
+            indicator_state._average_sums[: len(average_sums)] = average_sums
+            indicator_state._average_counts[: len(average_sums)] = state["average_counts"]
+            indicator_state._average_count = len(average_sums) - 1
+            indicator_state._average_position = len(average_sums) - 1
+        return indicator_state
+
+
+class IndicatorStateRegistry:
+    """
+    Indicator states of the live bots per (symbol, interval, parameter set).
+
+    Bots with the same symbol, interval and indicator parameters share one state.
+    States no bot used for `STALE_STATE_INTERVALS` intervals, e.g. after a bot's
+    parameters changed, are evicted. The states can be checkpointed to a JSON file
+    and restored after a restart.
+    """
+
+    def __init__(self):
+        """Creates an empty registry."""
+        self._states: Dict[Tuple[str, str, tuple], IndicatorState] = {}
+        self._locks: Dict[Tuple[str, str, tuple], threading.Lock] = {}
+        self._last_used_ms: Dict[Tuple[str, str, tuple], float] = {}
+        self._registry_lock = threading.Lock()
+
+    @staticmethod
+    def get_key(symbol: str, interval: str, params: Dict[str, float]) -> Tuple[str, str, tuple]:
+        """Returns the registry key of a (symbol, interval, parameter set)."""
+        return symbol, interval, tuple(sorted(params.items()))
+
+    def get(self, key: Tuple[str, str, tuple]) -> Optional[IndicatorState]:
+        """Returns the state of the key, None if there is none."""
+        with self._registry_lock:
+            return self._states.get(key)
+
+    def set(self, key: Tuple[str, str, tuple], indicator_state: IndicatorState) -> None:
+        """Stores the state of the key."""
+        with self._registry_lock:
+            self._states[key] = indicator_state
+            self._last_used_ms[key] = get_server_now_ms()
+
+    def touch(self, key: Tuple[str, str, tuple], now_ms: float) -> None:
+        """Records that the state of the key was used."""
+        with self._registry_lock:
+            self._last_used_ms[key] = now_ms
+
+    def evict_stale(self, now_ms: float) -> int:
+        """
+        Removes the states not used for `STALE_STATE_INTERVALS` intervals.
+
+        A state is removed together with its lock while holding that lock. States
+        whose lock is held, i.e. which are in use, are kept until the next eviction.
+
+        Args:
+            now_ms (float): The current server time in milliseconds.
+
+        Returns:
+            int: The number of evicted states.
+        """
+        with self._registry_lock:
+            stale_keys = []
+            for key, last_used_ms in list(self._last_used_ms.items()):
+                interval_ms = interval_to_milliseconds(key[1])
+                if not interval_ms or now_ms - last_used_ms <= STALE_STATE_INTERVALS * interval_ms:
+                    continue
+                lock = self._locks.get(key)
+                if lock is not None and not lock.acquire(blocking=False):
+                    continue
+                self._remove(key)
+                if lock is not None:
+                    lock.release()
+                stale_keys.append(key)
+        if stale_keys:
+            logger.info(f"Evicted {len(stale_keys)} stale indicator states.")
+        return len(stale_keys)
+
+    def get_lock(self, key: Tuple[str, str, tuple]) -> threading.Lock:
+        """Returns the current lock of the state of the key, see `locked`."""
+        with self._registry_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @contextmanager
+    def locked(self, key: Tuple[str, str, tuple]) -> Iterator[None]:
+        """
+        Holds the lock serializing the updates of the state of the key.
+
+        A lock removed by `evict_stale` or `clear` while waiting for it is released
+        again and the current lock of the key is taken instead, so two threads never
+        update the same state under different locks.
+
+        Args:
+            key (tuple): The registry key, see `get_key`.
+        """
+        while True:
+            lock = self.get_lock(key)
+            lock.acquire()
+            with self._registry_lock:
+                if self._locks.get(key) is lock:
+                    break
+            lock.release()
+        try:
+            yield
+        finally:
+            lock.release()
+
+    def clear(self) -> None:
+        """Removes all states and their locks, waiting for the states in use."""
+        with self._registry_lock:
+            keys = set(self._states) | set(self._locks) | set(self._last_used_ms)
+        for key in keys:
+            with self.locked(key):
+                with self._registry_lock:
+                    self._remove(key)
+
+    def _remove(self, key: Tuple[str, str, tuple]) -> None:
+        """Removes the state, lock and last use of the key. Requires the registry lock."""
+        self._states.pop(key, None)
+        self._locks.pop(key, None)
+        self._last_used_ms.pop(key, None)
+
+    def checkpoint(self, path: str) -> int:
+        """
+        Writes all states to a JSON file.
+
+        Args:
+            path (str): The checkpoint file.
+
+        Returns:
+            int: The number of states written.
+        """
+        with self._registry_lock:
+            items = list(self._states.items())
+        states = []
+        for (symbol, interval, _), indicator_state in items:
+            with self.locked(self.get_key(symbol, interval, indicator_state.params)):
+                states.append(
+                    {"symbol": symbol, "interval": interval, "state": indicator_state.get_state()}
+                )
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w") as checkpoint_file:
+            json.dump(states, checkpoint_file)
+        os.replace(temporary_path, path)
+        logger.info(f"Checkpointed {len(states)} indicator states to {path}.")
+        return len(states)
+
+    def restore(self, path: str) -> int:
+        """
+        Restores the states of a JSON file written by `checkpoint`.
+
+        Args:
+            path (str): The checkpoint file.
+
+        Returns:
+            int: The number of states restored, 0 if the file does not exist.
+        """
+        if not os.path.exists(path):
+            return 0
+        with open(path) as checkpoint_file:
+            states = json.load(checkpoint_file)
+        for entry in states:
+            indicator_state = IndicatorState.from_state(entry["state"])
+            self.set(
+                self.get_key(entry["symbol"], entry["interval"], indicator_state.params),
+                indicator_state,
+            )
+        logger.info(f"Restored {len(states)} indicator states from {path}.")
+        return len(states)
+
+
+indicator_states = IndicatorStateRegistry()
+
+
+def get_times_ms(column: pd.Series) -> np.ndarray:
+    """Returns a time column of a klines frame as milliseconds."""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.to_numpy(dtype="datetime64[ms]").astype(np.int64)
+    return column.to_numpy(dtype=np.int64)
+
+
+def apply_indicator_state(df: pd.DataFrame, bot_settings: BotSettings) -> Optional[pd.DataFrame]:
+    """
+    Adds the indicator columns to a klines frame from the incremental indicator state.
+
+    The state of the bot's (symbol, interval, parameter set) is advanced by the
+    closed candles of the frame it has not seen yet, usually one, and the open
+    candle is evaluated without changing the state. If there is no state yet, or
+    the frame does not continue it, the state is rebuilt from the closed candles
+    of the frame. The columns are added in one block, which is much cheaper than
+    inserting them one by one. The VWAP with the 'frame' anchor is calculated from
+    the frame.
+
+    Args:
+        df (pandas.DataFrame): The prepared klines frame.
+        bot_settings (BotSettings): The settings of the bot.
+
+    Returns:
+        pandas.DataFrame or None: The frame with the indicator columns, None if it has no closed candle.
+    """
+    now_ms = get_server_now_ms()
+    open_times = get_times_ms(df["open_time"])
+    closed_count = int(np.searchsorted(get_times_ms(df["close_time"]), now_ms))
+    if closed_count == 0:
+        return None
+
+    params = get_indicator_params(bot_settings)
+    key = indicator_states.get_key(bot_settings.symbol, bot_settings.interval, params)
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    close = df["close"].to_numpy(dtype=float)
+    volume = df["volume"].to_numpy(dtype=float)
+
+    with indicator_states.locked(key):
+        indicator_state = indicator_states.get(key)
+        start = 0
+        if indicator_state is not None:
+            start = int(np.searchsorted(open_times[:closed_count], indicator_state.last_open_time))
+            continues = (
+                start < closed_count
+                and open_times[start] == indicator_state.last_open_time
+                and closed_count <= indicator_state.history_size
+            )
+            if continues and indicator_state.history_count >= start + 1:
+                start += 1
+            else:
+                indicator_state = None
+
+        if indicator_state is None:
+            indicator_states.evict_stale(now_ms)
+            indicator_state = IndicatorState(params, max(DEFAULT_HISTORY_SIZE, len(df)))
+            indicator_states.set(key, indicator_state)
+            start = 0
+        indicator_states.touch(key, now_ms)
+
+        for i in range(start, closed_count):
+            indicator_state.update(open_times[i], high[i], low[i], close[i], volume[i])
+
+        values = np.empty((len(df), len(INDICATOR_COLUMNS)))
+        values[:closed_count] = indicator_state.get_history(closed_count)
+        for i in range(closed_count, len(df)):
+            values[i] = indicator_state.update(
+                open_times[i], high[i], low[i], close[i], volume[i], closed=False
+            )
+
+        last_open_time = indicator_state.last_open_time
+
+    if params["vwap_anchor"] == VWAP_ANCHOR_FRAME:
+        values[:, VWAP_INDEX] = calculate_vwap(
+            open_times, values[:, TYPICAL_PRICE_INDEX], volume, VWAP_ANCHOR_FRAME
+        )
+
+    df = df.drop(columns=[column for column in INDICATOR_COLUMNS if column in df.columns])
+    df = pd.concat(
+        [df, pd.DataFrame(values, columns=INDICATOR_COLUMNS, index=df.index)], axis=1
+    )
+    df.attrs["indicator_state"] = {
+        "key": key,
+        "last_open_time": last_open_time,
+        "open_rows": len(df) - closed_count,
+        "last_index": df.index[-1],
+    }
+    return df
+
+
+def get_indicator_state_averages(
+    df: pd.DataFrame, windows: Dict[str, Tuple[str, int]]
+) -> Optional[Dict[str, float]]:
+    """
+    Returns averages over the last rows of a frame from the running sums of its indicator state.
+
+    Each average costs constant time instead of a slice of the frame. The results
+    equal `df[column].iloc[-period:].mean()`, provided the frame was filled by
+    `apply_indicator_state`, only lost rows at its start since then and the state
+    has not been advanced by another frame in the meantime. Otherwise None is
+    returned and the caller falls back to slicing. The VWAP with the 'frame'
+    anchor depends on the whole frame, so its averages are sliced.
+
+    Args:
+        df (pandas.DataFrame): A frame returned by `apply_indicator_state`, possibly cleaned.
+        windows (dict): Average name mapped to a tuple of (column, period), the columns in `AVERAGE_COLUMNS`.
+
+    Returns:
+        dict or None: Average name mapped to the average, None if the state can't be used.
+    """
+    info = df.attrs.get("indicator_state")
+    if (
+        info is None
+        or df.empty
+        or not pd.api.types.is_integer_dtype(df.index)
+        or df.index[-1] != info["last_index"]
+        or df.index[-1] - df.index[0] != len(df) - 1
+        or info["open_rows"] > len(df)
+        or any(column not in AVERAGE_COLUMNS for column, _ in windows.values())
+    ):
+        return None
+
+    indicator_state = indicator_states.get(info["key"])
+    if indicator_state is None:
+        return None
+
+    open_rows = info["open_rows"]
+    open_values = {
+        column: df[column].to_numpy(dtype=float)[len(df) - open_rows:]
+        for column in {column for column, _ in windows.values()}
+    }
+    sliced_columns = (
+        {"vwap"}
+        if indicator_state.params.get("vwap_anchor", VWAP_ANCHOR_FRAME) == VWAP_ANCHOR_FRAME
+        else set()
+    )
+    averages = {
+        name: df[column].iloc[-period:].mean()
+        for name, (column, period) in windows.items()
+        if column in sliced_columns
+    }
+    with indicator_states.locked(info["key"]):
+        if indicator_state.last_open_time != info["last_open_time"]:
+            return None
+        for name, (column, period) in windows.items():
+            if column in sliced_columns:
+                continue
+            rows = min(period, len(df))
+            open_window = open_values[column][max(open_rows - rows, 0):]
+            window_sum = indicator_state.get_window_sum(column, rows - len(open_window))
+            if window_sum is None:
+                return None
+            valid = ~np.isnan(open_window)
+            total = window_sum[0] + open_window[valid].sum()
+            count = window_sum[1] + int(valid.sum())
+            averages[name] = total / count if count else NAN
+    return averages
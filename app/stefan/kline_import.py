@@ -0,0 +1,162 @@
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import click
+import numpy as np
+import pandas as pd
+from binance.helpers import interval_to_milliseconds
+from ..utils.logging import logger
+from .api_utils import KLINE_FIELDS, KLINE_DTYPE
+from .kline_store import KlineStore, get_kline_store
+
+ARCHIVE_NAME_PATTERN = re.compile(
+    r"^(?P<symbol>[A-Z0-9]+)-(?P<interval>\d+[smhdwM])-(?P<period>\d{4}-\d{2}(?:-\d{2})?)\.zip$"
+)
+MICROSECONDS_THRESHOLD = 10**14
+DEFAULT_IMPORT_WORKERS = 4
+
+
+def find_kline_archives(directory: str) -> Dict[Tuple[str, str], List[str]]:
+    """
+    Finds the kline archives of the Binance public data dumps in a directory.
+
+    Archives are recognised by their name, e.g. 'BTCUSDC-1m-2024-01.zip' for monthly
+    and 'BTCUSDC-1m-2024-01-31.zip' for daily dumps. Subdirectories are searched too.
+
+    Args:
+        directory (str): The directory holding the archives.
+
+    Returns:
+        dict: (symbol, interval) mapped to the archive paths sorted by period.
+    """
+    archives: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+    for root, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            match = ARCHIVE_NAME_PATTERN.match(file_name)
+            if match:
+                archives.setdefault((match["symbol"], match["interval"]), []).append(
+                    (match["period"], os.path.join(root, file_name))
+                )
+    return {key: [path for _, path in sorted(paths)] for key, paths in archives.items()}
+
+
+def read_kline_archive(path: str) -> np.ndarray:
+    """
+    Decompresses and parses one kline archive into a klines array.
+
+    The CSV columns are the fields of the Binance klines API. A header line is
+    skipped if present, and open and close times in microseconds (dumps from 2025 on)
+    are converted to milliseconds.
+
+    Args:
+        path (str): The path of the zip archive.
+
+    Returns:
+        numpy.ndarray: Klines array of shape (n, len(KLINE_FIELDS)) sorted by open time.
+    """
+    with zipfile.ZipFile(path) as archive:
+        csv_name = next(name for name in archive.namelist() if name.endswith(".csv"))
+        with archive.open(csv_name) as csv_file:
+            first_line = csv_file.readline()
+            has_header = not first_line[:1].isdigit()
+            csv_file.seek(0)
+            df = pd.read_csv(
+                csv_file,
+                header=None,
+                skiprows=1 if has_header else 0,
+                usecols=range(len(KLINE_FIELDS)),
+                dtype=KLINE_DTYPE,
+            )
+
+    rows = df.to_numpy(dtype=KLINE_DTYPE)
+    for column in (0, 6):
+        microseconds = rows[:, column] >= MICROSECONDS_THRESHOLD
+        rows[microseconds, column] = np.floor(rows[microseconds, column] / 1000)
+    return rows[np.argsort(rows[:, 0], kind="stable")]
+
+
+def import_kline_archives(
+    directory: str,
+    kline_store: Optional[KlineStore] = None,
+    workers: int = DEFAULT_IMPORT_WORKERS,
+) -> Dict[Tuple[str, str], Dict[str, int]]:
+    """
+    Imports a directory of kline archives into the local kline store.
+
+    Archives are decompressed and parsed by a pool of worker processes and written to
+    the store in period order, so each (symbol, interval) file is appended to and at
+    most a few archives are held in memory. Klines already stored are skipped. After
+    the import the covered range is checked for gaps.
+
+    Args:
+        directory (str): The directory holding the archives.
+        kline_store (KlineStore, optional): The target store. Defaults to `get_kline_store()`.
+        workers (int, optional): Number of worker processes. Default is 4.
+
+    Returns:
+        dict: (symbol, interval) mapped to the number of archives, imported klines and gaps.
+    """
+    kline_store = kline_store or get_kline_store()
+    archives = find_kline_archives(directory)
+    summary = {}
+
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as executor:
+        for (symbol, interval), paths in sorted(archives.items()):
+            imported_count = 0
+            first_open_time = last_open_time = None
+
+            for path, rows in zip(paths, executor.map(read_kline_archive, paths)):
+                if not len(rows):
+                    logger.warning(f"Kline archive {path} is empty.")
+                    continue
+                imported_count += kline_store.write(symbol, interval, rows)
+                if first_open_time is None:
+                    first_open_time = int(rows[0, 0])
+                last_open_time = int(rows[-1, 0])
+
+            gaps = []
+            if first_open_time is not None:
+                gaps = kline_store.find_gaps(
+                    symbol,
+                    interval,
+                    first_open_time,
+                    last_open_time + interval_to_milliseconds(interval),
+                )
+            for gap_start_ms, gap_end_ms in gaps:
+                logger.warning(
+                    f"Kline archives {symbol} {interval} gap from {gap_start_ms} to {gap_end_ms}."
+                )
+
+            summary[(symbol, interval)] = {
+                "archives": len(paths),
+                "imported": imported_count,
+                "gaps": len(gaps),
+            }
+            logger.info(
+                f"Kline archives {symbol} {interval} imported. {len(paths)} archives, "
+                f"{imported_count} new klines, {len(gaps)} gaps."
+            )
+
+    return summary
+
+
+@click.command("import-klines")
+@click.argument("directory", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--workers",
+    default=DEFAULT_IMPORT_WORKERS,
+    show_default=True,
+    help="Number of archives decompressed and parsed in parallel.",
+)
+def import_klines_command(directory: str, workers: int) -> None:
+    """Imports Binance kline archives (e.g. BTCUSDC-1m-2024-01.zip) from DIRECTORY into the kline store."""
+    summary = import_kline_archives(directory, workers=workers)
+    if not summary:
+        click.echo(f"No kline archives found in {directory}.")
+    for (symbol, interval), counts in summary.items():
+        click.echo(
+            f"{symbol} {interval}: {counts['archives']} archives, "
+            f"{counts['imported']} new klines, {counts['gaps']} gaps."
+        )
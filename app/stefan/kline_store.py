@@ -0,0 +1,341 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from binance.helpers import interval_to_milliseconds
+from ..utils.logging import logger
+from ..utils.app_utils import get_config_value
+from .api_utils import (
+    KLINE_FIELDS,
+    KLINE_DTYPE,
+    KLINES_REQUEST_LIMIT,
+    fetch_historical_klines,
+    fetch_klines,
+    klines_to_array,
+    array_to_df,
+)
+from .rate_governor import PRIORITY_BULK, request_priority_scope
+
+ROW_BYTES = len(KLINE_FIELDS) * KLINE_DTYPE.itemsize
+DEFAULT_KLINE_STORE_DIR = os.path.join("instance", "klines")
+DEFAULT_DOWNLOAD_WORKERS = 4
+
+
+class KlineStore:
+    """
+    Local on-disk candle store keyed by (symbol, interval).
+
+    Every (symbol, interval) is one binary file of little-endian float64 rows with the
+    fields of KLINE_FIELDS, sorted by open time. New klines are appended to the end of
+    the file; only klines older than the last stored one (backfilled history or a
+    filled gap) cause the file to be merged and atomically replaced. Reads map the file
+    into memory with `numpy.memmap` and slice the requested open time range with a
+    binary search, so loading a year of 1m klines neither parses text nor hits the
+    exchange.
+
+    Attributes:
+        base_dir (str): Directory holding the kline files.
+    """
+
+    def __init__(self, base_dir: str):
+        """
+        Creates a store in the given directory.
+
+        Args:
+            base_dir (str): Directory holding the kline files. Created if missing.
+        """
+        self.base_dir = base_dir
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        os.makedirs(base_dir, exist_ok=True)
+
+    def get_path(self, symbol: str, interval: str) -> str:
+        """Returns the file path of the given (symbol, interval)."""
+        return os.path.join(self.base_dir, f"{symbol.upper()}_{interval}.klines")
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Returns the stored klines with open times in [start_ms, end_ms).
+
+        Args:
+            symbol (str): The trading pair symbol, e.g. 'BTCUSDC'.
+            interval (str): The klines interval, e.g. '1m'.
+            start_ms (int, optional): The earliest open time in milliseconds.
+            end_ms (int, optional): The open time after the last returned kline in milliseconds.
+
+        Returns:
+            numpy.ndarray: A read-only memory-mapped view of the klines, or an empty array.
+        """
+        path = self.get_path(symbol, interval)
+        rows_count = os.path.getsize(path) // ROW_BYTES if os.path.exists(path) else 0
+        if not rows_count:
+            return np.empty((0, len(KLINE_FIELDS)), dtype=KLINE_DTYPE)
+
+        rows = np.memmap(
+            path, dtype=KLINE_DTYPE, mode="r", shape=(rows_count, len(KLINE_FIELDS))
+        )
+        open_times = rows[:, 0]
+        first = 0 if start_ms is None else int(np.searchsorted(open_times, start_ms, "left"))
+        last = rows_count if end_ms is None else int(np.searchsorted(open_times, end_ms, "left"))
+        return rows[first:last]
+
+    def read_df(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Returns the stored klines with open times in [start_ms, end_ms) as a DataFrame."""
+        return array_to_df(self.read(symbol, interval, start_ms, end_ms))
+
+    def get_last_open_time(self, symbol: str, interval: str) -> Optional[int]:
+        """Returns the open time of the last stored kline, or None if nothing is stored."""
+        rows = self.read(symbol, interval)
+        return int(rows[-1, 0]) if len(rows) else None
+
+    def write(self, symbol: str, interval: str, rows: np.ndarray) -> int:
+        """
+        Stores the given klines.
+
+        Klines newer than the last stored one are appended. Klines that are already
+        stored are ignored. If older klines are given, the file is merged and replaced.
+        A gap between the last stored kline and the first appended one is logged and
+        can later be found with `find_gaps`.
+
+        Args:
+            symbol (str): The trading pair symbol, e.g. 'BTCUSDC'.
+            interval (str): The klines interval, e.g. '1m'.
+            rows (numpy.ndarray): Klines array of shape (n, len(KLINE_FIELDS)).
+
+        Returns:
+            int: The number of new klines stored.
+        """
+        if not len(rows):
+            return 0
+
+        rows = np.asarray(rows, dtype=KLINE_DTYPE)
+        rows = rows[np.unique(rows[:, 0], return_index=True)[1]]
+
+        with self._get_lock(symbol, interval):
+            stored = self.read(symbol, interval)
+            last_open_time = stored[-1, 0] if len(stored) else None
+
+            if last_open_time is None or rows[0, 0] > last_open_time:
+                return self._append(symbol, interval, rows, last_open_time)
+            return self._merge(symbol, interval, stored, rows)
+
+    def find_gaps(
+        self, symbol: str, interval: str, start_ms: int, end_ms: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Returns the ranges of klines missing between two open times.
+
+        Args:
+            symbol (str): The trading pair symbol, e.g. 'BTCUSDC'.
+            interval (str): The klines interval, e.g. '1m'.
+            start_ms (int): The earliest open time in milliseconds.
+            end_ms (int): The open time after the last expected kline in milliseconds.
+
+        Returns:
+            list: (first missing open time, open time after the last missing kline) pairs.
+        """
+        interval_ms = interval_to_milliseconds(interval)
+        start_ms = -(-int(start_ms) // interval_ms) * interval_ms
+        if end_ms <= start_ms:
+            return []
+
+        open_times = np.array(self.read(symbol, interval, start_ms, end_ms)[:, 0], dtype="int64")
+        edges = np.concatenate(([start_ms - interval_ms], open_times, [int(end_ms)]))
+        gap_indexes = np.nonzero(np.diff(edges) > interval_ms)[0]
+        return [
+            (int(edges[index]) + interval_ms, int(edges[index + 1]))
+            for index in gap_indexes
+        ]
+
+    def sync(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: int,
+        end_ms: int,
+        server_now_ms: Optional[float] = None,
+    ) -> int:
+        """
+        Fetches the closed klines missing from the store between two open times.
+
+        Only the gaps reported by `find_gaps` are requested from the exchange, so a
+        range that is already stored costs no API calls.
+
+        Args:
+            symbol (str): The trading pair symbol, e.g. 'BTCUSDC'.
+            interval (str): The klines interval, e.g. '1m'.
+            start_ms (int): The earliest open time in milliseconds.
+            end_ms (int): The open time after the last wanted kline in milliseconds.
+            server_now_ms (float, optional): The server time. Defaults to now.
+
+        Returns:
+            int: The number of new klines stored.
+        """
+        from .scheduling import get_last_candle_close_ms
+
+        end_ms = min(int(end_ms), get_last_candle_close_ms(interval, server_now_ms))
+        stored_count = 0
+
+        for gap_start_ms, gap_end_ms in self.find_gaps(symbol, interval, start_ms, end_ms):
+            klines = fetch_historical_klines(symbol, interval, gap_start_ms, gap_end_ms - 1)
+            rows = klines_to_array(klines or [])
+            rows = rows[(rows[:, 0] >= gap_start_ms) & (rows[:, 0] < gap_end_ms)]
+            stored_count += self.write(symbol, interval, rows)
+
+        return stored_count
+
+    def download(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: int,
+        end_ms: int,
+        workers: int = DEFAULT_DOWNLOAD_WORKERS,
+        server_now_ms: Optional[float] = None,
+    ) -> int:
+        """
+        Downloads the closed klines missing from the store with concurrent requests.
+
+        The gaps reported by `find_gaps` are split into chunks of one `get_klines`
+        request each. Chunks are fetched by a pool of workers as bulk requests of the
+        rate governor and written to the store in order as soon as they arrive, so at
+        most a few chunks are held in memory. An interrupted download resumes from the
+        stored klines, only the chunks that were not written are fetched again.
+
+        Args:
+            symbol (str): The trading pair symbol, e.g. 'BTCUSDC'.
+            interval (str): The klines interval, e.g. '1m'.
+            start_ms (int): The earliest open time in milliseconds.
+            end_ms (int): The open time after the last wanted kline in milliseconds.
+            workers (int, optional): Number of concurrent requests. Default is 4.
+            server_now_ms (float, optional): The server time. Defaults to now.
+
+        Returns:
+            int: The number of new klines stored.
+        """
+        from flask import current_app, has_app_context
+        from .scheduling import get_last_candle_close_ms
+
+        end_ms = min(int(end_ms), get_last_candle_close_ms(interval, server_now_ms))
+        chunk_ms = KLINES_REQUEST_LIMIT * interval_to_milliseconds(interval)
+        chunks = [
+            (chunk_start_ms, min(chunk_start_ms + chunk_ms, gap_end_ms))
+            for gap_start_ms, gap_end_ms in self.find_gaps(symbol, interval, start_ms, end_ms)
+            for chunk_start_ms in range(gap_start_ms, gap_end_ms, chunk_ms)
+        ]
+        if not chunks:
+            return 0
+
+        app = current_app._get_current_object() if has_app_context() else None
+
+        def fetch_chunk(chunk_start_ms: int) -> Optional[List[list]]:
+            with request_priority_scope(PRIORITY_BULK):
+                if app is None:
+                    return fetch_klines(symbol, interval, chunk_start_ms)
+                with app.app_context():
+                    return fetch_klines(symbol, interval, chunk_start_ms)
+
+        logger.info(
+            f"KlineStore downloading {symbol} {interval} in {len(chunks)} chunks with {workers} workers."
+        )
+        stored_count = 0
+        failed_chunks = 0
+        with ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="stefan-download"
+        ) as executor:
+            window = max(1, workers) * 2
+            futures = [executor.submit(fetch_chunk, chunk[0]) for chunk in chunks[:window]]
+
+            for index, (chunk_start_ms, chunk_end_ms) in enumerate(chunks):
+                klines = futures[index].result()
+                futures[index] = None
+                if index + window < len(chunks):
+                    futures.append(executor.submit(fetch_chunk, chunks[index + window][0]))
+
+                if klines is None:
+                    failed_chunks += 1
+                    continue
+                rows = klines_to_array(klines)
+                rows = rows[(rows[:, 0] >= chunk_start_ms) & (rows[:, 0] < chunk_end_ms)]
+                stored_count += self.write(symbol, interval, rows)
+
+        if failed_chunks:
+            logger.warning(
+                f"KlineStore {symbol} {interval} {failed_chunks} chunks failed. Run the download again to resume."
+            )
+        logger.info(f"KlineStore {symbol} {interval} downloaded {stored_count} klines.")
+        return stored_count
+
+    def _get_lock(self, symbol: str, interval: str) -> threading.Lock:
+        """Returns the write lock of the given (symbol, interval)."""
+        with self._registry_lock:
+            return self._locks.setdefault((symbol.upper(), interval), threading.Lock())
+
+    def _append(
+        self,
+        symbol: str,
+        interval: str,
+        rows: np.ndarray,
+        last_open_time: Optional[float],
+    ) -> int:
+        """Appends klines newer than the last stored one to the end of the file."""
+        if last_open_time is not None:
+            interval_ms = interval_to_milliseconds(interval)
+            if rows[0, 0] - last_open_time > interval_ms:
+                logger.warning(
+                    f"KlineStore {symbol} {interval} gap of {int((rows[0, 0] - last_open_time) // interval_ms) - 1} klines before {int(rows[0, 0])}."
+                )
+
+        with open(self.get_path(symbol, interval), "ab") as file:
+            file.write(rows.tobytes())
+        return len(rows)
+
+    def _merge(
+        self, symbol: str, interval: str, stored: np.ndarray, rows: np.ndarray
+    ) -> int:
+        """Merges klines into the stored ones and atomically replaces the file."""
+        new_rows = rows[~np.isin(rows[:, 0], stored[:, 0])]
+        if not len(new_rows):
+            return 0
+
+        merged = np.concatenate((stored, new_rows))
+        merged = merged[np.argsort(merged[:, 0], kind="stable")]
+
+        path = self.get_path(symbol, interval)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(merged.tobytes())
+        os.replace(temp_path, path)
+        return len(new_rows)
+
+
+_stores: Dict[str, KlineStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_kline_store() -> KlineStore:
+    """
+    Returns the shared KlineStore of the directory set in `KLINE_STORE_DIR`.
+
+    Returns:
+        KlineStore: The kline store.
+    """
+    base_dir = get_config_value("KLINE_STORE_DIR", DEFAULT_KLINE_STORE_DIR)
+    with _stores_lock:
+        if base_dir not in _stores:
+            _stores[base_dir] = KlineStore(base_dir)
+        return _stores[base_dir]
@@ -1,4 +1,5 @@
 from .. import db
+import time
 import pandas as pd
 from datetime import datetime as dt
 from datetime import datetime
@@ -7,6 +8,7 @@ from ..models import User, BotSettings, BotCurrentTrade
 from ..utils.logging import logger
 from typing import Optional
 from ..utils.exception_handlers import exception_handler
+from ..utils.app_utils import get_config_value
 from ..utils.bots_utils import suspend_after_negative_trade
 from ..utils.email_utils import filter_users_and_send_trade_emails
 from ..utils.telegram_utils import filter_users_and_send_trade_telegrams
@@ -15,7 +17,10 @@ from .buy_signals import check_classic_ta_buy_signal
 from .sell_signals import check_classic_ta_sell_signal
 from ..mariola.predict import check_ml_trade_signal
 from ..openai.openai_analysis import check_gpt_trade_signal
-from .api_utils import fetch_data, place_buy_order, place_sell_order
+from .api_utils import place_buy_order, place_sell_order
+from .scheduling import record_decision_latency
+from .market_data import kline_buffer, fetch_recent_data
+from .warmup import ML_WINDOW_CANDLES
 from .calc_utils import (
     calculate_ta_indicators,
     calculate_ta_averages,
@@ -47,19 +52,22 @@ def is_df_valid(df: pd.DataFrame, bot_info: int) -> bool:
 
 @exception_handler()
 def fetch_data_and_validate(
-    symbol: str, interval: str, lookback_period: int, bot_id: int
+    symbol: str, interval: str, candles: int, bot_id: int
 ) -> Union[pd.DataFrame, Optional[int]]:
     """
     Fetches market data and validates the resulting DataFrame.
 
-    This function fetches the market data using the specified symbol, interval, and lookback period,
-    then checks if the fetched DataFrame is valid using the `is_df_valid` function.
+    This function fetches the given number of most recent candles for the symbol and interval,
+    from the rolling `kline_buffer` if `KLINE_BUFFER_ENABLED` is set (only new klines are
+    downloaded after the first call). With `KLINE_RESAMPLE_ENABLED` higher intervals are
+    resampled from the buffered base interval of the symbol when it covers the window,
+    without requests of their own. Then it checks if the fetched DataFrame is valid using the `is_df_valid` function.
     If the DataFrame is invalid, it returns None.
 
     Args:
         symbol (str): The trading pair symbol, e.g., 'BTCUSDC'.
         interval (str): The interval for the market data (e.g., '1m', '5m').
-        lookback_period (int): The lookback period for fetching historical data.
+        candles (int): The number of candles to fetch, usually the bot's warm-up from `get_warmup_candles`.
         bot_id (int): The ID of the bot, used for logging purposes.
 
     Returns:
@@ -68,7 +76,14 @@ def fetch_data_and_validate(
     Raises:
         Exception: If any error occurs during the data fetching process.
     """
-    df = fetch_data(symbol=symbol, interval=interval, lookback=lookback_period)
+    if get_config_value("KLINE_BUFFER_ENABLED", False):
+        df = None
+        if get_config_value("KLINE_RESAMPLE_ENABLED", False):
+            df = kline_buffer.get_resampled_df(symbol, interval, candles)
+        if df is None:
+            df = kline_buffer.get_df(symbol, interval, candles)
+    else:
+        df = fetch_recent_data(symbol, interval, candles)
     if not is_df_valid(df, bot_id):
         return None
     return df
@@ -142,9 +157,18 @@ def manage_trading_logic(
     use_trailing_take_profit = bot_settings.use_trailing_take_profit
     take_profit_price = float(current_trade.take_profit_price)
 
-    df_raw = df_fetched.copy() if bot_settings.use_machine_learning else None
+    df_raw = (
+        df_fetched.iloc[-ML_WINDOW_CANDLES:].copy()
+        if bot_settings.use_machine_learning
+        else None
+    )
 
-    df_calculated = calculate_ta_indicators(df_fetched, bot_settings)
+    df_calculated = calculate_ta_indicators(
+        df_fetched,
+        bot_settings,
+        use_indicator_state=get_config_value("INDICATOR_STATE_ENABLED", False),
+        use_indicator_cache=get_config_value("INDICATOR_CACHE_ENABLED", False),
+    )
 
     previous_price = float(
         current_trade.previous_price if current_trade.is_active else 0
@@ -170,8 +194,12 @@ def manage_trading_logic(
         if isinstance(buy_signal, pd.Series):
             buy_signal = buy_signal.all()
 
+        record_decision_latency(bot_settings.id, bot_settings.interval)
+
         if buy_signal:
-            execute_buy_order(bot_settings, current_price, atr_value)
+            execute_buy_order(
+                bot_settings, current_price, atr_value, signal_time=time.perf_counter()
+            )
         else:
             logger.trade(
                 f"bot {bot_settings.id} {bot_settings.strategy} no buy signal."
@@ -186,6 +214,8 @@ def manage_trading_logic(
         if isinstance(sell_signal, pd.Series):
             sell_signal = sell_signal.all()
 
+        record_decision_latency(bot_settings.id, bot_settings.interval)
+
         stop_loss_activated = False
         take_profit_activated = False
         full_sell_signal = False
@@ -221,6 +251,7 @@ def manage_trading_logic(
                 current_price,
                 stop_loss_activated,
                 take_profit_activated,
+                signal_time=time.perf_counter(),
             )
         elif price_rises:
             if use_trailing_stop_loss:
@@ -290,7 +321,10 @@ def check_signal(
 
 @exception_handler()
 def execute_buy_order(
-    bot_settings: BotSettings, current_price: float, atr_value: float
+    bot_settings: BotSettings,
+    current_price: float,
+    atr_value: float,
+    signal_time: Optional[float] = None,
 ) -> Any:
     """
     Executes a buy order for the trading bot, including setting stop loss, take profit,
@@ -300,6 +334,7 @@ def execute_buy_order(
         bot_settings (object): Settings of the trading bot.
         current_price (float): The current market price for the asset.
         atr_value (float): The Average True Range (ATR) value used for calculating stop loss and take profit.
+        signal_time (float, optional): The `time.perf_counter()` of the buy signal, used to record the order latency.
 
     Returns:
         None: Executes the buy order and updates the trade status.
@@ -318,7 +353,7 @@ def execute_buy_order(
     formatted_now = now.strftime("%Y-%m-%d %H:%M:%S")
 
     logger.trade(f"bot {bot_settings.id} {bot_settings.strategy} BUY signal.")
-    buy_success, amount = place_buy_order(bot_settings.id)
+    buy_success, amount = place_buy_order(bot_settings.id, signal_time)
 
     if buy_success:
         stop_loss_price = 0
@@ -380,6 +415,7 @@ def execute_sell_order(
     current_price: float,
     stop_loss_activated: bool,
     take_profit_activated: bool,
+    signal_time: Optional[float] = None,
 ) -> Any:
     """
     Executes a sell order for the trading bot, including updating trade history and handling
@@ -391,6 +427,7 @@ def execute_sell_order(
         current_price (float): The current market price for the asset.
         stop_loss_activated (bool): Whether the stop loss condition has been met.
         take_profit_activated (bool): Whether the take profit condition has been met.
+        signal_time (float, optional): The `time.perf_counter()` of the sell signal, used to record the order latency.
 
     Returns:
         None: Executes the sell order and updates the trade status.
@@ -404,7 +441,7 @@ def execute_sell_order(
     formatted_now = now.strftime("%Y-%m-%d %H:%M:%S")
 
     logger.trade(f"bot {bot_settings.id} {bot_settings.strategy} SELL signal.")
-    sell_success, amount = place_sell_order(bot_settings.id)
+    sell_success, amount = place_sell_order(bot_settings.id, signal_time)
 
     trade_buy_price = current_trade.buy_price
     trade_stop_loss_price = current_trade.stop_loss_price
@@ -762,6 +799,8 @@ def send_trade_notifications(
     """
     Sends trade notifications via email and Telegram to users who have opted in.
 
+    Nothing is sent when `TRADE_NOTIFICATIONS_ENABLED` is off.
+
     Args:
         email_subject (str): The subject of the message to be sent.
         msg_content (str): The body of the message to be sent.
@@ -769,6 +808,8 @@ def send_trade_notifications(
     Returns:
         None
     """
+    if not get_config_value("TRADE_NOTIFICATIONS_ENABLED", True):
+        return
     filter_users_and_send_trade_telegrams(trade_msg_content)
     trade_msg_content += "\n\n-- \n\nStefanCryptoTradingBot\nhttps://stefan.ropeaccess.pro\n\nFomoSapiensCryptoDipHunter\nhttps://fomo.ropeaccess.pro\n\nCodeCave\nhttps://cave.ropeaccess.pro\n"
     filter_users_and_send_trade_emails(trade_msg_subject, trade_msg_content)
@@ -0,0 +1,442 @@
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple, List, Optional, Union
+from ..models import BotSettings
+from ..utils.logging import logger
+from ..utils.app_utils import get_config_value
+from .api_utils import (
+    KLINE_FIELDS,
+    KLINE_DTYPE,
+    KLINES_REQUEST_LIMIT,
+    fetch_data,
+    fetch_klines,
+    klines_to_array,
+    klines_to_df,
+    array_to_df,
+)
+from .kline_store import KlineStore, get_kline_store
+from .warmup import get_warmup_candles
+from .resampling import can_resample, resample_klines
+from .scheduling import (
+    interval_to_milliseconds,
+    get_server_now_ms,
+    get_last_candle_close_ms,
+)
+
+DELTA_FETCH_LIMIT = KLINES_REQUEST_LIMIT
+DEFAULT_CANDLES = 205
+DEFAULT_RESAMPLE_BASE_INTERVAL = "1m"
+DEFAULT_RESAMPLE_MAX_BASE_CANDLES = 5000
+
+
+def get_lookback_extended(interval: str, candles: int = DEFAULT_CANDLES) -> str:
+    """
+    Returns the lookback string covering a number of candles of an interval.
+
+    By default the lookback covers 205 candles of the interval, e.g. '205m' for '1m'
+    or '820h' for '4h'.
+
+    Args:
+        interval (str): The klines interval, e.g. '1m'.
+        candles (int, optional): The number of candles. Default is 205.
+
+    Returns:
+        str: The lookback period string accepted by `fetch_data`.
+    """
+    return f"{int(interval[:-1]) * candles}{interval[-1:]}"
+
+
+def fetch_recent_data(
+    symbol: str, interval: str, candles: int
+) -> Optional[pd.DataFrame]:
+    """
+    Fetches the most recent klines, including the open one.
+
+    Up to `KLINES_REQUEST_LIMIT` candles are fetched with a single limit-based
+    request. Longer histories are paged with `fetch_data`.
+
+    Args:
+        symbol (str): The trading pair symbol, e.g. 'BTCUSDC'.
+        interval (str): The klines interval, e.g. '1m'.
+        candles (int): The number of candles to fetch.
+
+    Returns:
+        pandas.DataFrame or None: The klines, or None if fetching failed.
+    """
+    if candles > KLINES_REQUEST_LIMIT:
+        return fetch_data(
+            symbol=symbol,
+            interval=interval,
+            lookback=get_lookback_extended(interval, candles),
+        )
+
+    klines = fetch_klines(symbol, interval, limit=candles)
+    return klines_to_df(klines) if klines is not None else None
+
+
+class MarketDataSweep:
+    """
+    Coordinates market data fetching within a single scheduler sweep.
+
+    Bots are grouped by (symbol, interval). The klines of each group are fetched
+    once, on first request, with the longest warm-up of the group's bots, and every bot of the group receives its own copy of
+    the fetched DataFrame, so in-place indicator calculations of one bot never
+    affect another bot. Fetching is guarded by a lock per group, which makes the
+    sweep safe to use from concurrent bot workers. The fetch count shared by all
+    groups has a lock of its own.
+
+    With the shared indicator cache, the RSI, EMA and MACD variants of all bots of a
+    group are calculated once per distinct parameter set right after the fetch
+    (`prime_ta_indicator_cache`).
+
+    Attributes:
+        candles (dict): The number of candles fetched per (symbol, interval) group.
+        fetch_count (int): Number of klines fetches made during the sweep.
+    """
+
+    def __init__(self, bots: List[BotSettings]):
+        """
+        Groups the given bots by (symbol, interval).
+
+        Args:
+            bots (list): The BotSettings of all bots taking part in the sweep.
+        """
+        from .calc_utils import get_batch_variants
+
+        self.candles: Dict[Tuple[str, str], int] = {}
+        self.fetch_count = 0
+        self._frames: Dict[Tuple[str, str], Optional[pd.DataFrame]] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._fetch_count_lock = threading.Lock()
+        self._batch_variants: Dict[Tuple[str, str], List[dict]] = {}
+        batch_indicators = get_config_value(
+            "INDICATOR_CACHE_ENABLED", False
+        ) and not get_config_value("INDICATOR_STATE_ENABLED", False)
+
+        for bot_settings in bots:
+            key = (bot_settings.symbol, bot_settings.interval)
+            self.candles[key] = max(
+                self.candles.get(key, 0), get_warmup_candles(bot_settings)
+            )
+            self._locks.setdefault(key, threading.Lock())
+            if batch_indicators:
+                self._batch_variants.setdefault(key, []).append(
+                    get_batch_variants(bot_settings)
+                )
+
+        logger.trade(
+            f"MarketDataSweep {len(bots)} bots grouped into {len(self.candles)} (symbol, interval) groups."
+        )
+
+    def get_df(
+        self, symbol: str, interval: str, bot_id: int, candles: Optional[int] = None
+    ) -> Union[pd.DataFrame, Optional[int]]:
+        """
+        Returns a copy of the klines DataFrame for the given symbol and interval.
+
+        The group's klines are fetched and validated on the first call only.
+        Bots outside of any known group are fetched individually.
+
+        Args:
+            symbol (str): The trading pair symbol, e.g. 'BTCUSDC'.
+            interval (str): The klines interval, e.g. '1m'.
+            bot_id (int): The ID of the requesting bot, used for logging purposes.
+            candles (int, optional): The bot's warm-up, used if the bot is outside of any group.
+
+        Returns:
+            pandas.DataFrame or None: The bot's own copy of the klines, or None if invalid.
+        """
+        from .logic_utils import fetch_data_and_validate
+
+        key = (symbol, interval)
+        lock = self._locks.get(key)
+        if lock is None:
+            logger.trade(
+                f"Bot {bot_id} {symbol} {interval} not found in MarketDataSweep. Fetching separately."
+            )
+            return fetch_data_and_validate(
+                symbol, interval, candles or DEFAULT_CANDLES, bot_id
+            )
+
+        with lock:
+            if key not in self._frames:
+                self._frames[key] = fetch_data_and_validate(
+                    symbol, interval, self.candles[key], bot_id
+                )
+                with self._fetch_count_lock:
+                    self.fetch_count += 1
+                self._prime_indicator_cache(key)
+
+        df = self._frames[key]
+        return df.copy() if df is not None else None
+
+    def _prime_indicator_cache(self, key: Tuple[str, str]) -> None:
+        """
+        Calculates the distinct RSI, EMA and MACD variants of a group's bots.
+
+        Only used with the shared indicator cache and without the incremental
+        indicator state, which already shares indicators of equal parameters.
+        """
+        from .calc_utils import prime_ta_indicator_cache
+
+        variants = self._batch_variants.get(key, [])
+        if self._frames[key] is not None and len(variants) > 1:
+            prime_ta_indicator_cache(self._frames[key], key[0], key[1], variants)
+
+
+class KlineBuffer:
+    """
+    Rolling in-memory klines buffer per (symbol, interval).
+
+    The first request of a (symbol, interval) backfills the requested number of
+    candles with `fetch_recent_data`. Every later request fetches only the klines from the open time of
+    the last buffered kline onwards with a single `get_klines` request, replaces the
+    last buffered kline (it may still have been open) with the fetched ones and
+    evicts the oldest klines, so the buffer keeps the length of the initial backfill.
+    If the buffer is too far behind for one request, or a request needs more candles
+    than buffered, it is backfilled again.
+
+    With `KLINE_STORE_ENABLED` the buffer is backed by the local KlineStore: closed
+    klines are written to the store, and a backfill reads the store and fetches only
+    the klines missing from it, so a restart does not download the full lookback again.
+
+    Klines can also be pushed into the buffer by a streaming source with `push`. While
+    the pushed klines are current, requests are served from memory without any fetch.
+
+    Higher intervals can be served with `get_resampled_df` from the buffered klines of
+    a base interval of the same symbol, so bots of several intervals on one symbol
+    share a single series.
+
+    Attributes:
+        full_fetches (int): Number of full backfills made.
+        delta_fetches (int): Number of delta fetches made.
+        stream_hits (int): Number of requests served from pushed klines only.
+        resample_hits (int): Number of requests served by resampling a base interval.
+    """
+
+    def __init__(self):
+        """Creates an empty buffer."""
+        self.full_fetches = 0
+        self.delta_fetches = 0
+        self.stream_hits = 0
+        self.resample_hits = 0
+        self._frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._sizes: Dict[Tuple[str, str], int] = {}
+        self._stores: Dict[Tuple[str, str], Optional[KlineStore]] = {}
+        self._streamed: Dict[Tuple[str, str], Tuple[int, bool]] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def get_df(
+        self, symbol: str, interval: str, candles: int
+    ) -> Optional[pd.DataFrame]:
+        """
+        Returns a copy of the up to date klines of the given symbol and interval.
+
+        Args:
+            symbol (str): The trading pair symbol, e.g. 'BTCUSDC'.
+            interval (str): The klines interval, e.g. '1m'.
+            candles (int): The number of most recent candles returned, including the open one.
+
+        Returns:
+            pandas.DataFrame or None: A copy of the buffered klines, or None if fetching failed.
+        """
+        key = (symbol, interval)
+        with self._get_lock(key):
+            df = self._frames.get(key)
+            if df is None or candles > self._sizes[key]:
+                df = self._backfill(key, candles)
+            elif self._is_streamed(key):
+                self.stream_hits += 1
+            else:
+                df = self._update(key, df, candles)
+            return df.tail(candles).reset_index(drop=True) if df is not None else None
+
+    def get_resampled_df(
+        self, symbol: str, interval: str, candles: int
+    ) -> Optional[pd.DataFrame]:
+        """
+        Returns the most recent candles of a higher interval resampled from a base interval.
+
+        The base interval is `KLINE_RESAMPLE_BASE_INTERVAL`. Klines are only resampled if
+        the base series of the symbol is already buffered for another bot and the window
+        needs at most `KLINE_RESAMPLE_MAX_BASE_CANDLES` base candles. The base series is
+        brought up to date (and extended once if it is too short), so all intervals of the
+        symbol cost at most the delta fetch of the base series.
+
+        Args:
+            symbol (str): The trading pair symbol, e.g. 'BTCUSDC'.
+            interval (str): The requested klines interval, e.g. '15m'.
+            candles (int): The number of most recent candles returned, including the open one.
+
+        Returns:
+            pandas.DataFrame or None: The resampled klines, or None if the interval cannot
+                                      be served from the base series.
+        """
+        base_interval = get_config_value(
+            "KLINE_RESAMPLE_BASE_INTERVAL", DEFAULT_RESAMPLE_BASE_INTERVAL
+        )
+        if (symbol, base_interval) not in self._frames or not can_resample(
+            base_interval, interval
+        ):
+            return None
+
+        ratio = interval_to_milliseconds(interval) // interval_to_milliseconds(base_interval)
+        base_candles = (candles + 1) * ratio
+        if base_candles > get_config_value(
+            "KLINE_RESAMPLE_MAX_BASE_CANDLES", DEFAULT_RESAMPLE_MAX_BASE_CANDLES
+        ):
+            return None
+
+        base_df = self.get_df(symbol, base_interval, base_candles)
+        if base_df is None or base_df.empty:
+            return None
+
+        rows = base_df[KLINE_FIELDS].to_numpy(dtype=KLINE_DTYPE)
+        resampled = resample_klines(rows, base_interval, interval)
+        if resampled is None or len(resampled) < candles:
+            return None
+
+        self.resample_hits += 1
+        return array_to_df(resampled[-candles:])
+
+    def push(
+        self, symbol: str, interval: str, klines: List[list], closed: bool = False
+    ) -> bool:
+        """
+        Merges klines received from a streaming source into the buffer.
+
+        Klines are only merged into a buffer that was already backfilled and that
+        they continue without a gap. Otherwise they are ignored and the next request
+        fetches the missing klines.
+
+        Args:
+            symbol (str): The trading pair symbol, e.g. 'BTCUSDC'.
+            interval (str): The klines interval, e.g. '1m'.
+            klines (list): Raw klines in the format of the Binance klines API.
+            closed (bool, optional): Whether the last kline is closed.
+
+        Returns:
+            bool: True if the klines were merged into the buffer.
+        """
+        key = (symbol, interval)
+        with self._get_lock(key):
+            df = self._frames.get(key)
+            if df is None or not klines:
+                return False
+
+            last_open_time = int(df["open_time"].iloc[-1])
+            if int(klines[0][0]) > last_open_time + interval_to_milliseconds(interval):
+                self._streamed.pop(key, None)
+                return False
+
+            self._merge_klines(key, df, klines)
+            self._streamed[key] = (int(klines[-1][0]), closed)
+            return True
+
+    def clear(self) -> None:
+        """Removes all buffered klines, so the next requests backfill again."""
+        with self._registry_lock:
+            self._frames.clear()
+            self._sizes.clear()
+            self._stores.clear()
+            self._streamed.clear()
+
+    def _get_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        """Returns the lock of the given (symbol, interval)."""
+        with self._registry_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _is_streamed(self, key: Tuple[str, str]) -> bool:
+        """Checks whether pushed klines already cover the last candle close."""
+        if key not in self._streamed:
+            return False
+
+        interval = key[1]
+        streamed_open_time, closed = self._streamed[key]
+        current_open_time = get_last_candle_close_ms(interval)
+        if closed:
+            streamed_open_time += interval_to_milliseconds(interval)
+        return streamed_open_time >= current_open_time
+
+    def _backfill(
+        self, key: Tuple[str, str], candles: int
+    ) -> Optional[pd.DataFrame]:
+        """Fetches the most recent candles of the given (symbol, interval) and stores them."""
+        symbol, interval = key
+        kline_store = None
+        self._streamed.pop(key, None)
+        if get_config_value("KLINE_STORE_ENABLED", False):
+            kline_store = get_kline_store()
+            df = self._backfill_from_store(key, kline_store, candles)
+        else:
+            df = fetch_recent_data(symbol, interval, candles)
+        self.full_fetches += 1
+
+        if df is None or df.empty:
+            self._frames.pop(key, None)
+            return df
+
+        self._frames[key] = df
+        self._sizes[key] = max(len(df), candles)
+        self._stores[key] = kline_store
+        logger.trade(f"KlineBuffer {symbol} {interval} backfilled with {len(df)} klines.")
+        return df
+
+    def _backfill_from_store(
+        self, key: Tuple[str, str], kline_store: KlineStore, candles: int
+    ) -> Optional[pd.DataFrame]:
+        """Reads the closed klines from the store and adds the open kline."""
+        symbol, interval = key
+        open_time_ms = get_last_candle_close_ms(interval)
+        start_ms = open_time_ms - (candles - 1) * interval_to_milliseconds(interval)
+
+        kline_store.sync(symbol, interval, start_ms, open_time_ms)
+        klines = fetch_klines(symbol, interval, open_time_ms, limit=DELTA_FETCH_LIMIT)
+        if klines is None:
+            return None
+
+        rows = kline_store.read(symbol, interval, start_ms, open_time_ms)
+        return array_to_df(np.concatenate((rows, klines_to_array(klines))))
+
+    def _update(
+        self, key: Tuple[str, str], df: pd.DataFrame, candles: int
+    ) -> Optional[pd.DataFrame]:
+        """Fetches the klines newer than the buffered ones and rolls the buffer forward."""
+        symbol, interval = key
+        klines = fetch_klines(
+            symbol, interval, int(df["open_time"].iloc[-1]), limit=DELTA_FETCH_LIMIT
+        )
+        self.delta_fetches += 1
+
+        if klines is None:
+            return None
+        if len(klines) >= DELTA_FETCH_LIMIT:
+            logger.trade(f"KlineBuffer {symbol} {interval} too far behind. Backfilling.")
+            return self._backfill(key, candles)
+        if not klines:
+            return df
+
+        return self._merge_klines(key, df, klines)
+
+    def _merge_klines(
+        self, key: Tuple[str, str], df: pd.DataFrame, klines: List[list]
+    ) -> pd.DataFrame:
+        """Replaces buffered klines by newer versions, appends new ones and evicts the oldest."""
+        symbol, interval = key
+        kline_store = self._stores.get(key)
+        rows = klines_to_array(klines)
+        if kline_store is not None:
+            kline_store.write(symbol, interval, rows[rows[:, 6] < get_server_now_ms()])
+        df_delta = array_to_df(rows)
+        df = pd.concat(
+            [df[df["open_time"] < df_delta["open_time"].iloc[0]], df_delta],
+            ignore_index=True,
+        )
+        df = df.tail(self._sizes[key]).reset_index(drop=True)
+        self._frames[key] = df
+        return df
+
+
+kline_buffer = KlineBuffer()
@@ -0,0 +1,109 @@
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+INPUT_COLUMNS = ("high", "low", "close", "volume")
+
+
+class MarketFrame:
+    """
+    Preallocated float64 matrix the indicator pipeline writes its columns into.
+
+    The float columns of the market data and every indicator column the bot needs
+    share one column-major array, so each column is a contiguous view TA-Lib reads
+    without a copy and assigning a column overwrites its preallocated slot instead
+    of adding a block to a DataFrame. The frame supports the parts of the DataFrame
+    interface the `calculate_ta_*` functions use: `frame[column]` returns the column
+    as a NumPy view, `frame[column] = values` writes into it, `column in frame` and
+    `len(frame)`. The other columns of the source DataFrame, e.g. the candle times,
+    are readable but not writable.
+
+    `to_df` wraps the matrix in a DataFrame without copying it, dropping incomplete
+    rows with one mask over the matrix instead of a `dropna` over the whole
+    DataFrame. Incomplete rows are usually just the warm-up rows at the start,
+    which are sliced off without copying either.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Iterable[str]):
+        """
+        Args:
+            df (pandas.DataFrame): The prepared market data with numeric high, low, close and volume.
+            columns (iterable): The indicator columns to preallocate.
+        """
+        market_columns = [
+            column
+            for column in df.columns
+            if column in INPUT_COLUMNS or df[column].dtype == np.float64
+        ]
+        self.df = df.drop(columns=market_columns)
+        self.columns: List[str] = market_columns + [
+            column for column in columns if column not in market_columns
+        ]
+        self.column_index: Dict[str, int] = {
+            column: position for position, column in enumerate(self.columns)
+        }
+        self.values = np.empty((len(df), len(self.columns)), order="F")
+        self.values[:, len(market_columns):] = np.nan
+        for position, column in enumerate(market_columns):
+            self.values[:, position] = df[column].to_numpy(dtype=np.float64)
+        self._written = set(market_columns)
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._written or column in self.df.columns
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        position = self.column_index.get(column)
+        if position is None:
+            return self.df[column].to_numpy()
+        if column not in self._written:
+            raise KeyError(column)
+        return self.values[:, position]
+
+    def __setitem__(self, column: str, values) -> None:
+        position = self.column_index.get(column)
+        if position is None:
+            raise KeyError(f"Column {column} is not preallocated in the market frame.")
+        self.values[:, position] = values
+        self._written.add(column)
+
+    def to_df(self, columns_to_check: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Returns the market data with the written indicator columns as a DataFrame.
+
+        The other columns of the source DataFrame come first, followed by its float
+        columns and the indicator columns in the order they were preallocated.
+
+        Args:
+            columns_to_check (list, optional): Rows with a missing value in any of these
+                columns are dropped, like `handle_ta_df_final_cleaning` does.
+
+        Returns:
+            pandas.DataFrame: The market data with the indicator columns.
+        """
+        written_columns = [column for column in self.columns if column in self._written]
+        if len(written_columns) == len(self.columns):
+            block = self.values
+        else:
+            block = self.values[:, [self.column_index[column] for column in written_columns]]
+        df = self.df
+
+        checked = [
+            self.column_index[column]
+            for column in columns_to_check or ()
+            if column in self._written
+        ]
+        if checked:
+            complete = ~np.isnan(self.values[:, checked]).any(axis=1)
+            first_complete = int(complete.argmax()) if complete.any() else len(complete)
+            if complete[first_complete:].all():
+                block = block[first_complete:]
+                df = df.iloc[first_complete:]
+            else:
+                block = block[complete]
+                df = df[complete]
+
+        values_df = pd.DataFrame(block, index=df.index, columns=written_columns, copy=False)
+        return pd.concat([df, values_df], axis=1, copy=False)
@@ -0,0 +1,289 @@
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from binance import ThreadedWebsocketManager
+from ..models import BotSettings
+from ..utils.logging import logger
+from ..utils.exception_handlers import exception_handler
+from ..utils.app_utils import get_config_value
+from .market_data import KlineBuffer, kline_buffer
+
+KlineEventCallback = Callable[[dict], None]
+
+
+def kline_event_to_kline(event: dict) -> Tuple[str, str, list, bool]:
+    """
+    Converts a Binance kline stream event into a raw kline.
+
+    Args:
+        event (dict): The kline event, e.g. {'e': 'kline', 's': 'BTCUSDC', 'k': {...}}.
+
+    Returns:
+        tuple: The symbol, the interval, the raw kline in the format of the Binance
+               klines API and whether the kline is closed.
+    """
+    k = event["k"]
+    kline = [
+        k["t"],
+        k["o"],
+        k["h"],
+        k["l"],
+        k["c"],
+        k["v"],
+        k["T"],
+        k["q"],
+        k["n"],
+        k["V"],
+        k["Q"],
+        "0",
+    ]
+    return k["s"], k["i"], kline, bool(k["x"])
+
+
+class BinanceKlineSource:
+    """
+    Kline source pushing events of the Binance kline websocket streams.
+
+    Every subscribed (symbol, interval) is one websocket stream of a
+    ThreadedWebsocketManager. Streams subscribed before `start` are opened when
+    the manager is started.
+    """
+
+    def __init__(self):
+        """Creates the source and its websocket manager, which is started by `start`."""
+        self._manager = ThreadedWebsocketManager()
+        self._on_event: Optional[KlineEventCallback] = None
+        self._streams: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def start(self, on_event: KlineEventCallback) -> None:
+        """Starts the websocket manager and opens the subscribed streams. Events are passed to `on_event`."""
+        self._on_event = on_event
+        self._manager.start()
+        for symbol, interval in list(self._streams):
+            self._open_stream(symbol, interval)
+
+    def subscribe(self, symbol: str, interval: str) -> None:
+        """Opens the kline stream of the given symbol and interval, on `start` if not started yet."""
+        if (symbol, interval) not in self._streams:
+            self._streams[(symbol, interval)] = None
+            if self._on_event:
+                self._open_stream(symbol, interval)
+
+    def unsubscribe(self, symbol: str, interval: str) -> None:
+        """Closes the kline stream of the given symbol and interval."""
+        stream_name = self._streams.pop((symbol, interval), None)
+        if stream_name:
+            self._manager.stop_socket(stream_name)
+
+    def stop(self) -> None:
+        """Closes all streams and stops the websocket manager."""
+        if self._on_event:
+            self._manager.stop()
+        self._streams.clear()
+
+    def _open_stream(self, symbol: str, interval: str) -> None:
+        """Opens the websocket stream of a subscribed symbol and interval."""
+        self._streams[(symbol, interval)] = self._manager.start_kline_socket(
+            callback=self._on_event, symbol=symbol, interval=interval
+        )
+
+
+class ReplayKlineSource:
+    """
+    Kline source replaying kline events recorded in a JSON lines file.
+
+    Every line of the file is one event in the format of the Binance kline stream.
+    Events of (symbol, interval) pairs that are not subscribed are skipped. Used to
+    drive the stream service in tests and benchmarks without network access.
+
+    Attributes:
+        path (str): The path of the recorded events file.
+        delay (float): Seconds to wait between two events.
+        finished (threading.Event): Set once all events have been replayed.
+    """
+
+    def __init__(self, path: str, delay: float = 0.0):
+        """
+        Creates the source.
+
+        Args:
+            path (str): The path of the recorded events file.
+            delay (float, optional): Seconds to wait between two events. Default is 0.
+        """
+        self.path = path
+        self.delay = delay
+        self.finished = threading.Event()
+        self._subscribed: Set[Tuple[str, str]] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, on_event: KlineEventCallback) -> None:
+        """Starts replaying events in a background thread. Events are passed to `on_event`."""
+        self._thread = threading.Thread(
+            target=self._replay, args=(on_event,), name="stefan-replay", daemon=True
+        )
+        self._thread.start()
+
+    def subscribe(self, symbol: str, interval: str) -> None:
+        """Replays the events of the given symbol and interval."""
+        self._subscribed.add((symbol, interval))
+
+    def unsubscribe(self, symbol: str, interval: str) -> None:
+        """Skips the events of the given symbol and interval."""
+        self._subscribed.discard((symbol, interval))
+
+    def stop(self) -> None:
+        """Stops replaying and waits for the replay thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _replay(self, on_event: KlineEventCallback) -> None:
+        """Reads the recorded events and passes the subscribed ones to `on_event`."""
+        with open(self.path) as file:
+            for line in file:
+                if self._stop.is_set():
+                    break
+                if not line.strip():
+                    continue
+
+                event = json.loads(line)
+                kline = event.get("k", {})
+                if (kline.get("s"), kline.get("i")) not in self._subscribed:
+                    continue
+
+                on_event(event)
+                if self.delay:
+                    time.sleep(self.delay)
+        self.finished.set()
+
+
+class MarketStreamService:
+    """
+    Streaming market data ingestion for all active (symbol, interval) pairs.
+
+    Kline events of a pluggable source (Binance websockets or a recorded replay) are
+    pushed into a KlineBuffer. While the pushed klines are current, bots read their
+    market data from memory instead of requesting it from the exchange.
+
+    Attributes:
+        source: The kline source, e.g. BinanceKlineSource or ReplayKlineSource.
+        buffer (KlineBuffer): The buffer receiving the klines.
+        streams (set): The subscribed (symbol, interval) pairs.
+        event_count (int): Number of kline events received.
+        merged_count (int): Number of kline events merged into the buffer.
+    """
+
+    def __init__(self, source, buffer: KlineBuffer = kline_buffer):
+        """
+        Creates the service.
+
+        Args:
+            source: The kline source providing `start`, `subscribe`, `unsubscribe` and `stop`.
+            buffer (KlineBuffer, optional): The buffer receiving the klines. Defaults to `kline_buffer`.
+        """
+        self.source = source
+        self.buffer = buffer
+        self.streams: Set[Tuple[str, str]] = set()
+        self.event_count = 0
+        self.merged_count = 0
+        self._lock = threading.Lock()
+
+    def start(self, streams: Iterable[Tuple[str, str]]) -> None:
+        """
+        Subscribes the given streams and starts the source.
+
+        The streams are subscribed first, so the source does not skip events of
+        the streams before they are subscribed.
+
+        Args:
+            streams (iterable): The (symbol, interval) pairs to subscribe.
+        """
+        self.update_streams(streams)
+        self.source.start(self.handle_event)
+        logger.info(
+            f"Market stream started with {type(self.source).__name__} for {len(self.streams)} streams."
+        )
+
+    def update_streams(self, streams: Iterable[Tuple[str, str]]) -> None:
+        """
+        Subscribes new streams and unsubscribes streams that are no longer active.
+
+        Args:
+            streams (iterable): The (symbol, interval) pairs that should be subscribed.
+        """
+        streams = set(streams)
+        with self._lock:
+            for symbol, interval in self.streams - streams:
+                self.source.unsubscribe(symbol, interval)
+            for symbol, interval in streams - self.streams:
+                self.source.subscribe(symbol, interval)
+            self.streams = streams
+
+    def stop(self) -> None:
+        """Stops the source."""
+        self.source.stop()
+        logger.info(
+            f"Market stream stopped. {self.event_count} events received, {self.merged_count} merged."
+        )
+
+    def handle_event(self, event: dict) -> None:
+        """
+        Pushes a kline event into the buffer. Error events are logged.
+
+        Args:
+            event (dict): The stream event.
+        """
+        if event.get("e") != "kline":
+            logger.error(f"Market stream event error: {event}")
+            return
+
+        symbol, interval, kline, closed = kline_event_to_kline(event)
+        self.event_count += 1
+        if self.buffer.push(symbol, interval, [kline], closed):
+            self.merged_count += 1
+
+
+market_stream_service: Optional[MarketStreamService] = None
+
+
+def get_active_streams() -> List[Tuple[str, str]]:
+    """
+    Returns the (symbol, interval) pairs of all running bots.
+
+    Returns:
+        list: The sorted (symbol, interval) pairs.
+    """
+    bots = BotSettings.query.filter(BotSettings.bot_running.is_(True)).all()
+    return sorted({(bot.symbol, bot.interval) for bot in bots})
+
+
+@exception_handler()
+def start_market_stream() -> Optional[MarketStreamService]:
+    """
+    Starts the market stream service for the streams of all running bots.
+
+    The source is selected with `MARKET_STREAM_SOURCE`: 'binance' for websocket
+    streams or 'replay' to replay `MARKET_STREAM_REPLAY_FILE`.
+
+    Returns:
+        MarketStreamService: The started service.
+    """
+    global market_stream_service
+
+    if get_config_value("MARKET_STREAM_SOURCE", "binance") == "replay":
+        source = ReplayKlineSource(get_config_value("MARKET_STREAM_REPLAY_FILE"))
+    else:
+        source = BinanceKlineSource()
+
+    market_stream_service = MarketStreamService(source)
+    market_stream_service.start(get_active_streams())
+    return market_stream_service
+
+
+@exception_handler()
+def refresh_market_streams() -> None:
+    """Updates the streams of the market stream service to the currently running bots."""
+    if market_stream_service:
+        market_stream_service.update_streams(get_active_streams())
@@ -0,0 +1,305 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Optional, Union
+from ..utils.logging import logger
+
+REQUEST_WEIGHT_LIMIT = 6000
+REQUEST_WEIGHT_WINDOW_MS = 60_000
+USED_WEIGHT_HEADER = "x-mbx-used-weight-1m"
+
+PRIORITY_TRADING = 0
+PRIORITY_MARKET_DATA = 1
+PRIORITY_LOW = 2
+PRIORITY_BULK = 3
+
+PRIORITY_NAMES = {
+    PRIORITY_TRADING: "trading",
+    PRIORITY_MARKET_DATA: "market_data",
+    PRIORITY_LOW: "low",
+    PRIORITY_BULK: "bulk",
+}
+
+PRIORITY_BUDGET_SHARES = {
+    PRIORITY_TRADING: 1.0,
+    PRIORITY_MARKET_DATA: 0.9,
+    PRIORITY_LOW: 0.7,
+    PRIORITY_BULK: 0.5,
+}
+
+ENDPOINT_WEIGHTS = {
+    "klines": 2,
+    "ticker/price": 2,
+    "avgPrice": 2,
+    "account": 20,
+    "exchangeInfo": 20,
+    "order": 1,
+    "time": 1,
+    "ping": 1,
+    "system/status": 1,
+}
+DEFAULT_ENDPOINT_WEIGHT = 1
+BAN_RETRY_AFTER_S = {429: 60, 418: 120}
+
+_priority_context = threading.local()
+
+
+class RequestShedError(Exception):
+    """Raised when a Binance request is dropped to protect the request weight budget."""
+
+
+def get_request_priority() -> int:
+    """Returns the request priority of the current thread. Defaults to market data."""
+    return getattr(_priority_context, "priority", PRIORITY_MARKET_DATA)
+
+
+@contextmanager
+def request_priority_scope(priority: int):
+    """
+    Runs the Binance requests of the block with the given priority.
+
+    Args:
+        priority (int): One of PRIORITY_TRADING, PRIORITY_MARKET_DATA, PRIORITY_LOW or PRIORITY_BULK.
+    """
+    previous_priority = getattr(_priority_context, "priority", None)
+    _priority_context.priority = priority
+    try:
+        yield
+    finally:
+        if previous_priority is None:
+            del _priority_context.priority
+        else:
+            _priority_context.priority = previous_priority
+
+
+def request_priority(priority: int):
+    """
+    A decorator running all Binance requests of the decorated function with the given priority.
+
+    Nested decorated functions keep the priority of their outermost caller only if it is
+    higher (a lower number), so trading calls are never demoted by helpers they use.
+
+    Args:
+        priority (int): One of PRIORITY_TRADING, PRIORITY_MARKET_DATA, PRIORITY_LOW or PRIORITY_BULK.
+    """
+
+    def request_priority_decorator(func):
+        @wraps(func)
+        def request_priority_wrapper(*args, **kwargs):
+            current_priority = getattr(_priority_context, "priority", priority)
+            with request_priority_scope(min(priority, current_priority)):
+                return func(*args, **kwargs)
+
+        return request_priority_wrapper
+
+    return request_priority_decorator
+
+
+def get_endpoint(uri: str) -> str:
+    """
+    Returns the endpoint name of a Binance REST API URI.
+
+    Args:
+        uri (str): The request URI, e.g. 'https://api.binance.com/api/v3/klines'.
+
+    Returns:
+        str: The endpoint, e.g. 'klines' or 'ticker/price'.
+    """
+    path = uri.split("?", 1)[0]
+    for marker in ("/api/v3/", "/api/v1/", "/sapi/v1/"):
+        if marker in path:
+            return path.split(marker, 1)[1]
+    return path.rsplit("/", 1)[-1]
+
+
+def get_endpoint_weight(endpoint: str, params: Optional[dict] = None) -> int:
+    """
+    Returns the request weight of a Binance endpoint.
+
+    Args:
+        endpoint (str): The endpoint name as returned by `get_endpoint`.
+        params (dict, optional): The request parameters.
+
+    Returns:
+        int: The request weight.
+    """
+    if endpoint == "ticker/price" and not (params or {}).get("symbol"):
+        return 4
+    return ENDPOINT_WEIGHTS.get(endpoint, DEFAULT_ENDPOINT_WEIGHT)
+
+
+class RateGovernor:
+    """
+    Central request weight governor for all Binance REST calls.
+
+    Binance limits the request weight per IP in fixed one-minute windows. The governor
+    accounts the weight of every request, syncs it with the weight reported by the
+    exchange and reserves the top of the budget for trading calls: low priority calls
+    (panel status refreshes) are shed once their share of the budget is used, market
+    data and trading calls wait for the next window. Bulk downloads wait as well, but
+    may only use half of the budget. After a 429 or 418 response all calls are held
+    back until the ban is over.
+
+    Attributes:
+        limit (int): The request weight limit per window.
+        max_wait (float): Seconds a call may wait for budget before it is shed.
+    """
+
+    def __init__(self, limit: int = REQUEST_WEIGHT_LIMIT, max_wait: float = 65.0):
+        """
+        Creates the governor.
+
+        Args:
+            limit (int, optional): The request weight limit per window. Default is 6000.
+            max_wait (float, optional): Seconds a call may wait for budget. Default is 65.
+        """
+        self.limit = limit
+        self.max_wait = max_wait
+        self.window_start_ms = 0
+        self.used_weight = 0
+        self.banned_until_ms = 0.0
+        self.weight_by_endpoint: Dict[str, int] = {}
+        self.requests = 0
+        self.waited = 0
+        self.shed = 0
+        self.bans = 0
+        self._condition = threading.Condition()
+
+    def _roll_window(self, now_ms: float) -> None:
+        """Starts a new window if the current one has passed. Must hold the lock."""
+        window_start_ms = int(now_ms // REQUEST_WEIGHT_WINDOW_MS * REQUEST_WEIGHT_WINDOW_MS)
+        if window_start_ms != self.window_start_ms:
+            if self.used_weight:
+                logger.info(
+                    f"RateGovernor used weight {self.used_weight}/{self.limit} in the last window. "
+                    f"Waited {self.waited}, shed {self.shed}."
+                )
+            self.window_start_ms = window_start_ms
+            self.used_weight = 0
+            self.weight_by_endpoint = {}
+
+    def acquire(self, endpoint: str, weight: int, priority: Optional[int] = None) -> None:
+        """
+        Reserves the request weight of a call, waiting for budget if needed.
+
+        Args:
+            endpoint (str): The endpoint name.
+            weight (int): The request weight of the call.
+            priority (int, optional): The request priority. Defaults to the priority of the thread.
+
+        Raises:
+            RequestShedError: If the call is dropped to protect the budget.
+        """
+        priority = get_request_priority() if priority is None else priority
+        budget = self.limit * PRIORITY_BUDGET_SHARES.get(priority, 1.0)
+        deadline = time.monotonic() + self.max_wait
+
+        with self._condition:
+            while True:
+                now_ms = time.time() * 1000
+                self._roll_window(now_ms)
+
+                if now_ms < self.banned_until_ms:
+                    wait_s = (self.banned_until_ms - now_ms) / 1000
+                elif self.used_weight + weight <= budget:
+                    break
+                else:
+                    wait_s = (self.window_start_ms + REQUEST_WEIGHT_WINDOW_MS - now_ms) / 1000
+
+                if priority == PRIORITY_LOW or time.monotonic() + wait_s > deadline:
+                    self.shed += 1
+                    raise RequestShedError(
+                        f"Binance {PRIORITY_NAMES.get(priority, priority)} request {endpoint} shed. "
+                        f"Used weight {self.used_weight}/{self.limit}."
+                    )
+
+                self.waited += 1
+                logger.warning(
+                    f"RateGovernor {endpoint} waiting {wait_s:.1f}s for request weight budget. "
+                    f"Used weight {self.used_weight}/{self.limit}."
+                )
+                self._condition.wait(timeout=wait_s + 0.05)
+
+            self.used_weight += weight
+            self.requests += 1
+            self.weight_by_endpoint[endpoint] = self.weight_by_endpoint.get(endpoint, 0) + weight
+
+    def update_from_response(self, response) -> None:
+        """
+        Syncs the used weight with the exchange and registers bans of 429 and 418 responses.
+
+        Args:
+            response (requests.Response): The response of a Binance request.
+        """
+        headers = getattr(response, "headers", None) or {}
+        used_weight = headers.get(USED_WEIGHT_HEADER)
+        status_code = getattr(response, "status_code", 200)
+
+        with self._condition:
+            self._roll_window(time.time() * 1000)
+            if used_weight is not None:
+                self.used_weight = max(self.used_weight, int(used_weight))
+
+            if status_code in BAN_RETRY_AFTER_S:
+                retry_after_s = int(headers.get("Retry-After", BAN_RETRY_AFTER_S[status_code]))
+                self.banned_until_ms = max(
+                    self.banned_until_ms, time.time() * 1000 + retry_after_s * 1000
+                )
+                self.bans += 1
+                logger.error(
+                    f"RateGovernor Binance returned {status_code}. Requests held back for {retry_after_s}s."
+                )
+
+    def install(self, client) -> None:
+        """
+        Routes all REST requests of a Binance client through the governor.
+
+        Args:
+            client (binance.client.Client): The client to govern.
+        """
+        request = client._request
+        handle_response = client._handle_response
+
+        def governed_request(method, uri, signed, force_params=False, **kwargs):
+            endpoint = get_endpoint(uri)
+            params = kwargs.get("data") or kwargs.get("params")
+            self.acquire(endpoint, get_endpoint_weight(endpoint, params))
+            return request(method, uri, signed, force_params, **kwargs)
+
+        def governed_handle_response(response):
+            self.update_from_response(response)
+            return handle_response(response)
+
+        client._request = governed_request
+        client._handle_response = governed_handle_response
+
+    def get_usage(self) -> Dict[str, Union[int, float, dict]]:
+        """
+        Returns the current request weight usage.
+
+        Returns:
+            dict: The used weight and limit of the current window, the usage in percent,
+                  the weight per endpoint and the request, wait, shed and ban counters.
+        """
+        with self._condition:
+            self._roll_window(time.time() * 1000)
+            return {
+                "used_weight": self.used_weight,
+                "limit": self.limit,
+                "usage_pct": round(100 * self.used_weight / self.limit, 2),
+                "weight_by_endpoint": dict(self.weight_by_endpoint),
+                "requests": self.requests,
+                "waited": self.waited,
+                "shed": self.shed,
+                "bans": self.bans,
+                "banned": time.time() * 1000 < self.banned_until_ms,
+            }
+
+
+rate_governor = RateGovernor()
+
+
+def get_rate_usage() -> Dict[str, Union[int, float, dict]]:
+    """Returns the current request weight usage of the process-wide rate governor."""
+    return rate_governor.get_usage()
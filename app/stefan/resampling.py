@@ -0,0 +1,105 @@
+import numpy as np
+from typing import Optional
+from binance.helpers import interval_to_milliseconds
+
+DAY_MS = 86_400_000
+WEEK_OFFSET_MS = 4 * DAY_MS
+
+
+def get_interval_offset_ms(interval: str) -> Optional[int]:
+    """
+    Returns the offset of the interval's candle boundaries from the Unix epoch.
+
+    Binance aligns minute, hour and day candles to the epoch in UTC and weekly candles
+    to Monday 00:00 UTC. Monthly candles follow the calendar and cannot be resampled.
+
+    Args:
+        interval (str): The klines interval, e.g. '5m' or '1w'.
+
+    Returns:
+        int or None: The offset in milliseconds, or None if the interval is not supported.
+    """
+    unit = interval[-1]
+    if unit in ("m", "h", "d"):
+        return 0
+    if unit == "w":
+        return WEEK_OFFSET_MS
+    return None
+
+
+def can_resample(base_interval: str, target_interval: str) -> bool:
+    """
+    Checks whether klines of the target interval can be derived from the base interval.
+
+    Args:
+        base_interval (str): The interval of the available klines, e.g. '1m'.
+        target_interval (str): The requested interval, e.g. '15m'.
+
+    Returns:
+        bool: True if the target interval is a multiple of the base interval with epoch aligned boundaries.
+    """
+    if get_interval_offset_ms(target_interval) is None or base_interval[-1] not in ("m", "h", "d"):
+        return False
+    base_ms = interval_to_milliseconds(base_interval)
+    target_ms = interval_to_milliseconds(target_interval)
+    return target_ms > base_ms and target_ms % base_ms == 0
+
+
+def resample_klines(
+    rows: np.ndarray, base_interval: str, target_interval: str
+) -> Optional[np.ndarray]:
+    """
+    Derives klines of a higher interval from sorted klines of a base interval.
+
+    Every target candle aggregates the base candles between its Binance boundaries:
+    the first open, the highest high, the lowest low, the last close and the sums of
+    the volumes and trades. The close time is the end of the target candle, as reported
+    by Binance for closed and open candles. A leading target candle not fully covered by
+    the base klines is dropped. The last target candle may be partial, it is the open
+    candle if the base klines end with the open base candle.
+
+    Args:
+        rows (numpy.ndarray): Base klines as an Nx11 float64 array in `KLINE_FIELDS` order.
+        base_interval (str): The interval of the base klines, e.g. '1m'.
+        target_interval (str): The requested interval, e.g. '15m'.
+
+    Returns:
+        numpy.ndarray or None: The target klines in the same layout, or None if the base
+                               klines have a gap inside a target candle.
+
+    Raises:
+        ValueError: If the target interval cannot be resampled from the base interval.
+    """
+    if not can_resample(base_interval, target_interval):
+        raise ValueError(f"Cannot resample {base_interval} klines to {target_interval}.")
+
+    if len(rows) == 0:
+        return rows[:0].copy()
+
+    target_ms = interval_to_milliseconds(target_interval)
+    offset_ms = get_interval_offset_ms(target_interval)
+    base_candles = target_ms // interval_to_milliseconds(base_interval)
+
+    open_times = rows[:, 0].astype(np.int64)
+    buckets = (open_times - offset_ms) // target_ms * target_ms + offset_ms
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    counts = np.diff(np.concatenate((starts, [len(rows)])))
+
+    if counts[0] < base_candles:
+        starts, counts = starts[1:], counts[1:]
+    if len(starts) == 0:
+        return rows[:0].copy()
+    if np.any(counts[:-1] != base_candles):
+        return None
+
+    ends = starts + counts
+    resampled = np.empty((len(starts), rows.shape[1]), dtype=rows.dtype)
+    resampled[:, 0] = buckets[starts]
+    resampled[:, 1] = rows[starts, 1]
+    resampled[:, 2] = np.maximum.reduceat(rows[:, 2], starts)
+    resampled[:, 3] = np.minimum.reduceat(rows[:, 3], starts)
+    resampled[:, 4] = rows[ends - 1, 4]
+    resampled[:, 6] = resampled[:, 0] + target_ms - 1
+    for column in (5, 7, 8, 9, 10):
+        resampled[:, column] = np.add.reduceat(rows[:, column], starts)
+    return resampled
@@ -0,0 +1,380 @@
+import time
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Union
+from apscheduler.events import JobEvent, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
+from apscheduler.schedulers.base import BaseScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+from binance.helpers import interval_to_milliseconds
+from ..utils.logging import logger
+from ..utils.exception_handlers import exception_handler
+
+DECISION_LATENCY_HISTORY = 100
+REALIGN_THRESHOLD_MS = 100
+
+TRADING_BOTS_TICK_JOB_ID = "trading_bots_tick"
+
+clock_offset_ms = 0.0
+decision_latencies: Dict[int, deque] = {}
+order_latencies: Dict[int, deque] = {}
+_latencies_lock = threading.Lock()
+sweep_stats = {
+    "sweeps": 0,
+    "overruns": 0,
+    "skipped": 0,
+    "missed": 0,
+    "last_duration_ms": 0.0,
+    "max_duration_ms": 0.0,
+}
+_sweep_stats_lock = threading.Lock()
+
+
+@exception_handler(default_return=0.0)
+def measure_clock_offset() -> float:
+    """
+    Measures the offset between the Binance server clock and the local clock.
+
+    The offset is the server time minus the local time at the midpoint of the
+    request, so the network round trip does not bias the result. The measured
+    value is stored in the module-level `clock_offset_ms`.
+
+    Returns:
+        float: The clock offset in milliseconds (positive if the server clock is ahead).
+    """
+    from .api_utils import fetch_server_time
+
+    global clock_offset_ms
+
+    local_before_ms = time.time() * 1000
+    server_time = fetch_server_time()
+    local_after_ms = time.time() * 1000
+
+    if not server_time or "serverTime" not in server_time:
+        logger.warning("measure_clock_offset server time not available. Offset unchanged.")
+        return clock_offset_ms
+
+    local_midpoint_ms = (local_before_ms + local_after_ms) / 2
+    clock_offset_ms = float(server_time["serverTime"]) - local_midpoint_ms
+    logger.info(
+        f"Binance clock offset measured: {clock_offset_ms:.1f} ms, round trip {local_after_ms - local_before_ms:.1f} ms."
+    )
+    return clock_offset_ms
+
+
+def get_server_now_ms() -> float:
+    """Returns the current Binance server time in milliseconds, based on the measured clock offset."""
+    return time.time() * 1000 + clock_offset_ms
+
+
+def get_last_candle_close_ms(interval: str, server_now_ms: Optional[float] = None) -> int:
+    """
+    Returns the server time of the most recent candle close for the given interval.
+
+    Binance candles of all intervals up to '1d' are aligned to the Unix epoch in UTC,
+    so a candle closes whenever the server time is a multiple of the interval length.
+
+    Args:
+        interval (str): The klines interval, e.g. '1m' or '4h'.
+        server_now_ms (float, optional): The server time to use. Defaults to now.
+
+    Returns:
+        int: The server timestamp of the last candle close in milliseconds.
+    """
+    if server_now_ms is None:
+        server_now_ms = get_server_now_ms()
+    interval_ms = interval_to_milliseconds(interval)
+    return int(server_now_ms // interval_ms) * interval_ms
+
+
+def get_next_candle_close_ms(interval: str, server_now_ms: Optional[float] = None) -> int:
+    """
+    Returns the server time of the next candle close for the given interval.
+
+    Args:
+        interval (str): The klines interval, e.g. '1m' or '4h'.
+        server_now_ms (float, optional): The server time to use. Defaults to now.
+
+    Returns:
+        int: The server timestamp of the next candle close in milliseconds.
+    """
+    return get_last_candle_close_ms(interval, server_now_ms) + interval_to_milliseconds(
+        interval
+    )
+
+
+def get_candle_close_trigger(interval: str, delay_ms: int) -> IntervalTrigger:
+    """
+    Builds an APScheduler trigger firing `delay_ms` after every candle close.
+
+    The trigger's start date is the next candle close in server time, converted to
+    the local clock with the measured clock offset, plus the delay. An interval
+    trigger fires at fixed multiples of its start date, so the jobs stay aligned to
+    candle boundaries instead of drifting from the moment the scheduler started.
+
+    Args:
+        interval (str): The klines interval, e.g. '1m' or '4h'.
+        delay_ms (int): Delay after the candle close in milliseconds.
+
+    Returns:
+        IntervalTrigger: The aligned trigger.
+    """
+    interval_ms = interval_to_milliseconds(interval)
+    local_fire_ms = get_next_candle_close_ms(interval) - clock_offset_ms + delay_ms
+    start_date = datetime.fromtimestamp(local_fire_ms / 1000, tz=timezone.utc)
+    return IntervalTrigger(seconds=interval_ms / 1000, start_date=start_date, timezone=timezone.utc)
+
+
+def add_trading_bots_job(
+    scheduler: BaseScheduler,
+    interval: str,
+    func: Callable,
+    scheduler_mode: str = "interval",
+    delay_ms: int = 300,
+    misfire_grace_time: int = 30,
+    job_id: Optional[str] = None,
+) -> None:
+    """
+    Registers a scheduler job running trading bots every interval.
+
+    The job never overlaps with itself (`max_instances=1`), runs once if several
+    runs were missed (`coalesce=True`) and is dropped if it could not start within
+    `misfire_grace_time` seconds.
+
+    Args:
+        scheduler (BaseScheduler): The APScheduler instance.
+        interval (str): The klines interval of the job, e.g. '1m'.
+        func (Callable): The job function.
+        scheduler_mode (str, optional): 'interval' for free-running interval jobs,
+            'candle_close' or 'unified' for jobs aligned to the exchange candle close.
+        delay_ms (int, optional): Delay after the candle close in aligned modes.
+        misfire_grace_time (int, optional): Seconds a late job is still allowed to start.
+        job_id (str, optional): The job ID. Defaults to 'trading_bots_<interval>'.
+
+    Returns:
+        None
+    """
+    if scheduler_mode in ("candle_close", "unified"):
+        trigger = get_candle_close_trigger(interval, delay_ms)
+    else:
+        trigger = IntervalTrigger(seconds=interval_to_milliseconds(interval) / 1000)
+
+    scheduler.add_job(
+        func=func,
+        trigger=trigger,
+        id=job_id or f"trading_bots_{interval}",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=misfire_grace_time,
+    )
+    logger.info(
+        f"Scheduled {job_id or interval} trading bots job in {scheduler_mode} mode. Next run: {trigger.start_date}"
+    )
+
+
+@exception_handler()
+def realign_candle_close_jobs(
+    scheduler: BaseScheduler, jobs: Dict[str, str], delay_ms: int = 300
+) -> None:
+    """
+    Measures the clock offset again and realigns candle close jobs if it drifted.
+
+    Args:
+        scheduler (BaseScheduler): The APScheduler instance.
+        jobs (dict): Job IDs of the aligned trading bots jobs mapped to their interval.
+        delay_ms (int, optional): Delay after the candle close in milliseconds.
+
+    Returns:
+        None
+    """
+    previous_offset_ms = clock_offset_ms
+    measure_clock_offset()
+
+    if abs(clock_offset_ms - previous_offset_ms) < REALIGN_THRESHOLD_MS:
+        return
+
+    for job_id, interval in jobs.items():
+        scheduler.reschedule_job(
+            job_id, trigger=get_candle_close_trigger(interval, delay_ms)
+        )
+    logger.info(
+        f"Candle close jobs realigned. Clock offset changed from {previous_offset_ms:.1f} ms to {clock_offset_ms:.1f} ms."
+    )
+
+
+def get_due_intervals(intervals: List[str], boundary_ms: int) -> List[str]:
+    """
+    Returns the intervals whose candle closes at the given boundary.
+
+    Args:
+        intervals (list): The intervals to check, e.g. ['1m', '3m', '5m'].
+        boundary_ms (int): The candle close server timestamp in milliseconds.
+
+    Returns:
+        list: The due intervals, in the order given.
+    """
+    return [
+        interval
+        for interval in intervals
+        if boundary_ms % interval_to_milliseconds(interval) == 0
+    ]
+
+
+def record_sweep_duration(
+    due_intervals: List[str], duration_ms: float, tick_interval: str
+) -> bool:
+    """
+    Records the duration of a unified sweep and detects overruns.
+
+    A sweep overruns when it takes longer than the tick interval, which means the
+    next tick could not start on time.
+
+    Args:
+        due_intervals (list): The intervals run in the sweep.
+        duration_ms (float): The sweep duration in milliseconds.
+        tick_interval (str): The interval between two ticks, e.g. '1m'.
+
+    Returns:
+        bool: True if the sweep overran the tick interval.
+    """
+    overrun = duration_ms > interval_to_milliseconds(tick_interval)
+
+    with _sweep_stats_lock:
+        sweep_stats["sweeps"] += 1
+        sweep_stats["last_duration_ms"] = duration_ms
+        sweep_stats["max_duration_ms"] = max(sweep_stats["max_duration_ms"], duration_ms)
+        if overrun:
+            sweep_stats["overruns"] += 1
+        overruns = sweep_stats["overruns"]
+        sweeps = sweep_stats["sweeps"]
+
+    if overrun:
+        logger.warning(
+            f"Sweep {'+'.join(due_intervals)} overran the {tick_interval} tick: {duration_ms:.0f} ms. Overruns: {overruns}/{sweeps}."
+        )
+    else:
+        logger.trade(f"Sweep {'+'.join(due_intervals)} took {duration_ms:.0f} ms.")
+    return overrun
+
+
+def handle_trading_bots_job_event(event: JobEvent) -> None:
+    """
+    Scheduler listener counting trading bots job runs that were skipped or missed.
+
+    A run is skipped when the previous run is still in progress (max instances
+    reached) and missed when it could not start within the misfire grace time.
+
+    Args:
+        event (JobEvent): The APScheduler event.
+
+    Returns:
+        None
+    """
+    if not str(event.job_id).startswith("trading_bots_"):
+        return
+
+    stat = "skipped" if event.code == EVENT_JOB_MAX_INSTANCES else "missed"
+    with _sweep_stats_lock:
+        sweep_stats[stat] += 1
+        count = sweep_stats[stat]
+    logger.warning(f"Trading bots job {event.job_id} run {stat}. Total {stat}: {count}.")
+
+
+def add_trading_bots_job_listener(scheduler: BaseScheduler) -> None:
+    """Registers `handle_trading_bots_job_event` for skipped and missed job runs."""
+    scheduler.add_listener(
+        handle_trading_bots_job_event, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED
+    )
+
+
+def get_sweep_stats() -> Dict[str, Union[int, float]]:
+    """Returns a copy of the sweep statistics, including overrun, skipped and missed counts."""
+    with _sweep_stats_lock:
+        return dict(sweep_stats)
+
+
+def record_decision_latency(bot_id: int, interval: str) -> float:
+    """
+    Records the time from the last candle close to the bot's trading decision.
+
+    Args:
+        bot_id (int): The ID of the bot.
+        interval (str): The klines interval of the bot.
+
+    Returns:
+        float: The decision latency in milliseconds.
+    """
+    server_now_ms = get_server_now_ms()
+    latency_ms = server_now_ms - get_last_candle_close_ms(interval, server_now_ms)
+
+    with _latencies_lock:
+        decision_latencies.setdefault(
+            bot_id, deque(maxlen=DECISION_LATENCY_HISTORY)
+        ).append(latency_ms)
+
+    logger.trade(f"Bot {bot_id} decision latency from {interval} candle close: {latency_ms:.0f} ms.")
+    return latency_ms
+
+
+def get_decision_latency_stats() -> Dict[int, Dict[str, Union[float, int]]]:
+    """
+    Returns decision latency statistics for every bot.
+
+    Returns:
+        dict: Bot ID mapped to the last, average and maximum latency in milliseconds
+              and the number of recorded samples.
+    """
+    with _latencies_lock:
+        return {
+            bot_id: {
+                "last_ms": samples[-1],
+                "avg_ms": sum(samples) / len(samples),
+                "max_ms": max(samples),
+                "samples": len(samples),
+            }
+            for bot_id, samples in decision_latencies.items()
+            if samples
+        }
+
+
+def record_order_latency(bot_id: int, side: str, latency_ms: float) -> float:
+    """
+    Records the time from the bot's trading signal to the submission of its order.
+
+    Args:
+        bot_id (int): The ID of the bot.
+        side (str): The order side, 'buy' or 'sell'.
+        latency_ms (float): The time from the signal to the order submission in milliseconds.
+
+    Returns:
+        float: The order latency in milliseconds.
+    """
+    with _latencies_lock:
+        order_latencies.setdefault(
+            bot_id, deque(maxlen=DECISION_LATENCY_HISTORY)
+        ).append(latency_ms)
+
+    logger.trade(f"Bot {bot_id} {side} order latency from signal: {latency_ms:.0f} ms.")
+    return latency_ms
+
+
+def get_order_latency_stats() -> Dict[int, Dict[str, Union[float, int]]]:
+    """
+    Returns signal to order submission latency statistics for every bot.
+
+    Returns:
+        dict: Bot ID mapped to the last, average and maximum latency in milliseconds
+              and the number of recorded samples.
+    """
+    with _latencies_lock:
+        return {
+            bot_id: {
+                "last_ms": samples[-1],
+                "avg_ms": sum(samples) / len(samples),
+                "max_ms": max(samples),
+                "samples": len(samples),
+            }
+            for bot_id, samples in order_latencies.items()
+            if samples
+        }
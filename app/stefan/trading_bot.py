@@ -1,15 +1,60 @@
-from flask import current_app
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from flask import current_app, Flask
+from .. import db
 from ..models import BotSettings
-from typing import Optional
+from typing import Optional, List, Dict, Set
 from ..utils.logging import logger
 from ..utils.exception_handlers import exception_handler
 from ..utils.email_utils import send_admin_email
 from ..utils.bots_utils import is_bot_suspended
+from ..utils.app_utils import get_config_value
 from .logic_utils import (
     get_current_price,
     fetch_data_and_validate,
     manage_trading_logic,
 )
+from .market_data import MarketDataSweep
+from .indicator_cache import indicator_cache
+from .rate_governor import get_rate_usage
+from .warmup import get_warmup_candles
+from .scheduling import (
+    interval_to_milliseconds,
+    get_last_candle_close_ms,
+    get_due_intervals,
+    record_sweep_duration,
+)
+
+running_bot_ids: Set[int] = set()
+running_bot_ids_lock = threading.Lock()
+
+
+def claim_bot_run(bot_id: int) -> bool:
+    """
+    Marks a bot as running unless a previous run of it is still in flight.
+
+    A bot reported as timed out keeps running in its worker thread, so the next
+    sweep must not start it again and place the same orders twice.
+
+    Args:
+        bot_id (int): The ID of the bot.
+
+    Returns:
+        bool: True if the bot may run, False if it is still running.
+    """
+    with running_bot_ids_lock:
+        if bot_id in running_bot_ids:
+            logger.trade(f"Bot {bot_id} is still running from a previous sweep, skipping this run.")
+            return False
+        running_bot_ids.add(bot_id)
+        return True
+
+
+def release_bot_run(bot_id: int) -> None:
+    """Marks a bot claimed with `claim_bot_run` as no longer running."""
+    with running_bot_ids_lock:
+        running_bot_ids.discard(bot_id)
 
 
 def initial_run_all_trading_bots():
@@ -88,8 +133,7 @@ def run_selected_trading_bots(interval: str) -> Optional[int]:
     Runs selected trading bots based on the specified interval.
 
     This function queries the database for all bots configured with the given interval
-    and attempts to start each bot's trading logic if it is active and configured with the
-    necessary analysis methods. Any issues or missing configurations are logged and emailed to the admin.
+    and runs them as one sweep with `run_trading_bots_sweep`.
 
     Args:
         interval (str): The interval for the bots to run (e.g., '1m', '3m', etc.).
@@ -98,27 +142,241 @@ def run_selected_trading_bots(interval: str) -> Optional[int]:
         None
     """
     all_selected_bots = BotSettings.query.filter(BotSettings.interval == interval).all()
+    run_trading_bots_sweep(all_selected_bots, interval)
 
-    for bot_settings in all_selected_bots:
-        if bot_settings.bot_running and (
-            bot_settings.use_technical_analysis or 
-            bot_settings.use_machine_learning or 
-            bot_settings.use_gpt_analysis
-        ):
 
-            if bot_settings.bot_current_trade and bot_settings.bot_technical_analysis:
-                run_single_trading_logic(bot_settings)
-            else:
-                error_message = f"No BotCurrentTrade or BotTechnicalAnalysis found for Bot: {bot_settings.id}"
-                send_admin_email(
-                    f"Error starting bot {bot_settings.id}",
-                    f"Error starting bot {bot_settings.id}\n{error_message}",
-                )
-                logger.trade(error_message)
+@exception_handler()
+def run_due_trading_bots(intervals: List[str]) -> Optional[int]:
+    """
+    Runs all bots whose candle closed at the current tick as one coordinated sweep.
+
+    The tick is the last close of the shortest of the given intervals. All intervals
+    whose candle closes at that boundary are due (e.g. 1m, 3m, 5m and 15m at every
+    quarter hour). Bots of all due intervals are loaded in a single query and run
+    together, sharing one MarketDataSweep and one worker pool. The sweep duration
+    is recorded and reported as an overrun if it exceeds the tick interval.
+
+    Args:
+        intervals (list): All scheduled intervals, e.g. ['1m', '3m', ..., '1d'].
+
+    Returns:
+        None
+    """
+    sweep_start = time.monotonic()
+    tick_interval = min(intervals, key=interval_to_milliseconds)
+    boundary_ms = get_last_candle_close_ms(tick_interval)
+    due_intervals = get_due_intervals(intervals, boundary_ms)
+
+    all_due_bots = BotSettings.query.filter(
+        BotSettings.interval.in_(due_intervals)
+    ).all()
+    run_trading_bots_sweep(all_due_bots, "+".join(due_intervals))
+
+    record_sweep_duration(
+        due_intervals, (time.monotonic() - sweep_start) * 1000, tick_interval
+    )
+    logger.trade(f"{', '.join(due_intervals)} interval bots run completed.")
 
 
 @exception_handler()
-def run_single_trading_logic(bot_settings: BotSettings) -> Optional[int]:
+def run_trading_bots_sweep(
+    bots: List[BotSettings], sweep_name: str, require_running: bool = True
+) -> Optional[int]:
+    """
+    Runs the trading logic of the given bots as one sweep.
+
+    Each bot is checked with `is_bot_ready_to_run` first. Any issues or missing
+    configurations are logged and emailed to the admin.
+
+    Bots are run in a bounded worker pool when `BOTS_MAX_WORKERS` is greater than 1,
+    so the duration of one sweep is set by the slowest bot rather than the sum of
+    all bots. Otherwise bots are run one after another. Market data is fetched once
+    per (symbol, interval) through a shared MarketDataSweep. The indicator cache hits
+    and misses of the sweep are logged with the number of klines fetches and the
+    request weight usage of the rate governor.
+
+    Args:
+        bots (list): BotSettings of the bots to run.
+        sweep_name (str): Name of the sweep used for logging (e.g. '1m' or '1m+3m').
+        require_running (bool, optional): Skip bots that are not running. Default is True.
+
+    Returns:
+        None
+    """
+    bots_to_run = [
+        bot_settings
+        for bot_settings in bots
+        if is_bot_ready_to_run(bot_settings, require_running)
+    ]
+
+    if not bots_to_run:
+        return
+
+    market_data = MarketDataSweep(bots_to_run)
+    cache_stats = indicator_cache.get_stats()
+    max_workers = int(get_config_value("BOTS_MAX_WORKERS", 1))
+    bot_timeout = float(get_config_value("BOT_RUN_TIMEOUT", 50))
+
+    if max_workers > 1 and len(bots_to_run) > 1:
+        run_trading_bots_concurrently(
+            [bot_settings.id for bot_settings in bots_to_run],
+            max_workers,
+            bot_timeout,
+            market_data,
+        )
+    else:
+        for bot_settings in bots_to_run:
+            if not claim_bot_run(bot_settings.id):
+                continue
+            try:
+                run_single_trading_logic(bot_settings, market_data)
+            finally:
+                release_bot_run(bot_settings.id)
+
+    sweep_cache_stats = indicator_cache.get_stats()
+    rate_usage = get_rate_usage()
+    logger.trade(
+        f"{sweep_name} sweep made {market_data.fetch_count} klines fetches for {len(bots_to_run)} bots, "
+        f"indicator cache {sweep_cache_stats['hits'] - cache_stats['hits']} hits "
+        f"{sweep_cache_stats['misses'] - cache_stats['misses']} misses, "
+        f"request weight {rate_usage['used_weight']}/{rate_usage['limit']} "
+        f"({rate_usage['usage_pct']}%), {rate_usage['waited']} waited {rate_usage['shed']} shed."
+    )
+
+
+@exception_handler(default_return=False)
+def is_bot_ready_to_run(bot_settings: BotSettings, require_running: bool = True) -> bool:
+    """
+    Checks whether a bot should take part in the current interval sweep.
+
+    A bot is ready when it is running, uses at least one analysis method and has both
+    BotCurrentTrade and BotTechnicalAnalysis records. Missing records are logged and
+    emailed to the admin.
+
+    Args:
+        bot_settings (BotSettings): The settings of the bot to check.
+        require_running (bool, optional): Whether a stopped bot is not ready. Default is True.
+
+    Returns:
+        bool: True if the bot should be run, False otherwise.
+    """
+    if (require_running and not bot_settings.bot_running) or not (
+        bot_settings.use_technical_analysis
+        or bot_settings.use_machine_learning
+        or bot_settings.use_gpt_analysis
+    ):
+        return False
+
+    if bot_settings.bot_current_trade and bot_settings.bot_technical_analysis:
+        return True
+
+    error_message = f"No BotCurrentTrade or BotTechnicalAnalysis found for Bot: {bot_settings.id}"
+    send_admin_email(
+        f"Error starting bot {bot_settings.id}",
+        f"Error starting bot {bot_settings.id}\n{error_message}",
+    )
+    logger.trade(error_message)
+    return False
+
+
+@exception_handler()
+def run_trading_bots_concurrently(
+    bot_ids: List[int],
+    max_workers: int,
+    bot_timeout: float,
+    market_data: Optional[MarketDataSweep] = None,
+) -> Optional[int]:
+    """
+    Runs the trading logic of many bots in a bounded worker pool.
+
+    Each bot runs in its own worker thread with its own application context and
+    therefore its own database session. A bot that runs longer than `bot_timeout`
+    seconds is reported to the admin and no longer awaited, so one hanging bot
+    does not hold back the end of the sweep. Bots still queued when the sweep
+    ends are cancelled. A bot whose previous run is still in flight is skipped
+    (see `claim_bot_run`).
+
+    Args:
+        bot_ids (list): IDs of the bots to run.
+        max_workers (int): Maximum number of bots running at the same time.
+        bot_timeout (float): Per-bot timeout in seconds, counted from the bot's start.
+        market_data (MarketDataSweep, optional): Shared market data of the sweep.
+
+    Returns:
+        None
+    """
+    app = current_app._get_current_object()
+    started_at: Dict[int, float] = {}
+    executor = ThreadPoolExecutor(
+        max_workers=min(max_workers, len(bot_ids)), thread_name_prefix="stefan-bot"
+    )
+    futures = {
+        executor.submit(
+            run_bot_in_app_context, app, bot_id, started_at, market_data
+        ): bot_id
+        for bot_id in bot_ids
+    }
+    pending = set(futures)
+    sweep_start = time.monotonic()
+
+    try:
+        while pending:
+            _, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+
+            for future in list(pending):
+                bot_id = futures[future]
+                bot_start = started_at.get(bot_id)
+                if bot_start is not None and now - bot_start > bot_timeout:
+                    pending.discard(future)
+                    error_message = f"Bot {bot_id} run exceeded timeout of {bot_timeout}s."
+                    logger.error(error_message)
+                    send_admin_email(f"Bot {bot_id} run timeout", error_message)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.trade(
+        f"{len(bot_ids)} bots run concurrently with {max_workers} workers in {time.monotonic() - sweep_start:.2f}s."
+    )
+
+
+def run_bot_in_app_context(
+    app: Flask,
+    bot_id: int,
+    started_at: Dict[int, float],
+    market_data: Optional[MarketDataSweep] = None,
+) -> None:
+    """
+    Worker entry point running the trading logic of one bot.
+
+    BotSettings is loaded again inside the worker's application context, so the bot
+    works on its own database session instead of objects bound to the caller's session.
+    The bot is skipped if a previous run of it is still in flight.
+
+    Args:
+        app (Flask): The Flask application instance.
+        bot_id (int): The ID of the bot to run.
+        started_at (dict): Shared mapping where the worker stores its start time.
+        market_data (MarketDataSweep, optional): Shared market data of the sweep.
+
+    Returns:
+        None
+    """
+    if not claim_bot_run(bot_id):
+        return
+    try:
+        started_at[bot_id] = time.monotonic()
+        with app.app_context():
+            bot_settings = db.session.get(BotSettings, bot_id)
+            run_single_trading_logic(bot_settings, market_data)
+    finally:
+        release_bot_run(bot_id)
+
+
+@exception_handler()
+def run_single_trading_logic(
+    bot_settings: BotSettings, market_data: Optional[MarketDataSweep] = None
+) -> Optional[int]:
     """
     Runs the trading logic for a single bot based on its settings.
 
@@ -128,6 +386,8 @@ def run_single_trading_logic(bot_settings: BotSettings) -> Optional[int]:
 
     Args:
         bot_settings (BotSettings): The settings for the specific bot to run.
+        market_data (MarketDataSweep, optional): Shared market data of the current sweep.
+            If not provided, the bot fetches its market data itself.
 
     Returns:
         None
@@ -146,17 +406,19 @@ def run_single_trading_logic(bot_settings: BotSettings) -> Optional[int]:
         current_trade = bot_settings.bot_current_trade
         symbol = bot_settings.symbol
         interval = bot_settings.interval
-        lookback_period = bot_settings.lookback_period
-        lookback_extended = (
-            f"{int(bot_settings.interval[:-1]) * 205}{bot_settings.interval[-1:]}"
-        )
+        warmup_candles = get_warmup_candles(bot_settings)
 
         logger.trade(
-            f"Bot {bot_settings.id} {bot_settings.strategy} Fetching data for {symbol} with interval {interval} and lookback {lookback_period}"
-        )
-        df_fetched = fetch_data_and_validate(
-            symbol, interval, lookback_extended, bot_settings.id
+            f"Bot {bot_settings.id} {bot_settings.strategy} Fetching data for {symbol} with interval {interval} and warm-up {warmup_candles} candles"
         )
+        if market_data is not None:
+            df_fetched = market_data.get_df(
+                symbol, interval, bot_settings.id, warmup_candles
+            )
+        else:
+            df_fetched = fetch_data_and_validate(
+                symbol, interval, warmup_candles, bot_settings.id
+            )
 
         if df_fetched is None:
             return
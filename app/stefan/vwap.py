@@ -0,0 +1,103 @@
+import numpy as np
+
+DAY_MS = 86_400_000
+WEEK_MS = 7 * DAY_MS
+# 1970-01-01 was a Thursday, weekly sessions start on Monday 00:00 UTC.
+WEEK_OFFSET_MS = 4 * DAY_MS
+
+VWAP_ANCHOR_FRAME = "frame"
+VWAP_ANCHOR_ROLLING = "rolling"
+VWAP_ANCHOR_SESSION = "session"
+VWAP_ANCHOR_WEEKLY = "weekly"
+
+VWAP_ANCHOR_PERIODS = {
+    VWAP_ANCHOR_SESSION: (DAY_MS, 0),
+    VWAP_ANCHOR_WEEKLY: (WEEK_MS, WEEK_OFFSET_MS),
+}
+
+
+def get_vwap_anchor(bot_settings) -> str:
+    """
+    Returns the VWAP anchor of a bot.
+
+    'frame' is the cumulative VWAP of the fetched frame, 'rolling' the VWAP of the
+    last `vwap_timeperiod` candles, 'session' the VWAP since 00:00 UTC and 'weekly'
+    the VWAP since Monday 00:00 UTC. Unknown anchors, and 'rolling' without a
+    `vwap_timeperiod`, fall back to 'frame'.
+
+    Args:
+        bot_settings (BotSettings): The settings of the bot.
+
+    Returns:
+        str: The VWAP anchor.
+    """
+    anchor = (bot_settings.vwap_anchor or VWAP_ANCHOR_FRAME).lower()
+    if anchor == VWAP_ANCHOR_ROLLING and bot_settings.vwap_timeperiod:
+        return anchor
+    if anchor in VWAP_ANCHOR_PERIODS:
+        return anchor
+    return VWAP_ANCHOR_FRAME
+
+
+def get_vwap_anchor_ids(open_times_ms: np.ndarray, anchor: str) -> np.ndarray:
+    """
+    Returns the number of the session or week every candle belongs to.
+
+    Args:
+        open_times_ms (numpy.ndarray): The open times of the candles in milliseconds or as datetimes.
+        anchor (str): 'session' or 'weekly'.
+
+    Returns:
+        numpy.ndarray: The anchor period of every candle.
+    """
+    open_times_ms = np.asarray(open_times_ms)
+    if np.issubdtype(open_times_ms.dtype, np.datetime64):
+        open_times_ms = open_times_ms.astype("datetime64[ms]")
+    period_ms, offset_ms = VWAP_ANCHOR_PERIODS[anchor]
+    return (open_times_ms.astype(np.int64) - offset_ms) // period_ms
+
+
+def calculate_vwap(
+    open_times_ms: np.ndarray,
+    typical_price: np.ndarray,
+    volume: np.ndarray,
+    anchor: str = VWAP_ANCHOR_FRAME,
+    timeperiod: int = 0,
+) -> np.ndarray:
+    """
+    Calculates the VWAP of every candle from running sums of price x volume and volume.
+
+    The rolling VWAP of the first candles of a frame covers the available candles
+    only, and so do the session and weekly VWAPs of the first anchor period of a
+    frame that starts after the anchor. Later values don't depend on the frame.
+
+    Args:
+        open_times_ms (numpy.ndarray): The open times of the candles in milliseconds or as datetimes.
+        typical_price (numpy.ndarray): The typical prices of the candles.
+        volume (numpy.ndarray): The volumes of the candles.
+        anchor (str, optional): The VWAP anchor, see `get_vwap_anchor`. Default is 'frame'.
+        timeperiod (int, optional): The number of candles of the rolling VWAP.
+
+    Returns:
+        numpy.ndarray: The VWAP of every candle.
+    """
+    volume = np.asarray(volume, dtype=float)
+    price_volume = np.cumsum(np.asarray(typical_price, dtype=float) * volume)
+    total_volume = np.cumsum(volume)
+
+    if anchor == VWAP_ANCHOR_ROLLING and 0 < timeperiod < len(volume):
+        price_volume[timeperiod:] = price_volume[timeperiod:] - price_volume[:-timeperiod]
+        total_volume[timeperiod:] = total_volume[timeperiod:] - total_volume[:-timeperiod]
+    elif anchor in VWAP_ANCHOR_PERIODS and len(volume):
+        anchor_ids = get_vwap_anchor_ids(open_times_ms, anchor)
+        starts = np.flatnonzero(np.diff(anchor_ids)) + 1
+        first = np.zeros(len(volume), dtype=np.intp)
+        first[starts] = starts
+        first = np.maximum.accumulate(first)
+        has_previous = first > 0
+        previous = first[has_previous] - 1
+        price_volume[has_previous] -= price_volume[previous]
+        total_volume[has_previous] -= total_volume[previous]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return price_volume / total_volume
@@ -0,0 +1,164 @@
+from typing import Dict, Tuple
+from binance.helpers import interval_to_milliseconds
+from ..models import BotSettings
+from ..utils.app_utils import get_config_value
+from .indicator_plan import get_indicator_plan
+from .vwap import VWAP_ANCHOR_PERIODS, VWAP_ANCHOR_ROLLING, get_vwap_anchor
+
+EMA_CONVERGENCE_FACTOR = 3
+WARMUP_SAFETY_CANDLES = 2
+# One limit-based klines request. Without the kline buffer every cycle fetches the
+# whole warm-up, so a session or weekly VWAP of short intervals is cut to this.
+MAX_UNBUFFERED_VWAP_ANCHOR_CANDLES = 1000
+# The ML features, their scaler and PCA are fitted on the live frame, which always
+# had 205 candles. ML bots keep that window so their predictions don't change.
+ML_WINDOW_CANDLES = 205
+
+
+def get_indicator_lookbacks(bot_settings: BotSettings) -> Dict[str, Tuple[int, int]]:
+    """
+    Returns the history every indicator used by the bot needs before its first value.
+
+    The indicators are the groups of the bot's indicator plan, the same ones
+    `calculate_ta_indicators` calculates and `update_technical_analysis_data`
+    stores. Machine learning features are only included if the bot uses machine
+    learning.
+
+    A rolling VWAP needs its window, a session or weekly VWAP a whole session or
+    week, so the frame starts at or before the anchor. Without `KLINE_BUFFER_ENABLED`
+    the anchored lookback is capped at `MAX_UNBUFFERED_VWAP_ANCHOR_CANDLES`, so the
+    VWAP of a session or week longer than that covers only its last candles.
+
+    Args:
+        bot_settings (BotSettings): The settings of the bot.
+
+    Returns:
+        dict: Indicator name mapped to a tuple of (lookback, smoothing period). The lookback
+              is the number of candles before the first value. The smoothing period is the
+              period of the exponential smoothing the indicator depends on, 0 if none.
+    """
+    plan = get_indicator_plan(bot_settings)
+    rsi_period = bot_settings.rsi_timeperiod
+    macd_slow_period = bot_settings.macd_timeperiod * 2
+    ema_period = max(bot_settings.ema_fast_timeperiod, bot_settings.ema_slow_timeperiod)
+
+    group_lookbacks = {
+        "rsi": (rsi_period, rsi_period),
+        "cci": (bot_settings.cci_timeperiod - 1, 0),
+        "mfi": (bot_settings.mfi_timeperiod, 0),
+        "stoch": (
+            bot_settings.stoch_k_timeperiod + 2 * bot_settings.stoch_d_timeperiod - 3,
+            0,
+        ),
+        "bollinger": (bot_settings.bollinger_timeperiod - 1, 0),
+        "macd": (
+            macd_slow_period + bot_settings.macd_signalperiod - 2,
+            macd_slow_period,
+        ),
+        "atr": (bot_settings.atr_timeperiod, bot_settings.atr_timeperiod),
+        "psar": (1, 0),
+        "adx": (2 * bot_settings.adx_timeperiod - 1, bot_settings.adx_timeperiod),
+        "di": (bot_settings.di_timeperiod, bot_settings.di_timeperiod),
+        "ema": (ema_period - 1, ema_period),
+        "stoch_rsi": (
+            rsi_period
+            + bot_settings.stoch_rsi_timeperiod
+            + bot_settings.stoch_rsi_k_timeperiod
+            + 2 * bot_settings.stoch_rsi_d_timeperiod
+            - 3,
+            max(rsi_period, bot_settings.stoch_rsi_timeperiod),
+        ),
+        "vwap": (get_vwap_lookback(bot_settings), 0),
+        "ma": (199, 0),
+    }
+    lookbacks = {
+        group: lookback for group, lookback in group_lookbacks.items() if group in plan
+    }
+
+    if bot_settings.use_machine_learning:
+        ml_macd_slow_period = bot_settings.ml_macd_timeperiod * 2
+        ml_lookback = max(
+            bot_settings.ml_general_timeperiod,
+            ml_macd_slow_period + bot_settings.ml_macd_signalperiod - 2,
+            bot_settings.ml_bollinger_timeperiod - 1,
+            max(bot_settings.ml_ema_fast_timeperiod, bot_settings.ml_ema_slow_timeperiod) - 1,
+        )
+        lookbacks["ml"] = (
+            ml_lookback + bot_settings.ml_lag_period,
+            max(ml_macd_slow_period, bot_settings.ml_ema_slow_timeperiod),
+        )
+        if bot_settings.ml_use_lstm_model:
+            lookbacks["ml_lstm"] = (
+                ml_lookback
+                + bot_settings.ml_lstm_window_size
+                + bot_settings.ml_lstm_window_lookback,
+                0,
+            )
+
+    return lookbacks
+
+
+def get_vwap_lookback(bot_settings: BotSettings) -> int:
+    """
+    Returns the number of candles before the latest one the bot's VWAP covers.
+
+    Args:
+        bot_settings (BotSettings): The settings of the bot.
+
+    Returns:
+        int: The VWAP lookback, 0 for the VWAP of the frame.
+    """
+    vwap_anchor = get_vwap_anchor(bot_settings)
+    if vwap_anchor == VWAP_ANCHOR_ROLLING:
+        return bot_settings.vwap_timeperiod - 1
+    if vwap_anchor not in VWAP_ANCHOR_PERIODS:
+        return 0
+
+    period_ms, _ = VWAP_ANCHOR_PERIODS[vwap_anchor]
+    lookback = max(period_ms // interval_to_milliseconds(bot_settings.interval) - 1, 0)
+    if not get_config_value("KLINE_BUFFER_ENABLED", False):
+        lookback = min(lookback, MAX_UNBUFFERED_VWAP_ANCHOR_CANDLES - 1)
+    return lookback
+
+
+def get_warmup_candles(bot_settings: BotSettings) -> int:
+    """
+    Returns the number of candles the bot needs to calculate all its indicators.
+
+    The warm-up is the longest indicator lookback. Exponentially smoothed indicators
+    also need `EMA_CONVERGENCE_FACTOR` times their smoothing period on top of their
+    lookback, so their values no longer depend on the first candle. The longest
+    averaging window of `calculate_ta_averages` and `check_ta_trend` and a few safety
+    candles (the open candle and the previous candle) are added. Bots using machine
+    learning get at least `ML_WINDOW_CANDLES`.
+
+    Args:
+        bot_settings (BotSettings): The settings of the bot.
+
+    Returns:
+        int: The number of candles to fetch, including the open candle.
+    """
+    warmup = max(
+        lookback + EMA_CONVERGENCE_FACTOR * smoothing_period
+        for lookback, smoothing_period in get_indicator_lookbacks(bot_settings).values()
+    )
+    averaging_window = max(
+        bot_settings.avg_volume_period,
+        bot_settings.avg_close_period,
+        bot_settings.avg_adx_period,
+        bot_settings.avg_atr_period,
+        bot_settings.avg_di_period,
+        bot_settings.avg_rsi_period,
+        bot_settings.avg_stoch_rsi_period,
+        bot_settings.avg_macd_period,
+        bot_settings.avg_stoch_period,
+        bot_settings.avg_ema_period,
+        bot_settings.avg_cci_period,
+        bot_settings.avg_mfi_period,
+        bot_settings.avg_psar_period,
+        bot_settings.avg_vwap_period,
+    )
+    candles = warmup + averaging_window + WARMUP_SAFETY_CANDLES
+    if bot_settings.use_machine_learning:
+        candles = max(candles, ML_WINDOW_CANDLES)
+    return candles
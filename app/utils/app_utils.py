@@ -1,5 +1,6 @@
+from typing import Any
 from ..utils.exception_handlers import exception_handler
-from flask import Request
+from flask import Request, current_app, has_app_context
 
 
 @exception_handler(default_return="unknown")
@@ -21,3 +22,22 @@ def get_ip_address(request: Request) -> str:
     if "X-Forwarded-For" in request.headers:
         return request.headers["X-Forwarded-For"].split(",")[0]
     return request.remote_addr
+
+
+def get_config_value(key: str, default: Any = None) -> Any:
+    """
+    Reads a value from the Flask application config.
+
+    Falls back to the given default when the key is not configured or when
+    the function is called outside of an application context (e.g. at import time).
+
+    Args:
+        key (str): The config key to read (e.g. 'BOTS_MAX_WORKERS').
+        default (Any, optional): The value returned if the key is not available.
+
+    Returns:
+        Any: The configured value or the default.
+    """
+    if not has_app_context():
+        return default
+    return current_app.config.get(key, default)
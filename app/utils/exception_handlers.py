@@ -81,6 +81,12 @@ def exception_handler(default_return=None, db_rollback=False):
                     f"StefanCryptoTradingBot\n{exception_type} in {func.__name__}\n\n{str(e)}",
                 )
             except Exception as e:
+                from ..stefan.rate_governor import RequestShedError
+
+                if isinstance(e, RequestShedError):
+                    logger.warning(f"{bot_str}Request shed in {func.__name__}: {str(e)}")
+                    return default_return() if callable(default_return) else default_return
+
                 exception_type = "Exception"
                 logger.error(f"{bot_str}{exception_type} in {func.__name__}: {str(e)}")
                 from .email_utils import send_admin_email
@@ -91,6 +91,9 @@ def update_technical_analysis_data(
     """
     Updates technical analysis data for a given bot and stores it in the database.
 
+    Indicators left out of the bot's indicator plan have no column and no average,
+    their fields are stored as None.
+
     Args:
         bot_settings (BotSettings): The bot settings instance.
         df (DataFrame): The historical data DataFrame.
@@ -135,17 +138,12 @@ def update_technical_analysis_data(
         "adx",
         "plus_di",
         "minus_di",
+        "ma_50",
+        "ma_200",
     ]
 
     for field in latest_data_fields:
-        setattr(technical_analysis, f"current_{field}", latest_data.get(field, 0))
-
-    technical_analysis.current_ma_50 = (
-        latest_data["ma_50"] if bot_settings.ma50_signals else 0
-    )
-    technical_analysis.current_ma_200 = (
-        latest_data["ma_200"] if bot_settings.ma200_signals else 0
-    )
+        setattr(technical_analysis, f"current_{field}", latest_data.get(field))
 
     averages_fields = [
         "avg_close",
@@ -168,7 +166,7 @@ def update_technical_analysis_data(
     ]
 
     for field in averages_fields:
-        setattr(technical_analysis, field, averages.get(field, 0))
+        setattr(technical_analysis, field, averages.get(field))
 
     technical_analysis.last_updated_timestamp = datetime.now()
 
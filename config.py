@@ -33,6 +33,34 @@ class DevelopmentConfig:
         MAIL_DEFAULT_SENDER (str): Default sender for emails.
         RECAPTCHA_PUBLIC_KEY (str): Public key for Google reCAPTCHA.
         RECAPTCHA_PRIVATE_KEY (str): Private key for Google reCAPTCHA.
+        BOTS_MAX_WORKERS (int): Number of bots of one interval run concurrently. 1 runs bots sequentially.
+        BOT_RUN_TIMEOUT (int): Seconds after which a single bot run is reported as timed out.
+        SCHEDULER_MODE (str): 'interval' for free-running bot jobs, 'candle_close' for jobs aligned to the exchange candle close,
+            'unified' for one aligned tick job running the bots of all due intervals in a single sweep.
+        SCHEDULER_CANDLE_CLOSE_DELAY_MS (int): Delay after the candle close before bots of an interval are run.
+        SCHEDULER_MISFIRE_GRACE_TIME (int): Seconds a late trading bots job is still allowed to start.
+        KLINE_BUFFER_ENABLED (bool): Keep klines in memory and fetch only new klines every cycle.
+        KLINE_STORE_ENABLED (bool): Persist closed klines of live bots in the local kline store.
+        KLINE_STORE_DIR (str): Directory of the local kline store shared by live trading and backtests.
+        KLINE_DOWNLOAD_WORKERS (int): Number of concurrent requests of historical kline downloads for backtests.
+        MARKET_STREAM_ENABLED (bool): Receive klines of running bots from a stream instead of polling.
+        MARKET_STREAM_SOURCE (str): 'binance' for websocket streams, 'replay' to replay a recorded file.
+        MARKET_STREAM_REPLAY_FILE (str): JSON lines file of recorded kline events used by the 'replay' source.
+        KLINE_RESAMPLE_ENABLED (bool): Whether higher intervals are resampled from the buffered base interval.
+        KLINE_RESAMPLE_BASE_INTERVAL (str): The base interval higher intervals are resampled from.
+        KLINE_RESAMPLE_MAX_BASE_CANDLES (int): Maximum number of base candles buffered for resampling.
+        EXCHANGE_INFO_TTL (int): Seconds after which the cached exchange symbol filters are refreshed.
+        BINANCE_POOL_SIZE (int): Size of the keep-alive connection pool of every cached Binance client.
+        BINANCE_REQUEST_WEIGHT_LIMIT (int): Binance request weight budget per minute enforced by the rate governor.
+        INDICATOR_STATE_ENABLED (bool): Update the indicators of live bots incrementally with every closed candle.
+        INDICATOR_STATE_CHECKPOINT_FILE (str): JSON file the incremental indicator states are checkpointed to.
+        INDICATOR_CACHE_ENABLED (bool): Share indicator columns calculated on the same candles between bots.
+        INDICATOR_CACHE_MAX_ENTRIES (int): Maximum number of indicator groups kept in the shared cache.
+        INDICATOR_WORKERS (int): Number of threads calculating the indicator groups of long backtest and training frames in parallel.
+            1 calculates them sequentially.
+        INDICATOR_PARALLEL_MIN_ROWS (int): Minimum number of candles of a frame whose indicators are calculated in parallel.
+        ORDER_PREPARATION_WORKERS (int): Number of threads fetching the balance and price of orders in parallel.
+        TRADE_NOTIFICATIONS_ENABLED (bool): Send trade emails and telegrams to the users who opted in.
     """
 
     SQLALCHEMY_DATABASE_URI = "sqlite:///stefan.db"
@@ -58,6 +86,41 @@ class DevelopmentConfig:
     RECAPTCHA_PUBLIC_KEY = os.environ["RECAPTCHA_PUBLIC_KEY"]
     RECAPTCHA_PRIVATE_KEY = os.environ["RECAPTCHA_PRIVATE_KEY"]
 
+    BOTS_MAX_WORKERS = int(os.environ.get("BOTS_MAX_WORKERS", 1))
+    BOT_RUN_TIMEOUT = int(os.environ.get("BOT_RUN_TIMEOUT", 50))
+    SCHEDULER_MODE = os.environ.get("SCHEDULER_MODE", "interval")
+    SCHEDULER_CANDLE_CLOSE_DELAY_MS = int(
+        os.environ.get("SCHEDULER_CANDLE_CLOSE_DELAY_MS", 300)
+    )
+    SCHEDULER_MISFIRE_GRACE_TIME = int(os.environ.get("SCHEDULER_MISFIRE_GRACE_TIME", 30))
+    KLINE_BUFFER_ENABLED = os.environ.get("KLINE_BUFFER_ENABLED", "false").lower() == "true"
+    KLINE_STORE_ENABLED = os.environ.get("KLINE_STORE_ENABLED", "false").lower() == "true"
+    KLINE_STORE_DIR = os.environ.get("KLINE_STORE_DIR", os.path.join("instance", "klines"))
+    KLINE_DOWNLOAD_WORKERS = int(os.environ.get("KLINE_DOWNLOAD_WORKERS", 4))
+    MARKET_STREAM_ENABLED = os.environ.get("MARKET_STREAM_ENABLED", "false").lower() == "true"
+    MARKET_STREAM_SOURCE = os.environ.get("MARKET_STREAM_SOURCE", "binance")
+    MARKET_STREAM_REPLAY_FILE = os.environ.get("MARKET_STREAM_REPLAY_FILE")
+    KLINE_RESAMPLE_ENABLED = os.environ.get("KLINE_RESAMPLE_ENABLED", "false").lower() == "true"
+    KLINE_RESAMPLE_BASE_INTERVAL = os.environ.get("KLINE_RESAMPLE_BASE_INTERVAL", "1m")
+    KLINE_RESAMPLE_MAX_BASE_CANDLES = int(
+        os.environ.get("KLINE_RESAMPLE_MAX_BASE_CANDLES", 5000)
+    )
+    EXCHANGE_INFO_TTL = int(os.environ.get("EXCHANGE_INFO_TTL", 3600))
+    BINANCE_POOL_SIZE = int(os.environ.get("BINANCE_POOL_SIZE", 10))
+    BINANCE_REQUEST_WEIGHT_LIMIT = int(os.environ.get("BINANCE_REQUEST_WEIGHT_LIMIT", 6000))
+    INDICATOR_STATE_ENABLED = os.environ.get("INDICATOR_STATE_ENABLED", "false").lower() == "true"
+    INDICATOR_STATE_CHECKPOINT_FILE = os.environ.get(
+        "INDICATOR_STATE_CHECKPOINT_FILE", os.path.join("instance", "indicator_state.json")
+    )
+    INDICATOR_CACHE_ENABLED = os.environ.get("INDICATOR_CACHE_ENABLED", "false").lower() == "true"
+    INDICATOR_CACHE_MAX_ENTRIES = int(os.environ.get("INDICATOR_CACHE_MAX_ENTRIES", 2048))
+    INDICATOR_WORKERS = int(os.environ.get("INDICATOR_WORKERS", 1))
+    INDICATOR_PARALLEL_MIN_ROWS = int(os.environ.get("INDICATOR_PARALLEL_MIN_ROWS", 20000))
+    ORDER_PREPARATION_WORKERS = int(os.environ.get("ORDER_PREPARATION_WORKERS", 4))
+    TRADE_NOTIFICATIONS_ENABLED = (
+        os.environ.get("TRADE_NOTIFICATIONS_ENABLED", "true").lower() == "true"
+    )
+
 
 class TestingConfig:
     """
@@ -1,7 +1,15 @@
 import pytest
-from unittest.mock import patch
+import threading
+import time
+from unittest.mock import MagicMock, patch
 from app.stefan.api_utils import (
     fetch_data,
+    klines_to_df,
+    create_binance_client,
+    invalidate_binance_clients,
+    fetch_order_inputs,
+    get_order_executor,
+    shutdown_order_executor,
     get_account_balance,
     fetch_current_price,
     place_buy_order,
@@ -39,6 +47,105 @@ def test_fetch_data(mock_client):
     assert df["close"].iloc[0] == 50000.0
 
 
+def test_klines_to_df_decodes_typed_columns():
+    klines = [
+        [1620000000000, "50000", "50500", "49000", "50100.5", "100", 1620000059999, "5000000", 42, "50", "2500000", "0"]
+    ]
+    df = klines_to_df(klines)
+    assert df.attrs["typed"]
+    assert df["open_time"].dtype == "int64"
+    assert df["number_of_trades"].iloc[0] == 42
+    assert df["close"].dtype == "float64"
+    assert df["close"].iloc[0] == 50100.5
+
+
+def test_create_binance_client_reuses_client_until_credentials_change(monkeypatch):
+    monkeypatch.setenv("BINANCE_BOT99_API_KEY", "key")
+    monkeypatch.setenv("BINANCE_BOT99_API_SECRET", "secret")
+
+    with patch("app.stefan.api_utils.Client") as mock_client_class:
+        mock_client_class.side_effect = lambda key, secret, testnet: MagicMock(
+            API_KEY=key, API_SECRET=secret
+        )
+        first_client = create_binance_client(99)
+        assert create_binance_client(99) is first_client
+
+        monkeypatch.setenv("BINANCE_BOT99_API_KEY", "new_key")
+        second_client = create_binance_client(99)
+
+    assert second_client is not first_client
+    assert second_client.API_KEY == "new_key"
+    first_client.close_connection.assert_not_called()
+    assert mock_client_class.call_count == 2
+    invalidate_binance_clients(99)
+
+
+def test_create_binance_client_builds_one_client_for_concurrent_callers(monkeypatch):
+    monkeypatch.setenv("BINANCE_BOT98_API_KEY", "key")
+    monkeypatch.setenv("BINANCE_BOT98_API_SECRET", "secret")
+
+    def build_client(key, secret, testnet):
+        time.sleep(0.05)
+        return MagicMock(API_KEY=key, API_SECRET=secret)
+
+    clients = []
+    with patch("app.stefan.api_utils.Client", side_effect=build_client) as mock_client_class:
+        threads = [
+            threading.Thread(target=lambda: clients.append(create_binance_client(98)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert mock_client_class.call_count == 1
+    assert len(clients) == 4
+    assert all(client is clients[0] for client in clients)
+    invalidate_binance_clients(98)
+
+
+def test_fetch_order_inputs_fetches_balance_and_price_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def get_account_balance(bot_id, assets):
+        barrier.wait()
+        return {"USDC": 100.0, "BTC": 0.0}
+
+    def fetch_current_price(symbol):
+        barrier.wait()
+        return 50000.0
+
+    with patch(
+        "app.stefan.api_utils.get_account_balance", side_effect=get_account_balance
+    ), patch(
+        "app.stefan.api_utils.fetch_current_price", side_effect=fetch_current_price
+    ), patch(
+        "app.stefan.api_utils.get_minimum_order_quantity", return_value=(0.00001, 0.00001)
+    ), patch(
+        "app.stefan.api_utils.get_minimum_order_value", return_value=5.0
+    ):
+        balance, price, lot_size, min_notional = fetch_order_inputs(
+            1, "BTCUSDC", ["USDC", "BTC"]
+        )
+
+    assert balance["USDC"] == 100.0
+    assert price == 50000.0
+    assert lot_size == (0.00001, 0.00001)
+    assert min_notional == 5.0
+
+
+def test_order_executor_is_created_lazily_and_recreated_after_shutdown():
+    shutdown_order_executor()
+    executor = get_order_executor()
+    assert get_order_executor() is executor
+
+    shutdown_order_executor()
+    assert executor._shutdown
+    assert get_order_executor() is not executor
+    shutdown_order_executor()
+
+
 def test_get_account_balance(mock_client):
     mock_client.futures_account.return_value = {
         "assets": [
@@ -78,5 +185,29 @@ def test_place_order(mock_client):
     mock_client.order_market_sell.assert_called_once()
 
 
+def test_place_sell_order_measures_latency_from_the_signal_across_retries():
+    bot_client = MagicMock()
+    bot_client.order_market_sell.return_value = {"orderId": 1, "status": "FILLED"}
+    order_inputs = [
+        ConnectionError("reset"),
+        ({"BTC": "0.5"}, "50000", (0.001, 0.001), 5.0),
+    ]
+    signal_time = time.perf_counter() - 1.0
+
+    with patch("app.stefan.api_utils.BotSettings") as mock_bot_settings, patch(
+        "app.stefan.api_utils.create_binance_client", return_value=bot_client
+    ), patch(
+        "app.stefan.api_utils.fetch_order_inputs", side_effect=order_inputs
+    ), patch("app.utils.retry_connection.time.sleep"), patch(
+        "app.stefan.scheduling.record_order_latency"
+    ) as mock_record_order_latency:
+        mock_bot_settings.query.get.return_value.symbol = "BTCUSDC"
+        assert place_sell_order(1, signal_time) == (True, 0.5)
+
+    bot_id, side, latency_ms = mock_record_order_latency.call_args.args
+    assert (bot_id, side) == (1, "sell")
+    assert latency_ms >= 1000
+
+
 if __name__ == "__main__":
     pytest.main()
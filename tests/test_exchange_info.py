@@ -0,0 +1,67 @@
+import pytest
+from unittest.mock import patch
+from app.stefan.exchange_info import ExchangeInfoCache
+
+EXCHANGE_INFO = {
+    "symbols": [
+        {
+            "symbol": "BTCUSDC",
+            "filters": [
+                {"filterType": "LOT_SIZE", "minQty": "0.00001", "stepSize": "0.00001"},
+                {"filterType": "NOTIONAL", "minNotional": "5.0"},
+            ],
+        }
+    ]
+}
+
+
+def test_exchange_info_cache_reads_filters_with_one_request():
+    cache = ExchangeInfoCache(ttl=3600)
+
+    with patch(
+        "app.stefan.api_utils.fetch_exchange_info", return_value=EXCHANGE_INFO
+    ) as mock_fetch:
+        assert cache.get_lot_size("BTCUSDC") == (0.00001, 0.00001)
+        assert cache.get_min_notional("BTCUSDC") == 5.0
+
+    mock_fetch.assert_called_once()
+
+
+def test_exchange_info_cache_refreshes_expired_or_unknown_symbols():
+    cache = ExchangeInfoCache(ttl=0, min_refresh_interval=0)
+
+    with patch(
+        "app.stefan.api_utils.fetch_exchange_info", return_value=EXCHANGE_INFO
+    ) as mock_fetch:
+        cache.get_lot_size("BTCUSDC")
+        cache.loaded_at -= 1
+        cache.get_lot_size("BTCUSDC")
+        cache.ttl = 3600
+        assert cache.get_lot_size("ETHUSDC") == (None, None)
+
+    assert mock_fetch.call_count == 3
+
+
+def test_exchange_info_cache_throttles_refreshes_and_serves_stale_filters():
+    cache = ExchangeInfoCache(ttl=3600, min_refresh_interval=60)
+
+    with patch(
+        "app.stefan.api_utils.fetch_exchange_info", return_value=EXCHANGE_INFO
+    ) as mock_fetch:
+        cache.get_lot_size("BTCUSDC")
+        for _ in range(5):
+            assert cache.get_lot_size("ETHUSDC") == (None, None)
+
+    assert mock_fetch.call_count == 1
+
+    cache.loaded_at -= 7200
+    cache.attempted_at -= 7200
+    with patch("app.stefan.api_utils.fetch_exchange_info", return_value=None) as mock_fetch:
+        for _ in range(5):
+            assert cache.get_lot_size("BTCUSDC") == (0.00001, 0.00001)
+
+    assert mock_fetch.call_count == 1
+
+
+if __name__ == "__main__":
+    pytest.main()
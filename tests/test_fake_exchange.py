@@ -0,0 +1,63 @@
+import pytest
+from app.stefan.api_utils import (
+    get_binance_client_class,
+    get_general_client,
+    set_binance_client_factory,
+)
+from app.stefan.fake_exchange import FakeExchange, FakeExchangeServer
+
+
+@pytest.fixture
+def fake_exchange_server():
+    exchange = FakeExchange()
+    exchange.add_symbol("BTCUSDC", history_days=2)
+    server = FakeExchangeServer(exchange).start()
+    yield server
+    server.stop()
+
+
+def test_fake_exchange_serves_binance_client(fake_exchange_server, monkeypatch):
+    monkeypatch.setenv("BINANCE_API_URL", fake_exchange_server.api_url)
+    client = get_binance_client_class()("api_key", "api_secret")
+
+    klines = client.get_klines(symbol="BTCUSDC", interval="1h", limit=24)
+    assert len(klines) == 24
+    assert klines[1][0] - klines[0][0] == 3_600_000
+
+    price = float(client.get_symbol_ticker(symbol="BTCUSDC")["price"])
+    order = client.order_market_buy(symbol="BTCUSDC", quantity=f"{10 / price:.5f}")
+    assert order["status"] == "FILLED"
+
+    balances = {b["asset"]: float(b["free"]) for b in client.get_account()["balances"]}
+    assert balances["BTC"] == pytest.approx(float(order["executedQty"]))
+    assert balances["USDC"] == pytest.approx(1000 - float(order["cummulativeQuoteQty"]))
+    assert fake_exchange_server.exchange.request_counts["order"] == 1
+
+
+def test_client_factory_points_general_client_at_fake_exchange(fake_exchange_server):
+    set_binance_client_factory(get_binance_client_class(fake_exchange_server.api_url))
+    try:
+        client = get_general_client()
+        assert client.API_URL == fake_exchange_server.api_url
+        assert client.get_symbol_ticker(symbol="BTCUSDC")["symbol"] == "BTCUSDC"
+    finally:
+        set_binance_client_factory(None)
+
+    assert get_general_client().API_URL != fake_exchange_server.api_url
+
+
+def test_fake_exchange_rejects_orders_violating_filters():
+    exchange = FakeExchange()
+    exchange.add_symbol("BTCUSDC", history_days=1)
+
+    status, body, headers = exchange.handle(
+        "POST", "/api/v3/order", {"symbol": "BTCUSDC", "side": "BUY", "type": "MARKET", "quantity": "0.000001"}, "key"
+    )
+
+    assert status == 400
+    assert body == {"code": -1013, "msg": "Filter failure: LOT_SIZE"}
+    assert int(headers["x-mbx-used-weight-1m"]) > 0
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from app.models import BotSettings
+from app.stefan.calc_utils import calculate_ta_averages, calculate_ta_indicators
+from app.stefan.indicator_state import (
+    AVERAGE_COLUMNS,
+    IndicatorStateRegistry,
+    get_indicator_state_averages,
+)
+
+MINUTE_MS = 60_000
+START_MS = 1_735_689_600_000
+
+
+@pytest.fixture
+def bot_settings():
+    columns = BotSettings.__table__.columns
+    return BotSettings(
+        symbol="BTCUSDC",
+        interval="1m",
+        use_gpt_analysis=True,
+        **{
+            column.name: column.default.arg
+            for column in columns
+            if column.default is not None
+            and not callable(column.default.arg)
+            and column.name not in ("symbol", "interval", "use_gpt_analysis")
+        },
+    )
+
+
+@pytest.fixture
+def registry():
+    registry = IndicatorStateRegistry()
+    with patch("app.stefan.indicator_state.indicator_states", registry):
+        yield registry
+
+
+def make_df(count, seed=2):
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 50, count))
+    open_time = START_MS + MINUTE_MS * np.arange(count)
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": close,
+            "high": close + rng.uniform(0, 80, count),
+            "low": close - rng.uniform(0, 80, count),
+            "close": close,
+            "volume": rng.uniform(1, 100, count),
+            "close_time": open_time + MINUTE_MS - 1,
+        }
+    )
+
+
+def test_state_averages_match_slicing(bot_settings, registry):
+    df = make_df(302)
+    now_ms = START_MS + 300 * MINUTE_MS + 1000
+    with patch("app.stefan.indicator_state.get_server_now_ms", return_value=now_ms):
+        df = calculate_ta_indicators(df, bot_settings, use_indicator_state=True)
+
+    windows = {
+        f"{column}_{period}": (column, period)
+        for column in AVERAGE_COLUMNS
+        for period in (1, 3, 14, 500)
+    }
+    averages = get_indicator_state_averages(df, windows)
+    assert averages is not None
+    for name, (column, period) in windows.items():
+        assert averages[name] == pytest.approx(df[column].iloc[-period:].mean(), rel=1e-9), name
+
+    assert calculate_ta_averages(df, bot_settings) == pytest.approx(
+        calculate_ta_averages(df.reset_index(drop=True), bot_settings), rel=1e-9
+    )
+    assert get_indicator_state_averages(df.iloc[:-1], windows) is None
+
+
+def test_average_history_matches_rolling_mean(bot_settings, registry):
+    df = make_df(200)
+    now_ms = START_MS + 200 * MINUTE_MS
+    with patch("app.stefan.indicator_state.get_server_now_ms", return_value=now_ms):
+        calculate_ta_indicators(df, bot_settings, use_indicator_state=True)
+
+    (indicator_state,) = registry._states.values()
+    rsi = indicator_state.get_history(indicator_state.history_count)[:, 0]
+    np.testing.assert_allclose(
+        indicator_state.get_average_history("rsi", 14),
+        pd.Series(rsi).rolling(14, min_periods=1).mean(),
+        rtol=1e-9,
+    )
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+from unittest.mock import patch
+from app.models import BotSettings
+from app.stefan.calc_utils import (
+    calculate_ema_by_period,
+    calculate_macd_by_params,
+    calculate_rsi_by_period,
+    calculate_ta_indicators,
+    get_batch_variants,
+    prime_ta_indicator_cache,
+)
+from app.stefan.indicator_cache import IndicatorCache
+
+
+def make_bot_settings(bot_id, **settings):
+    columns = BotSettings.__table__.columns
+    bot_settings = BotSettings(
+        id=bot_id,
+        symbol="BTCUSDC",
+        interval="1m",
+        **{
+            column.name: column.default.arg
+            for column in columns
+            if column.default is not None
+            and not callable(column.default.arg)
+            and column.name not in ("symbol", "interval")
+        },
+    )
+    bot_settings.use_gpt_analysis = True
+    for name, value in settings.items():
+        setattr(bot_settings, name, value)
+    return bot_settings
+
+
+def make_df(count, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 50, count))
+    open_time = 1_735_689_600_000 + 60_000 * np.arange(count)
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": close,
+            "high": close + rng.uniform(0, 80, count),
+            "low": close - rng.uniform(0, 80, count),
+            "close": close,
+            "volume": rng.uniform(1, 100, count),
+            "close_time": open_time + 59_999,
+        }
+    )
+
+
+def test_deduplicated_variants_match_talib():
+    close = make_df(300)["close"].to_numpy()
+
+    rsi = calculate_rsi_by_period(close, [14, 7, 14])
+    assert rsi.shape == (300, 3)
+    np.testing.assert_array_equal(rsi[:, 1], talib.RSI(close, timeperiod=7))
+    np.testing.assert_array_equal(rsi[:, 0], rsi[:, 2])
+
+    ema = calculate_ema_by_period(close, [9, 21])
+    np.testing.assert_array_equal(ema[:, 1], talib.EMA(close, timeperiod=21))
+
+    macd, macd_signal, macd_histogram = calculate_macd_by_params(close, [(12, 24, 9), (6, 12, 5)])
+    expected_macd, expected_signal, _ = talib.MACD(
+        close, fastperiod=6, slowperiod=12, signalperiod=5
+    )
+    np.testing.assert_array_equal(macd[:, 1], expected_macd)
+    np.testing.assert_array_equal(macd_signal[:, 1], expected_signal)
+    np.testing.assert_array_equal(macd_histogram[:, 1], expected_macd - expected_signal)
+
+
+def recalculated(df, bot_settings):
+    pytest.fail("A primed indicator group was recalculated.")
+
+
+def test_primed_cache_serves_every_bot_of_the_frame():
+    bots = [
+        make_bot_settings(1),
+        make_bot_settings(2, rsi_timeperiod=7, ema_fast_timeperiod=5),
+        make_bot_settings(3, rsi_timeperiod=7, macd_timeperiod=6),
+    ]
+    df = make_df(300)
+    cache = IndicatorCache()
+
+    with patch("app.stefan.calc_utils.indicator_cache", cache):
+        assert prime_ta_indicator_cache(
+            df, "BTCUSDC", "1m", [get_batch_variants(bot_settings) for bot_settings in bots]
+        ) == 6
+        for bot_settings in bots:
+            with patch.dict(
+                "app.stefan.calc_utils.TA_INDICATOR_CALCULATIONS",
+                {group: recalculated for group in ("rsi", "ema", "macd")},
+            ):
+                cached = calculate_ta_indicators(df.copy(), bot_settings, use_indicator_cache=True)
+            expected = calculate_ta_indicators(df.copy(), bot_settings)
+            pd.testing.assert_frame_equal(cached, expected)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from app.models import BotSettings
+from app.stefan.calc_utils import calculate_ta_indicators
+from app.stefan.indicator_cache import IndicatorCache
+
+
+@pytest.fixture
+def bot_settings():
+    columns = BotSettings.__table__.columns
+    bot_settings = BotSettings(
+        symbol="BTCUSDC",
+        interval="1m",
+        **{
+            column.name: column.default.arg
+            for column in columns
+            if column.default is not None
+            and not callable(column.default.arg)
+            and column.name not in ("symbol", "interval")
+        },
+    )
+    bot_settings.use_gpt_analysis = True
+    return bot_settings
+
+
+def make_df(count, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 50, count))
+    open_time = 1_735_689_600_000 + 60_000 * np.arange(count)
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": close,
+            "high": close + rng.uniform(0, 80, count),
+            "low": close - rng.uniform(0, 80, count),
+            "close": close,
+            "volume": rng.uniform(1, 100, count),
+            "close_time": open_time + 59_999,
+        }
+    )
+
+
+def test_indicator_cache_evicts_least_recently_used():
+    cache = IndicatorCache(max_entries=2)
+    cache.put("a", {"rsi": np.zeros(1)})
+    cache.put("b", {"rsi": np.ones(1)})
+    assert cache.get("a") is not None
+    cache.put("c", {"rsi": np.ones(1)})
+
+    assert cache.get("b") is None
+    assert cache.get_or_compute("c", lambda: pytest.fail("computed a cached key"))
+    assert cache.get_stats() == {"hits": 2, "misses": 1, "entries": 2, "hit_rate": 2 / 3}
+
+
+def test_bots_with_same_candles_share_indicator_columns(bot_settings):
+    cache = IndicatorCache()
+    with patch("app.stefan.calc_utils.indicator_cache", cache):
+        expected = calculate_ta_indicators(make_df(300), bot_settings, use_indicator_cache=True)
+        misses = cache.get_stats()["misses"]
+        shared = calculate_ta_indicators(make_df(300), bot_settings, use_indicator_cache=True)
+        assert cache.get_stats()["hits"] == misses
+        pd.testing.assert_frame_equal(shared, expected)
+
+        bot_settings.rsi_timeperiod = 21
+        calculate_ta_indicators(make_df(300), bot_settings, use_indicator_cache=True)
+    assert cache.get_stats()["misses"] == misses + 2
+
+
+if __name__ == "__main__":
+    pytest.main()
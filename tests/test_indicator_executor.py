@@ -0,0 +1,100 @@
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from app.models import BotSettings
+from app.stefan import indicator_executor
+from app.stefan.calc_utils import calculate_ta_indicators
+from app.stefan.indicator_executor import run_indicator_tasks
+from app.stefan.indicator_plan import get_plan_waves, resolve_indicator_groups
+
+MINUTE_MS = 60_000
+START_MS = 1_735_689_600_000
+
+
+@pytest.fixture
+def bot_settings():
+    columns = BotSettings.__table__.columns
+    return BotSettings(
+        symbol="BTCUSDC",
+        interval="1m",
+        use_gpt_analysis=True,
+        **{
+            column.name: column.default.arg
+            for column in columns
+            if column.default is not None
+            and not callable(column.default.arg)
+            and column.name not in ("symbol", "interval", "use_gpt_analysis")
+        },
+    )
+
+
+def make_df(count, seed=4):
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 50, count))
+    open_time = START_MS + MINUTE_MS * np.arange(count)
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": close,
+            "high": close + rng.uniform(0, 80, count),
+            "low": close - rng.uniform(0, 80, count),
+            "close": close,
+            "volume": rng.uniform(1, 100, count),
+            "close_time": open_time + MINUTE_MS - 1,
+        }
+    )
+
+
+def get_thread_name():
+    return threading.current_thread().name
+
+
+def test_plan_waves_calculate_dependencies_first(bot_settings):
+    waves = get_plan_waves(resolve_indicator_groups(bot_settings))
+    assert len(waves) == 2
+    assert "rsi" in waves[0] and waves[1] == ["stoch_rsi"]
+    assert sorted(waves[0] + waves[1]) == sorted(resolve_indicator_groups(bot_settings))
+
+
+def test_short_frames_are_calculated_in_the_calling_thread(monkeypatch):
+    monkeypatch.setattr(indicator_executor, "DEFAULT_INDICATOR_PARALLEL_MIN_ROWS", 1000)
+    assert run_indicator_tasks([get_thread_name] * 3, 999) == [get_thread_name()] * 3
+
+
+def test_parallel_calculation_matches_sequential(bot_settings, monkeypatch):
+    df = make_df(600)
+    expected = calculate_ta_indicators(df.copy(), bot_settings)
+
+    monkeypatch.setattr(indicator_executor, "DEFAULT_INDICATOR_PARALLEL_MIN_ROWS", 0)
+    monkeypatch.setattr(indicator_executor, "DEFAULT_INDICATOR_WORKERS", 4)
+    thread_names = run_indicator_tasks([get_thread_name] * 4, len(df))
+    assert any(name.startswith("stefan-indicator") for name in thread_names)
+    pd.testing.assert_frame_equal(calculate_ta_indicators(df.copy(), bot_settings), expected)
+
+
+def test_no_indicator_pool_is_started_by_default():
+    assert indicator_executor.get_indicator_executor() is None
+    assert run_indicator_tasks([get_thread_name] * 3, 10**6) == [get_thread_name()] * 3
+
+
+def test_long_frames_are_calculated_in_parallel_with_workers(bot_settings, monkeypatch):
+    df = make_df(indicator_executor.DEFAULT_INDICATOR_PARALLEL_MIN_ROWS)
+    expected = calculate_ta_indicators(df.copy(), bot_settings)
+    monkeypatch.setattr(indicator_executor, "DEFAULT_INDICATOR_WORKERS", 4)
+
+    executors = []
+    get_indicator_executor = indicator_executor.get_indicator_executor
+
+    def record_indicator_executor():
+        executors.append(get_indicator_executor())
+        return executors[-1]
+
+    monkeypatch.setattr(indicator_executor, "get_indicator_executor", record_indicator_executor)
+    df = calculate_ta_indicators(df.copy(), bot_settings)
+    assert executors and all(executor is not None for executor in executors)
+    pd.testing.assert_frame_equal(df, expected)
+
+
+if __name__ == "__main__":
+    pytest.main()
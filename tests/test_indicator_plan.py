@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.models import BotSettings, BotTechnicalAnalysis
+from app.stefan.calc_utils import calculate_ta_averages, calculate_ta_indicators
+from app.utils.trades_utils import update_technical_analysis_data
+from unittest.mock import patch
+from app.stefan.indicator_plan import (
+    SIGNAL_FLAG_GROUPS,
+    get_indicator_plan,
+    get_plan_columns,
+    indicator_plans,
+)
+
+
+@pytest.fixture
+def bot_settings():
+    columns = BotSettings.__table__.columns
+    bot_settings = BotSettings(
+        id=1,
+        symbol="BTCUSDC",
+        interval="1m",
+        **{
+            column.name: column.default.arg
+            for column in columns
+            if column.default is not None
+            and not callable(column.default.arg)
+            and column.name not in ("symbol", "interval")
+        },
+    )
+    for flag in SIGNAL_FLAG_GROUPS:
+        setattr(bot_settings, flag, False)
+    bot_settings.use_gpt_analysis = False
+    bot_settings.selected_plot_indicators = []
+    indicator_plans.clear()
+    return bot_settings
+
+
+def make_df(count, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 50, count))
+    open_time = 1_735_689_600_000 + 60_000 * np.arange(count)
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": close,
+            "high": close + rng.uniform(0, 80, count),
+            "low": close - rng.uniform(0, 80, count),
+            "close": close,
+            "volume": rng.uniform(1, 100, count),
+            "close_time": open_time + 59_999,
+        }
+    )
+
+
+def test_indicator_plan_resolves_flags_plots_and_dependencies(bot_settings):
+    assert get_indicator_plan(bot_settings) == {"rsi", "atr", "adx", "di"}
+
+    bot_settings.stoch_rsi_signals = True
+    bot_settings.ma200_signals = True
+    bot_settings.selected_plot_indicators = ["rsi", "boll"]
+    plan = get_indicator_plan(bot_settings)
+    assert plan == {"rsi", "atr", "adx", "di", "stoch_rsi", "ma", "bollinger"}
+    assert get_indicator_plan(bot_settings) is plan
+
+    bot_settings.use_gpt_analysis = True
+    assert "vwap" in get_indicator_plan(bot_settings)
+    assert "typical_price" in get_plan_columns(get_indicator_plan(bot_settings))
+
+
+def test_calculate_ta_indicators_computes_only_planned_columns(bot_settings):
+    bot_settings.rsi_signals = True
+    bot_settings.ema_cross_signals = True
+    df = calculate_ta_indicators(make_df(300), bot_settings)
+
+    assert {"rsi", "atr", "adx", "plus_di", "ema_fast", "ema_slow"} <= set(df.columns)
+    assert not {"cci", "mfi", "stoch_k", "psar", "vwap", "macd", "ma_200"} & set(df.columns)
+
+    averages = calculate_ta_averages(df, bot_settings)
+    assert "avg_ema_fast" in averages and "avg_rsi" in averages
+    assert "avg_cci" not in averages
+
+
+def test_unplanned_indicators_are_stored_as_none(bot_settings):
+    bot_settings.ema_cross_signals = True
+    df = calculate_ta_indicators(make_df(300), bot_settings)
+    averages = calculate_ta_averages(df, bot_settings)
+    technical_analysis = BotTechnicalAnalysis()
+
+    with patch("app.utils.trades_utils.BotTechnicalAnalysis") as mock_technical_analysis, patch(
+        "app.utils.trades_utils.db"
+    ):
+        mock_technical_analysis.query.filter_by.return_value.first.return_value = (
+            technical_analysis
+        )
+        update_technical_analysis_data(bot_settings, df, "uptrend", averages)
+
+    assert technical_analysis.current_ema_fast == df["ema_fast"].iloc[-1]
+    assert technical_analysis.avg_ema_fast == averages["avg_ema_fast"]
+    assert technical_analysis.current_cci is None and technical_analysis.avg_cci is None
+    assert technical_analysis.current_ma_50 is None
+
+
+if __name__ == "__main__":
+    pytest.main()
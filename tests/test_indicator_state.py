@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+from unittest.mock import patch
+from app.models import BotSettings
+from app.stefan.calc_utils import calculate_ta_indicators
+from app.stefan.indicator_state import (
+    INDICATOR_COLUMNS,
+    IncrementalBBands,
+    IndicatorStateRegistry,
+    apply_indicator_state,
+)
+from app.stefan.vwap import calculate_vwap
+
+MINUTE_MS = 60_000
+START_MS = 1_735_689_600_000
+
+
+@pytest.fixture
+def bot_settings():
+    columns = BotSettings.__table__.columns
+    return BotSettings(
+        symbol="BTCUSDC",
+        interval="1m",
+        **{
+            column.name: column.default.arg
+            for column in columns
+            if column.default is not None
+            and not callable(column.default.arg)
+            and column.name not in ("symbol", "interval")
+        },
+    )
+
+
+@pytest.fixture
+def registry():
+    registry = IndicatorStateRegistry()
+    with patch("app.stefan.indicator_state.indicator_states", registry):
+        yield registry
+
+
+def make_df(count, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 50, count))
+    open_time = START_MS + MINUTE_MS * np.arange(count)
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": close,
+            "high": close + rng.uniform(0, 80, count),
+            "low": close - rng.uniform(0, 80, count),
+            "close": close,
+            "volume": rng.uniform(1, 100, count),
+            "close_time": open_time + MINUTE_MS - 1,
+        }
+    )
+
+
+def test_indicator_state_matches_talib(bot_settings, registry):
+    bot_settings.use_gpt_analysis = True
+    df = make_df(300)
+    expected = calculate_ta_indicators(df.copy(), bot_settings)
+
+    df = apply_indicator_state(df, bot_settings).loc[expected.index]
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(
+            df[column], expected[column], rtol=1e-9, atol=1e-8, err_msg=column
+        )
+
+
+def test_indicator_state_advances_by_new_candles_and_checkpoints(bot_settings, registry, tmp_path):
+    df = make_df(302)
+    first_now_ms = START_MS + 300 * MINUTE_MS + 1000
+    with patch("app.stefan.indicator_state.get_server_now_ms", return_value=first_now_ms):
+        apply_indicator_state(df.iloc[:301].reset_index(drop=True), bot_settings)
+    checkpoint_file = str(tmp_path / "indicator_state.json")
+    assert registry.checkpoint(checkpoint_file) == 1
+    restored = IndicatorStateRegistry()
+    assert restored.restore(checkpoint_file) == 1
+
+    shifted_df = df.iloc[1:].reset_index(drop=True)
+    now_ms = first_now_ms + MINUTE_MS
+    with patch("app.stefan.indicator_state.indicator_states", restored), patch(
+        "app.stefan.indicator_state.get_server_now_ms", return_value=now_ms
+    ):
+        shifted_df = apply_indicator_state(shifted_df, bot_settings)
+    (indicator_state,) = restored._states.values()
+    assert indicator_state.last_open_time == START_MS + 300 * MINUTE_MS
+    assert indicator_state.history_count == 301
+
+    with patch("app.stefan.indicator_state.get_server_now_ms", return_value=now_ms):
+        full_df = apply_indicator_state(df, bot_settings)
+    for column in INDICATOR_COLUMNS:
+        if column != "vwap":
+            np.testing.assert_allclose(
+                shifted_df[column], full_df[column].iloc[1:], rtol=1e-12, err_msg=column
+            )
+
+
+def test_indicator_state_is_shared_by_frame_lengths_and_stale_states_are_evicted(
+    bot_settings, registry
+):
+    df = make_df(400)
+    now_ms = START_MS + 399 * MINUTE_MS + 1000
+    with patch("app.stefan.indicator_state.get_server_now_ms", return_value=now_ms):
+        long_df = apply_indicator_state(df, bot_settings)
+        short_df = apply_indicator_state(df.iloc[-300:].reset_index(drop=True), bot_settings)
+    assert len(registry._states) == 1
+    np.testing.assert_allclose(
+        short_df["rsi"], long_df["rsi"].iloc[-300:], rtol=1e-12, equal_nan=True
+    )
+    np.testing.assert_allclose(
+        short_df["vwap"],
+        calculate_vwap(short_df["open_time"], short_df["typical_price"], short_df["volume"]),
+    )
+
+    bot_settings.rsi_timeperiod += 1
+    later_ms = now_ms + 10 * MINUTE_MS
+    with patch("app.stefan.indicator_state.get_server_now_ms", return_value=later_ms):
+        apply_indicator_state(make_df(410), bot_settings)
+    (indicator_state,) = registry._states.values()
+    assert indicator_state.params["rsi_timeperiod"] == bot_settings.rsi_timeperiod
+
+
+def test_registry_keeps_states_in_use_and_clears_locks():
+    registry = IndicatorStateRegistry()
+    in_use_key = registry.get_key("BTCUSDC", "1m", {"rsi_timeperiod": 14})
+    idle_key = registry.get_key("ETHUSDC", "1m", {"rsi_timeperiod": 14})
+    for key in (in_use_key, idle_key):
+        registry.touch(key, START_MS)
+        registry.get_lock(key)
+
+    later_ms = START_MS + 1000 * MINUTE_MS
+    with registry.locked(in_use_key):
+        assert registry.evict_stale(later_ms) == 1
+    assert set(registry._locks) == {in_use_key}
+
+    registry.clear()
+    assert registry._locks == {} and registry._last_used_ms == {}
+
+
+def test_bollinger_bands_match_talib_at_btc_prices():
+    rng = np.random.default_rng(5)
+    close = 50000 + np.cumsum(rng.normal(0, 0.5, 100_000))
+    bollinger = IncrementalBBands(20, 2.0)
+    values = np.array([bollinger.update(value) for value in close[:-500]])
+    assert not np.isnan(values[19:]).any()
+
+    restored = IncrementalBBands(20, 2.0)
+    restored.set_state(bollinger.get_state())
+    values = np.array([restored.update(value) for value in close[-500:]])
+    upper, middle, lower = talib.BBANDS(close[-519:], 20, 2, 2, 0)
+    np.testing.assert_allclose(values[:, 1], middle[19:], rtol=1e-12)
+    np.testing.assert_allclose(values[:, 0] - values[:, 1], upper[19:] - middle[19:], rtol=1e-8)
+    np.testing.assert_allclose(values[:, 1] - values[:, 2], middle[19:] - lower[19:], rtol=1e-8)
+
+
+if __name__ == "__main__":
+    pytest.main()
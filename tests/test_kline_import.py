@@ -0,0 +1,52 @@
+import zipfile
+import pytest
+from app.stefan.kline_import import find_kline_archives, import_kline_archives, read_kline_archive
+from app.stefan.kline_store import KlineStore
+
+MINUTE_MS = 60_000
+START_MS = 1_735_689_600_000
+
+
+def write_archive(directory, name, open_times, scale=1, header=False):
+    lines = ["open_time,open,high,low,close,volume,close_time,quote_volume,count"] if header else []
+    lines += [
+        f"{t * scale},1.0,2.0,0.5,1.5,10,{(t + MINUTE_MS - 1) * scale},15,3,4,6,0"
+        for t in open_times
+    ]
+    path = directory / f"{name}.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(f"{name}.csv", "\n".join(lines) + "\n")
+    return path
+
+
+def test_read_kline_archive_converts_microseconds(tmp_path):
+    path = write_archive(
+        tmp_path, "BTCUSDC-1m-2025-01", [START_MS + MINUTE_MS, START_MS], scale=1000, header=True
+    )
+
+    rows = read_kline_archive(str(path))
+
+    assert rows[:, 0].tolist() == [START_MS, START_MS + MINUTE_MS]
+    assert rows[0, 6] == START_MS + MINUTE_MS - 1
+    assert rows[0, 8] == 3
+
+
+def test_import_kline_archives_writes_store_and_reports_gaps(tmp_path):
+    archives_dir = tmp_path / "archives"
+    archives_dir.mkdir()
+    write_archive(archives_dir, "BTCUSDC-1m-2024-02", [5 * MINUTE_MS, 6 * MINUTE_MS])
+    write_archive(archives_dir, "BTCUSDC-1m-2024-01", [0, MINUTE_MS, 2 * MINUTE_MS])
+    (archives_dir / "BTCUSDC-1m-2024-01.zip.CHECKSUM").write_text("")
+    kline_store = KlineStore(str(tmp_path / "store"))
+
+    assert list(find_kline_archives(str(archives_dir))) == [("BTCUSDC", "1m")]
+    summary = import_kline_archives(str(archives_dir), kline_store, workers=2)
+
+    assert summary[("BTCUSDC", "1m")] == {"archives": 2, "imported": 5, "gaps": 1}
+    df = kline_store.read_df("BTCUSDC", "1m")
+    assert df["open_time"].tolist() == [0, MINUTE_MS, 2 * MINUTE_MS, 5 * MINUTE_MS, 6 * MINUTE_MS]
+    assert df["close"].dtype == "float64"
+
+
+if __name__ == "__main__":
+    pytest.main()
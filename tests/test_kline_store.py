@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import patch
+from app.stefan.kline_store import KlineStore, klines_to_array
+
+MINUTE_MS = 60_000
+
+
+def make_klines(open_times, close=1.0):
+    return [
+        [t, "1", "1", "1", str(close), "1", t + MINUTE_MS - 1, "1", 1, "1", "1", "0"]
+        for t in open_times
+    ]
+
+
+def make_rows(open_times, close=1.0):
+    return klines_to_array(make_klines(open_times, close))
+
+
+@pytest.fixture
+def kline_store(tmp_path):
+    return KlineStore(str(tmp_path))
+
+
+def test_kline_store_appends_and_reads_range(kline_store):
+    assert kline_store.write("BTCUSDC", "1m", make_rows([0, MINUTE_MS])) == 2
+    assert kline_store.write("BTCUSDC", "1m", make_rows([MINUTE_MS, 2 * MINUTE_MS])) == 1
+
+    df = kline_store.read_df("BTCUSDC", "1m", MINUTE_MS, 3 * MINUTE_MS)
+    assert df["open_time"].tolist() == [MINUTE_MS, 2 * MINUTE_MS]
+    assert df["open_time"].dtype == "int64"
+    assert df["close"].dtype == "float64"
+    assert kline_store.get_last_open_time("BTCUSDC", "1m") == 2 * MINUTE_MS
+
+
+def test_kline_store_finds_and_merges_gaps(kline_store):
+    kline_store.write("BTCUSDC", "1m", make_rows([0, 3 * MINUTE_MS]))
+
+    assert kline_store.find_gaps("BTCUSDC", "1m", 0, 6 * MINUTE_MS) == [
+        (MINUTE_MS, 3 * MINUTE_MS),
+        (4 * MINUTE_MS, 6 * MINUTE_MS),
+    ]
+
+    assert kline_store.write("BTCUSDC", "1m", make_rows([MINUTE_MS, 2 * MINUTE_MS])) == 2
+    open_times = kline_store.read("BTCUSDC", "1m")[:, 0].tolist()
+    assert open_times == [0, MINUTE_MS, 2 * MINUTE_MS, 3 * MINUTE_MS]
+
+
+def test_kline_store_sync_fetches_only_missing_closed_klines(kline_store):
+    kline_store.write("BTCUSDC", "1m", make_rows([0, MINUTE_MS]))
+
+    with patch(
+        "app.stefan.kline_store.fetch_historical_klines",
+        return_value=make_klines([2 * MINUTE_MS, 3 * MINUTE_MS]),
+    ) as mock_fetch:
+        stored_count = kline_store.sync(
+            "BTCUSDC", "1m", 0, 10 * MINUTE_MS, server_now_ms=4 * MINUTE_MS + 10
+        )
+        kline_store.sync(
+            "BTCUSDC", "1m", 0, 10 * MINUTE_MS, server_now_ms=4 * MINUTE_MS + 10
+        )
+
+    mock_fetch.assert_called_once_with("BTCUSDC", "1m", 2 * MINUTE_MS, 4 * MINUTE_MS - 1)
+    assert stored_count == 2
+
+
+def test_kline_store_download_fetches_missing_chunks_concurrently(kline_store):
+    chunk_ms = 1000 * MINUTE_MS
+    kline_store.write("BTCUSDC", "1m", make_rows([chunk_ms]))
+
+    def fetch_klines(symbol, interval, start_time):
+        return make_klines(range(start_time, start_time + chunk_ms, MINUTE_MS))
+
+    with patch(
+        "app.stefan.kline_store.fetch_klines", side_effect=fetch_klines
+    ) as mock_fetch:
+        stored_count = kline_store.download(
+            "BTCUSDC", "1m", 0, 3 * chunk_ms, workers=3, server_now_ms=3 * chunk_ms
+        )
+
+    fetched = sorted(call.args[2] for call in mock_fetch.call_args_list)
+    assert fetched == [0, chunk_ms + MINUTE_MS, 2 * chunk_ms + MINUTE_MS]
+    assert stored_count == 3 * 1000 - 1
+    assert kline_store.find_gaps("BTCUSDC", "1m", 0, 3 * chunk_ms) == []
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,114 @@
+import pytest
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch, call
+from app.stefan.market_data import (
+    MarketDataSweep,
+    KlineBuffer,
+    get_lookback_extended,
+)
+
+
+@pytest.fixture
+def bots():
+    return [
+        SimpleNamespace(id=1, symbol="BTCUSDC", interval="1m"),
+        SimpleNamespace(id=2, symbol="BTCUSDC", interval="1m"),
+        SimpleNamespace(id=3, symbol="ETHUSDC", interval="1m"),
+    ]
+
+
+def test_get_lookback_extended():
+    assert get_lookback_extended("1m") == "205m"
+    assert get_lookback_extended("4h") == "820h"
+    assert get_lookback_extended("15m", 100) == "1500m"
+
+
+def test_market_data_sweep_fetches_once_per_group(bots):
+    df = pd.DataFrame({"close": [1.0, 2.0, 3.0]})
+    with patch(
+        "app.stefan.logic_utils.fetch_data_and_validate", return_value=df
+    ) as mock_fetch, patch(
+        "app.stefan.market_data.get_warmup_candles", side_effect=[120, 150, 90]
+    ):
+        sweep = MarketDataSweep(bots)
+        df_first = sweep.get_df("BTCUSDC", "1m", 1)
+        df_second = sweep.get_df("BTCUSDC", "1m", 2)
+        sweep.get_df("ETHUSDC", "1m", 3)
+
+    assert mock_fetch.call_count == 2
+    assert sweep.fetch_count == 2
+    assert sweep.candles == {("BTCUSDC", "1m"): 150, ("ETHUSDC", "1m"): 90}
+    df_first["rsi"] = 50.0
+    assert "rsi" not in df_second.columns
+    assert "rsi" not in df.columns
+
+
+def test_market_data_sweep_counts_concurrent_fetches_of_all_groups():
+    symbols = [f"COIN{index}USDC" for index in range(50)]
+    bots = [
+        SimpleNamespace(id=index, symbol=symbol, interval="1m")
+        for index, symbol in enumerate(symbols)
+    ]
+    df = pd.DataFrame({"close": [1.0, 2.0, 3.0]})
+    with patch("app.stefan.logic_utils.fetch_data_and_validate", return_value=df), patch(
+        "app.stefan.market_data.get_warmup_candles", return_value=100
+    ):
+        sweep = MarketDataSweep(bots)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda bot: sweep.get_df(bot.symbol, "1m", bot.id), bots * 2))
+
+    assert sweep.fetch_count == len(symbols)
+
+
+def make_klines(open_times, close=1.0):
+    return [
+        [t, "1", "1", "1", str(close), "1", t + 59_999, "1", 1, "1", "1", "0"]
+        for t in open_times
+    ]
+
+
+def test_kline_buffer_fetches_only_new_klines():
+    minute = 60_000
+    backfill = make_klines([i * minute for i in range(5)])
+    delta = make_klines([4 * minute, 5 * minute, 6 * minute], close=2.0)
+    buffer = KlineBuffer()
+
+    with patch(
+        "app.stefan.market_data.fetch_klines", side_effect=[backfill, delta]
+    ) as mock_fetch_klines:
+        df_first = buffer.get_df("BTCUSDC", "1m", 5)
+        df_second = buffer.get_df("BTCUSDC", "1m", 5)
+
+    assert mock_fetch_klines.call_args_list == [
+        call("BTCUSDC", "1m", limit=5),
+        call("BTCUSDC", "1m", 4 * minute, limit=1000),
+    ]
+    assert len(df_first) == 5
+    assert df_second["open_time"].tolist() == [i * minute for i in range(2, 7)]
+    assert df_second["close"].tolist() == [1.0, 1.0, 2.0, 2.0, 2.0]
+    assert buffer.full_fetches == 1
+    assert buffer.delta_fetches == 1
+
+
+def test_kline_buffer_resamples_higher_interval_from_base():
+    minute = 60_000
+    base = make_klines([i * minute for i in range(17)])
+    buffer = KlineBuffer()
+
+    with patch(
+        "app.stefan.market_data.fetch_klines", side_effect=[base[-5:], base]
+    ) as mock_fetch_klines:
+        assert buffer.get_resampled_df("BTCUSDC", "5m", 3) is None
+        buffer.get_df("BTCUSDC", "1m", 5)
+        df = buffer.get_resampled_df("BTCUSDC", "5m", 3)
+
+    assert mock_fetch_klines.call_count == 2
+    assert df["open_time"].tolist() == [5 * minute, 10 * minute, 15 * minute]
+    assert df["close_time"].tolist() == [10 * minute - 1, 15 * minute - 1, 20 * minute - 1]
+    assert buffer.resample_hits == 1
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+from app.stefan.market_frame import MarketFrame
+
+
+def make_df(count, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 50, count))
+    open_time = 1_735_689_600_000 + 60_000 * np.arange(count)
+    return pd.DataFrame(
+        {
+            "open_time": pd.to_datetime(open_time, unit="ms"),
+            "open": close,
+            "high": close + rng.uniform(0, 80, count),
+            "low": close - rng.uniform(0, 80, count),
+            "close": close,
+            "volume": rng.uniform(1, 100, count),
+            "number_of_trades": rng.integers(1, 500, count),
+        }
+    )
+
+
+def test_market_frame_writes_columns_in_place_and_drops_warmup_rows():
+    df = make_df(100)
+    frame = MarketFrame(df, ["rsi", "atr"])
+    frame["rsi"] = talib.RSI(frame["close"], timeperiod=14)
+    frame["atr"] = talib.ATR(frame["high"], frame["low"], frame["close"], timeperiod=20)
+
+    assert "rsi" in frame and "macd" not in frame
+    with pytest.raises(KeyError):
+        frame["ema_fast"] = frame["close"]
+
+    result = frame.to_df(["rsi", "atr"])
+    assert result.index[0] == 20 and len(result) == 80
+    assert np.shares_memory(result["rsi"].to_numpy(), frame.values)
+    np.testing.assert_allclose(result["rsi"], talib.RSI(df["close"], timeperiod=14).iloc[20:])
+    pd.testing.assert_series_equal(result["open_time"], df["open_time"].iloc[20:])
+    pd.testing.assert_series_equal(result["number_of_trades"], df["number_of_trades"].iloc[20:])
+
+
+def test_market_frame_masks_incomplete_rows_and_skips_unwritten_columns():
+    df = make_df(30)
+    df.loc[25, "volume"] = np.nan
+    frame = MarketFrame(df, ["obv", "macd"])
+    frame["obv"] = talib.OBV(frame["close"], frame["volume"])
+
+    result = frame.to_df(["volume", "macd"])
+    assert "macd" not in result
+    assert list(result.index) == [index for index in range(30) if index != 25]
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,93 @@
+import json
+import pytest
+from unittest.mock import call, patch
+from app.stefan.market_data import KlineBuffer
+from app.stefan.market_stream import BinanceKlineSource, MarketStreamService, ReplayKlineSource
+
+MINUTE_MS = 60_000
+
+
+def make_klines(open_times, close=1.0):
+    return [
+        [t, "1", "1", "1", str(close), "1", t + MINUTE_MS - 1, "1", 1, "1", "1", "0"]
+        for t in open_times
+    ]
+
+
+def make_event(symbol, open_time, close, closed):
+    return {
+        "e": "kline",
+        "s": symbol,
+        "k": {
+            "t": open_time,
+            "T": open_time + MINUTE_MS - 1,
+            "s": symbol,
+            "i": "1m",
+            "o": "1",
+            "c": str(close),
+            "h": "1",
+            "l": "1",
+            "v": "1",
+            "n": 1,
+            "x": closed,
+            "q": "1",
+            "V": "1",
+            "Q": "1",
+        },
+    }
+
+
+@pytest.fixture
+def replay_file(tmp_path):
+    events = [
+        make_event("BTCUSDC", 4 * MINUTE_MS, 2.0, True),
+        make_event("ETHUSDC", 4 * MINUTE_MS, 9.0, True),
+        make_event("BTCUSDC", 5 * MINUTE_MS, 3.0, False),
+    ]
+    path = tmp_path / "klines.jsonl"
+    path.write_text("\n".join(json.dumps(event) for event in events))
+    return str(path)
+
+
+def test_market_stream_replay_serves_klines_from_memory(replay_file):
+    buffer = KlineBuffer()
+    backfill = make_klines([i * MINUTE_MS for i in range(5)])
+    source = ReplayKlineSource(replay_file)
+
+    with patch(
+        "app.stefan.market_data.fetch_klines", return_value=backfill
+    ) as mock_fetch_klines, patch(
+        "app.stefan.scheduling.get_server_now_ms", return_value=5 * MINUTE_MS + 500
+    ):
+        buffer.get_df("BTCUSDC", "1m", 5)
+        service = MarketStreamService(source, buffer)
+        service.start([("BTCUSDC", "1m")])
+        assert source.finished.wait(timeout=5)
+        df = buffer.get_df("BTCUSDC", "1m", 5)
+        service.stop()
+
+    mock_fetch_klines.assert_called_once_with("BTCUSDC", "1m", limit=5)
+    assert service.event_count == 2
+    assert service.merged_count == 2
+    assert buffer.stream_hits == 1
+    assert df["open_time"].tolist() == [i * MINUTE_MS for i in range(1, 6)]
+    assert df["close"].tolist() == [1.0, 1.0, 1.0, 2.0, 3.0]
+
+
+def test_market_stream_opens_binance_streams_subscribed_before_start():
+    with patch("app.stefan.market_stream.ThreadedWebsocketManager") as mock_manager_class:
+        manager = mock_manager_class.return_value
+        manager.start_kline_socket.return_value = "btcusdc@kline_1m"
+        service = MarketStreamService(BinanceKlineSource(), KlineBuffer())
+        service.start([("BTCUSDC", "1m")])
+        service.update_streams([])
+
+    assert manager.method_calls == [
+        call.start(),
+        call.start_kline_socket(callback=service.handle_event, symbol="BTCUSDC", interval="1m"),
+        call.stop_socket("btcusdc@kline_1m"),
+    ]
+
+
+if __name__ == "__main__":
+    pytest.main()
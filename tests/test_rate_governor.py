@@ -0,0 +1,65 @@
+import pytest
+from unittest.mock import MagicMock
+from app.stefan.rate_governor import (
+    PRIORITY_LOW,
+    PRIORITY_TRADING,
+    RateGovernor,
+    RequestShedError,
+    get_endpoint,
+    get_endpoint_weight,
+    request_priority,
+    get_request_priority,
+)
+
+
+def test_get_endpoint_weight_from_uri():
+    assert get_endpoint("https://api.binance.com/api/v3/klines") == "klines"
+    assert get_endpoint("https://api.binance.com/sapi/v1/system/status") == "system/status"
+    assert get_endpoint_weight("account") == 20
+    assert get_endpoint_weight("ticker/price", {"symbol": "BTCUSDC"}) == 2
+    assert get_endpoint_weight("ticker/price") == 4
+
+
+def test_rate_governor_sheds_low_priority_before_trading_calls():
+    governor = RateGovernor(limit=100, max_wait=0)
+
+    governor.acquire("klines", 60)
+    with pytest.raises(RequestShedError):
+        governor.acquire("account", 20, priority=PRIORITY_LOW)
+    governor.acquire("order", 40, priority=PRIORITY_TRADING)
+
+    usage = governor.get_usage()
+    assert usage["used_weight"] == 100
+    assert usage["weight_by_endpoint"] == {"klines": 60, "order": 40}
+    assert usage["shed"] == 1
+
+
+def test_rate_governor_syncs_weight_and_holds_calls_after_ban():
+    governor = RateGovernor(limit=100, max_wait=0)
+
+    governor.update_from_response(
+        MagicMock(status_code=429, headers={"x-mbx-used-weight-1m": "90", "Retry-After": "30"})
+    )
+
+    usage = governor.get_usage()
+    assert usage["used_weight"] == 90
+    assert usage["banned"]
+    with pytest.raises(RequestShedError):
+        governor.acquire("order", 1, priority=PRIORITY_TRADING)
+
+
+def test_request_priority_keeps_highest_priority_of_callers():
+    @request_priority(PRIORITY_LOW)
+    def panel_call():
+        return get_request_priority()
+
+    @request_priority(PRIORITY_TRADING)
+    def trading_call():
+        return panel_call()
+
+    assert panel_call() == PRIORITY_LOW
+    assert trading_call() == PRIORITY_TRADING
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from app.stefan.resampling import can_resample, resample_klines
+
+MINUTE_MS = 60_000
+
+
+def make_rows(open_times):
+    return np.array(
+        [
+            [t, i + 1, i + 2, i, i + 1.5, 1, t + MINUTE_MS - 1, 10, 2, 0.5, 5]
+            for i, t in enumerate(open_times)
+        ],
+        dtype="<f8",
+    )
+
+
+def test_can_resample_intervals():
+    assert can_resample("1m", "15m")
+    assert can_resample("1m", "4h")
+    assert can_resample("1h", "1w")
+    assert not can_resample("1m", "1M")
+    assert not can_resample("5m", "3m")
+
+
+def test_resample_klines_uses_binance_boundaries():
+    rows = make_rows([t * MINUTE_MS for t in range(3, 13)])
+
+    resampled = resample_klines(rows, "1m", "5m")
+
+    assert resampled[:, 0].tolist() == [5 * MINUTE_MS, 10 * MINUTE_MS]
+    assert resampled[0, 1] == rows[2, 1]
+    assert resampled[0, 2] == rows[2:7, 2].max()
+    assert resampled[0, 3] == rows[2:7, 3].min()
+    assert resampled[0, 4] == rows[6, 4]
+    assert resampled[0, 5] == 5
+    assert resampled[0, 6] == 10 * MINUTE_MS - 1
+    assert resampled[0, 8] == 10
+    assert resampled[1, 5] == 3
+    assert resampled[1, 6] == 15 * MINUTE_MS - 1
+
+
+def test_resample_klines_rejects_gaps():
+    open_times = [t * MINUTE_MS for t in range(0, 15) if t != 7]
+
+    assert resample_klines(make_rows(open_times), "1m", "5m") is None
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import patch
+from app.stefan import scheduling
+from app.stefan.scheduling import (
+    get_last_candle_close_ms,
+    get_next_candle_close_ms,
+    measure_clock_offset,
+    record_decision_latency,
+    get_decision_latency_stats,
+    get_due_intervals,
+    record_sweep_duration,
+    get_sweep_stats,
+)
+
+MINUTE_MS = 60 * 1000
+HOUR_MS = 60 * MINUTE_MS
+
+
+def test_candle_close_boundaries():
+    now_ms = 1_700_000_000_000 + 25_000
+    assert get_last_candle_close_ms("1m", now_ms) % MINUTE_MS == 0
+    assert get_last_candle_close_ms("1m", now_ms) <= now_ms
+    assert get_next_candle_close_ms("1m", now_ms) - get_last_candle_close_ms(
+        "1m", now_ms
+    ) == MINUTE_MS
+    assert get_last_candle_close_ms("4h", now_ms) % (4 * HOUR_MS) == 0
+    assert get_last_candle_close_ms("1d", now_ms) % (24 * HOUR_MS) == 0
+
+
+def test_measure_clock_offset():
+    with patch("app.stefan.scheduling.time") as mock_time, patch(
+        "app.stefan.api_utils.fetch_server_time",
+        return_value={"serverTime": 1_000_600},
+    ):
+        mock_time.time.side_effect = [1000.0, 1000.2]
+        offset = measure_clock_offset()
+    assert offset == pytest.approx(500.0)
+    scheduling.clock_offset_ms = 0.0
+
+
+def test_record_decision_latency():
+    now_s = (1_700_000_040_000 + 1_250) / 1000
+    with patch("app.stefan.scheduling.time") as mock_time:
+        mock_time.time.return_value = now_s
+        latency = record_decision_latency(99, "1m")
+    assert latency == pytest.approx(1_250, abs=1)
+    assert get_decision_latency_stats()[99]["samples"] == 1
+
+
+def test_get_due_intervals():
+    intervals = ["1m", "3m", "5m", "15m", "30m", "1h", "4h", "1d"]
+    quarter_hour_ms = 15 * MINUTE_MS * 1_888_889
+    assert get_due_intervals(intervals, quarter_hour_ms) == ["1m", "3m", "5m", "15m"]
+    midnight_ms = 24 * HOUR_MS * 19_675
+    assert get_due_intervals(intervals, midnight_ms) == intervals
+    assert get_due_intervals(intervals, MINUTE_MS * 7) == ["1m"]
+
+
+def test_record_sweep_duration_counts_overruns():
+    sweeps_before = get_sweep_stats()["sweeps"]
+    overruns_before = get_sweep_stats()["overruns"]
+    assert not record_sweep_duration(["1m"], 2_000.0, "1m")
+    assert record_sweep_duration(["1m", "3m"], 61_000.0, "1m")
+    stats = get_sweep_stats()
+    assert stats["sweeps"] == sweeps_before + 2
+    assert stats["overruns"] == overruns_before + 1
+    assert stats["max_duration_ms"] >= 61_000.0
+
+
+if __name__ == "__main__":
+    pytest.main()
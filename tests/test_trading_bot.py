@@ -0,0 +1,38 @@
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from app.stefan import trading_bot
+from app.stefan.trading_bot import run_bot_in_app_context
+
+
+def test_bot_still_running_is_not_started_again():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def run_single_trading_logic(bot_settings, market_data):
+        calls.append(bot_settings)
+        started.set()
+        release.wait(5)
+
+    with patch.object(trading_bot, "db"), patch.object(
+        trading_bot, "run_single_trading_logic", side_effect=run_single_trading_logic
+    ):
+        timed_out_run = threading.Thread(
+            target=run_bot_in_app_context, args=(MagicMock(), 7, {}, None)
+        )
+        timed_out_run.start()
+        assert started.wait(5)
+
+        run_bot_in_app_context(MagicMock(), 7, {}, None)
+        assert len(calls) == 1
+
+        release.set()
+        timed_out_run.join(5)
+        assert 7 not in trading_bot.running_bot_ids
+        run_bot_in_app_context(MagicMock(), 7, {}, None)
+        assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from app.models import BotSettings
+from app.stefan.calc_utils import calculate_ta_indicators
+from app.stefan.indicator_state import IndicatorStateRegistry, apply_indicator_state
+from app.stefan.vwap import DAY_MS, calculate_vwap
+from app.stefan.warmup import get_indicator_lookbacks
+
+HOUR_MS = 3_600_000
+# Saturday 2025-01-04 00:00 UTC, so the frames cross a session and a week.
+START_MS = 1_735_948_800_000
+
+
+@pytest.fixture
+def bot_settings():
+    columns = BotSettings.__table__.columns
+    return BotSettings(
+        symbol="BTCUSDC",
+        interval="1h",
+        use_gpt_analysis=True,
+        **{
+            column.name: column.default.arg
+            for column in columns
+            if column.default is not None
+            and not callable(column.default.arg)
+            and column.name not in ("symbol", "interval", "use_gpt_analysis")
+        },
+    )
+
+
+@pytest.fixture
+def registry():
+    registry = IndicatorStateRegistry()
+    with patch("app.stefan.indicator_state.indicator_states", registry):
+        yield registry
+
+
+def make_df(count, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 50, count))
+    open_time = START_MS + HOUR_MS * np.arange(count)
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": close,
+            "high": close + rng.uniform(0, 80, count),
+            "low": close - rng.uniform(0, 80, count),
+            "close": close,
+            "volume": rng.uniform(1, 100, count),
+            "close_time": open_time + HOUR_MS - 1,
+        }
+    )
+
+
+def test_anchored_vwap_matches_grouped_sums():
+    df = make_df(24 * 10)
+    typical_price = (df["high"] + df["low"] + df["close"]) / 3
+    flows = pd.DataFrame({"price_volume": typical_price * df["volume"], "volume": df["volume"]})
+
+    for anchor, offset_ms, period_ms in (("session", 0, DAY_MS), ("weekly", 4 * DAY_MS, 7 * DAY_MS)):
+        sums = flows.groupby((df["open_time"] - offset_ms) // period_ms).cumsum()
+        np.testing.assert_allclose(
+            calculate_vwap(df["open_time"], typical_price, df["volume"], anchor),
+            sums["price_volume"] / sums["volume"],
+            rtol=1e-9,
+            err_msg=anchor,
+        )
+
+    sums = flows.rolling(20, min_periods=1).sum()
+    np.testing.assert_allclose(
+        calculate_vwap(df["open_time"], typical_price, df["volume"], "rolling", 20),
+        sums["price_volume"] / sums["volume"],
+        rtol=1e-9,
+    )
+    np.testing.assert_allclose(
+        calculate_vwap(pd.to_datetime(df["open_time"], unit="ms"), typical_price, df["volume"], "session"),
+        calculate_vwap(df["open_time"], typical_price, df["volume"], "session"),
+    )
+
+
+def test_anchored_vwap_does_not_depend_on_the_frame():
+    df = make_df(24 * 4)
+    typical_price = ((df["high"] + df["low"] + df["close"]) / 3).to_numpy()
+    full = calculate_vwap(df["open_time"], typical_price, df["volume"], "session")
+    shifted = calculate_vwap(df["open_time"][5:], typical_price[5:], df["volume"][5:], "session")
+    np.testing.assert_allclose(shifted[24 - 5:], full[24:], rtol=1e-12)
+
+    full = calculate_vwap(df["open_time"], typical_price, df["volume"], "rolling", 20)
+    shifted = calculate_vwap(df["open_time"][5:], typical_price[5:], df["volume"][5:], "rolling", 20)
+    np.testing.assert_allclose(shifted[19:], full[24:], rtol=1e-9)
+
+
+@pytest.mark.parametrize("vwap_anchor", ["rolling", "session", "weekly"])
+def test_indicator_state_vwap_matches_calculation(bot_settings, registry, vwap_anchor):
+    bot_settings.vwap_anchor = vwap_anchor
+    df = make_df(24 * 10)
+    expected = calculate_ta_indicators(df.copy(), bot_settings)
+
+    now_ms = START_MS + 200 * HOUR_MS + 1000
+    with patch("app.stefan.indicator_state.get_server_now_ms", return_value=now_ms):
+        apply_indicator_state(df.iloc[:201], bot_settings)
+    with patch(
+        "app.stefan.indicator_state.get_server_now_ms", return_value=now_ms + HOUR_MS
+    ):
+        state_df = apply_indicator_state(df.iloc[:202], bot_settings)
+    assert len(registry._states) == 1
+    np.testing.assert_allclose(
+        state_df["vwap"].iloc[60:], expected["vwap"].loc[60:201], rtol=1e-9
+    )
+
+
+def test_warmup_covers_vwap_anchor(bot_settings):
+    bot_settings.vwap_signals = True
+    assert get_indicator_lookbacks(bot_settings)["vwap"] == (0, 0)
+    bot_settings.vwap_anchor = "rolling"
+    assert get_indicator_lookbacks(bot_settings)["vwap"] == (19, 0)
+    bot_settings.vwap_anchor = "weekly"
+    assert get_indicator_lookbacks(bot_settings)["vwap"] == (167, 0)
+
+
+if __name__ == "__main__":
+    pytest.main()
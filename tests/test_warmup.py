@@ -0,0 +1,63 @@
+import pytest
+from app.models import BotSettings
+from app.stefan.warmup import (
+    MAX_UNBUFFERED_VWAP_ANCHOR_CANDLES,
+    ML_WINDOW_CANDLES,
+    get_indicator_lookbacks,
+    get_warmup_candles,
+)
+
+
+@pytest.fixture
+def bot_settings():
+    columns = BotSettings.__table__.columns
+    return BotSettings(
+        **{
+            column.name: column.default.arg
+            for column in columns
+            if column.default is not None and not callable(column.default.arg)
+        }
+    )
+
+
+def test_warmup_covers_always_calculated_indicators(bot_settings):
+    lookbacks = get_indicator_lookbacks(bot_settings)
+    assert lookbacks["macd"] == (31, 24)
+    assert "ma" not in lookbacks
+    assert get_warmup_candles(bot_settings) == 31 + 3 * 24 + 28 + 2
+
+
+def test_warmup_grows_with_enabled_indicators(bot_settings):
+    default_candles = get_warmup_candles(bot_settings)
+    bot_settings.ma200_signals = True
+    assert get_indicator_lookbacks(bot_settings)["ma"] == (199, 0)
+    assert get_warmup_candles(bot_settings) == 199 + 28 + 2
+    assert get_warmup_candles(bot_settings) > default_candles
+
+
+def test_warmup_covers_planned_indicators(bot_settings):
+    bot_settings.ema_slow_timeperiod = 100
+    default_candles = get_warmup_candles(bot_settings)
+    bot_settings.use_gpt_analysis = True
+    assert get_indicator_lookbacks(bot_settings)["ema"] == (99, 100)
+    assert get_warmup_candles(bot_settings) > default_candles
+
+
+def test_anchored_vwap_warmup_is_capped_without_kline_buffer(bot_settings):
+    bot_settings.interval = "1m"
+    bot_settings.vwap_signals = True
+    bot_settings.vwap_anchor = "weekly"
+    assert get_indicator_lookbacks(bot_settings)["vwap"] == (
+        MAX_UNBUFFERED_VWAP_ANCHOR_CANDLES - 1,
+        0,
+    )
+
+
+def test_machine_learning_bots_keep_their_window(bot_settings):
+    bot_settings.use_machine_learning = True
+    bot_settings.ml_use_lstm_model = False
+    assert get_warmup_candles(bot_settings) == ML_WINDOW_CANDLES
+
+
+if __name__ == "__main__":
+    pytest.main()